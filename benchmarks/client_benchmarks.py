@@ -0,0 +1,377 @@
+"""
+Throughput and latency benchmarks of the COMPAS RRC client.
+
+The benchmarks run against the in-process stand-in driver of ``compas_rrc.fake``,
+so they measure the overhead of the client itself, and can run on any machine::
+
+    python benchmarks/client_benchmarks.py --output results.json
+
+Storing the results of every release and passing a previous file
+with ``--compare`` shows the relative change of every metric::
+
+    python benchmarks/client_benchmarks.py --compare results-2.0.0.json
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import json
+import platform
+import threading
+import time
+
+import compas_rrc as rrc
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+
+_clock = getattr(time, "perf_counter", time.time)
+
+BENCHMARKS = []
+
+
+def benchmark(function):
+    BENCHMARKS.append(function)
+    return function
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(latencies):
+    return dict(
+        count=len(latencies),
+        mean=sum(latencies) / len(latencies),
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        p99=percentile(latencies, 99),
+        max=max(latencies),
+    )
+
+
+def connect(namespaces, processing_time):
+    ros = FakeRos(FakeDriver(namespaces=namespaces, processing_time=processing_time))
+    ros.run()
+    clients = [rrc.AbbClient(ros, namespace) for namespace in namespaces]
+    rrc.RobotGroup(clients).connect(timeout=10)
+    return ros, clients
+
+
+@benchmark
+def connection_setup(config):
+    """Time until all clients of several robots are ready."""
+    namespaces = ["/rob{}".format(i + 1) for i in range(config.robots)]
+    ros = FakeRos(FakeDriver(namespaces=namespaces))
+    ros.run()
+    try:
+        start = _clock()
+        group = rrc.RobotGroup(
+            [rrc.AbbClient(ros, namespace) for namespace in namespaces]
+        )
+        group.connect(timeout=10)
+        connected = _clock()
+    finally:
+        ros.terminate()
+    return dict(robots=config.robots, seconds=connected - start)
+
+
+@benchmark
+def noop_round_trip(config):
+    """Latency of ``send_and_wait`` of one ``Noop`` at a time."""
+    ros, (abb,) = connect(["/rob1"], config.processing_time)
+    latencies = []
+    try:
+        for _ in range(config.round_trips):
+            start = _clock()
+            abb.send_and_wait(rrc.Noop(), timeout=10)
+            latencies.append(_clock() - start)
+    finally:
+        ros.terminate()
+    return dict(latency=latency_summary(latencies))
+
+
+@benchmark
+def fire_and_forget(config):
+    """Throughput of ``send`` without feedback, synchronized by a final ``Noop``."""
+    ros, (abb,) = connect(["/rob1"], config.processing_time)
+    try:
+        start = _clock()
+        for _ in range(config.instructions):
+            abb.send(rrc.Noop())
+        published = _clock()
+        abb.send_and_wait(rrc.Noop(), timeout=60)
+        completed = _clock()
+    finally:
+        ros.terminate()
+    return dict(
+        send_per_second=config.instructions / (published - start),
+        completed_per_second=config.instructions / (completed - start),
+    )
+
+
+@benchmark
+def pipelined(config):
+    """Throughput of ``send`` with feedback, deferring all waits to the end."""
+    ros, (abb,) = connect(["/rob1"], config.processing_time)
+    try:
+        start = _clock()
+        futures = [
+            abb.send(rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE))
+            for _ in range(config.instructions)
+        ]
+        for future in futures:
+            future.result(timeout=60)
+        completed = _clock()
+    finally:
+        ros.terminate()
+    return dict(completed_per_second=config.instructions / (completed - start))
+
+
+@benchmark
+def batched(config):
+    """Throughput of ``send_many`` with feedback."""
+    ros, (abb,) = connect(["/rob1"], config.processing_time)
+    try:
+        start = _clock()
+        futures = abb.send_many(
+            [
+                rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE)
+                for _ in range(config.instructions)
+            ]
+        )
+        published = _clock()
+        for future in futures:
+            future.result(timeout=60)
+        completed = _clock()
+    finally:
+        ros.terminate()
+    return dict(
+        send_per_second=config.instructions / (published - start),
+        completed_per_second=config.instructions / (completed - start),
+    )
+
+
+@benchmark
+def multi_robot_fan_out(config):
+    """Aggregated round trips of several robots, each driven by its own thread."""
+    namespaces = ["/rob{}".format(i + 1) for i in range(config.robots)]
+    ros, clients = connect(namespaces, config.processing_time)
+
+    def drive(abb):
+        for _ in range(config.round_trips):
+            abb.send_and_wait(rrc.Noop(), timeout=10)
+
+    threads = [threading.Thread(target=drive, args=(abb,)) for abb in clients]
+    try:
+        start = _clock()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        completed = _clock()
+    finally:
+        ros.terminate()
+    return dict(
+        robots=config.robots,
+        round_trips_per_second=config.robots * config.round_trips / (completed - start),
+    )
+
+
+@benchmark
+def multi_producer(config):
+    """Throughput of several threads sharing one client, with every tenth instruction requesting feedback."""
+    results = {}
+    for producers in config.producers:
+        ros, (abb,) = connect(["/rob1"], config.processing_time)
+        per_producer = config.instructions // producers
+        barrier = threading.Event()
+        futures = []
+
+        def produce():
+            barrier.wait()
+            for i in range(per_producer):
+                feedback_level = rrc.FeedbackLevel.DONE if i % 10 == 9 else 0
+                future = abb.send(rrc.Noop(feedback_level=feedback_level))
+                if future is not None:
+                    futures.append(future)
+
+        threads = [threading.Thread(target=produce) for _ in range(producers)]
+        try:
+            for thread in threads:
+                thread.start()
+            start = _clock()
+            barrier.set()
+            for thread in threads:
+                thread.join()
+            published = _clock()
+            for future in futures:
+                future.result(timeout=60)
+            completed = _clock()
+        finally:
+            ros.terminate()
+
+        results["producers_{}".format(producers)] = dict(
+            send_per_second=producers * per_producer / (published - start),
+            completed_per_second=producers * per_producer / (completed - start),
+        )
+    return results
+
+
+@benchmark
+def subscription_delivery(config):
+    """Rate at which subscription feedback is delivered to the callback."""
+    ros, (abb,) = connect(["/rob1"], config.processing_time)
+    samples = config.instructions
+    ros.driver.add_handler(
+        "r_Stream",
+        lambda robot, message: [dict(float_values=[i]) for i in range(samples)],
+    )
+
+    received = []
+    done = threading.Event()
+
+    def callback(value):
+        received.append(value)
+        if len(received) == samples:
+            done.set()
+
+    try:
+        start = _clock()
+        abb.send_and_subscribe(
+            rrc.CustomInstruction("r_Stream", feedback_level=rrc.FeedbackLevel.DONE),
+            callback,
+        )
+        done.wait(60)
+        completed = _clock()
+    finally:
+        ros.terminate()
+    return dict(delivered_per_second=len(received) / (completed - start))
+
+
+@benchmark
+def instruction_encoding(config):
+    """Time to create and encode motion instructions, with and without a template."""
+    joints = [[i % 90, 10, 20, 0, 45, 0] for i in range(config.instructions)]
+    axes = [0, 0, 0, 0, 0, 0]
+
+    start = _clock()
+    for values in joints:
+        rrc.MoveToJoints(values, axes, 100, rrc.Zone.Z5).msg
+    plain = _clock() - start
+
+    template = rrc.InstructionTemplate(
+        rrc.MoveToJoints([], [], 100, rrc.Zone.Z5), variable=12
+    )
+    start = _clock()
+    for values in joints:
+        template.create(values + axes).msg
+    templated = _clock() - start
+
+    return dict(
+        plain_per_second=config.instructions / plain,
+        template_per_second=config.instructions / templated,
+    )
+
+
+def run(config):
+    results = {}
+    for function in BENCHMARKS:
+        if config.only and function.__name__ not in config.only:
+            continue
+        print("Running {}...".format(function.__name__))
+        results[function.__name__] = function(config)
+
+    return dict(
+        version=rrc.__version__,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        timestamp=datetime.datetime.now().isoformat(),
+        config=dict(
+            instructions=config.instructions,
+            round_trips=config.round_trips,
+            robots=config.robots,
+            producers=config.producers,
+            processing_time=config.processing_time,
+        ),
+        results=results,
+    )
+
+
+def flatten(results, prefix=""):
+    values = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, prefix + key + "."))
+        else:
+            values[prefix + key] = value
+    return values
+
+
+def compare(report, baseline):
+    current = flatten(report["results"])
+    previous = flatten(baseline["results"])
+    print("Compared to {} ({}):".format(baseline["version"], baseline["timestamp"]))
+    for key in sorted(current):
+        if key in previous and previous[key]:
+            change = (current[key] - previous[key]) / float(previous[key]) * 100
+            print("  {:<60} {:>14.6g} {:>+8.1f}%".format(key, current[key], change))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--instructions",
+        type=int,
+        default=20000,
+        help="Instructions per throughput benchmark",
+    )
+    parser.add_argument(
+        "--round-trips",
+        type=int,
+        default=2000,
+        help="Round trips per latency benchmark",
+    )
+    parser.add_argument(
+        "--robots",
+        type=int,
+        default=4,
+        help="Number of robots of the fan-out benchmark",
+    )
+    parser.add_argument(
+        "--producers",
+        type=int,
+        nargs="*",
+        default=[1, 2, 4, 8],
+        help="Numbers of threads of the multi-producer benchmark",
+    )
+    parser.add_argument(
+        "--processing-time",
+        type=float,
+        default=0.0,
+        help="Simulated processing time per instruction",
+    )
+    parser.add_argument("--only", nargs="*", help="Names of the benchmarks to run")
+    parser.add_argument(
+        "--output", help="Path of the JSON file to write the results to"
+    )
+    parser.add_argument("--compare", help="Path of a JSON file of previous results")
+    config = parser.parse_args()
+
+    report = run(config)
+    print(json.dumps(report["results"], indent=2, sort_keys=True))
+
+    if config.output:
+        with open(config.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if config.compare:
+        with open(config.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
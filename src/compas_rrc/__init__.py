@@ -23,15 +23,46 @@ different ways of communication:
 * **Send & Subscribe**: The method :meth:`~compas_rrc.AbbClient.send_and_subscribe` can activate
   a streaming service on the robot that will stream feedback at a regular inverval.
 
+The :class:`~compas_rrc.AsyncAbbClient` offers the same methods for ``asyncio`` code, returning
+awaitables instead of blocking.
+
 .. autosummary::
     :toctree: generated/
     :nosignatures:
 
     RosClient
     AbbClient
+    AsyncAbbClient
+    RobotGroup
+    FlowControl
+    PendingRequests
+    SequencePartition
+    FeedbackDispatcher
+    Subscription
+    StateCache
+    Reconnection
+    SendJournal
+    RecordingWriter
+    RecordingReader
+    JointStateMirror
+    ClientStats
+    InstructionTemplate
     ExecutionLevel
     FeedbackLevel
+    DeliveryPolicy
+    ReconnectPolicy
     FutureResult
+    ReturnWhen
+    wait
+    gather
+    as_completed
+
+For testing and benchmarking without a robot, the module ``compas_rrc.fake`` provides
+an in-process stand-in of the RRC driver that can be used instead of :class:`~compas_rrc.RosClient`.
+
+To share the connection to the robots between many processes of the same machine, the module
+``compas_rrc.proxy`` provides a local proxy that owns a single ROS connection and routes the
+feedback of every instruction only to the process that sent it.
 
 Robot joints and External axes
 ------------------------------
@@ -55,6 +86,9 @@ The following example shows how to retrieve, update and send the robot joints an
 
     RobotJoints
     ExternalAxes
+    CompactRobotJoints
+    CompactExternalAxes
+    JointTrajectoryBuffer
 
 Debugging instructions
 ----------------------
@@ -87,18 +121,45 @@ from compas_rrc.__version__ import (
     __url__,
     __version__,
 )
-from compas_rrc.client import AbbClient, RosClient
+from compas_rrc.client import (
+    AbbClient,
+    AsyncAbbClient,
+    FeedbackDispatcher,
+    FlowControl,
+    PendingRequests,
+    RosClient,
+    Reconnection,
+    SequencePartition,
+    StateCache,
+    Subscription,
+)
 from compas_rrc.common import (
     CLIENT_PROTOCOL_VERSION,
+    CompactExternalAxes,
+    CompactRobotJoints,
+    ConnectionLostException,
+    DeliveryPolicy,
     ExecutionLevel,
     ExternalAxes,
     FeedbackLevel,
     FutureResult,
     InstructionException,
+    ReconnectPolicy,
+    ReturnWhen,
     RobotJoints,
     TimeoutException,
+    as_completed,
+    gather,
+    wait,
 )
 from compas_rrc.custom import CustomInstruction
+from compas_rrc.group import RobotGroup
+from compas_rrc.journal import SendJournal
+from compas_rrc.recording import RecordedInstruction, RecordingReader, RecordingWriter
+from compas_rrc.state import JointStateMirror, JointStateSample
+from compas_rrc.stats import ClientStats, LatencyHistogram
+from compas_rrc.template import InstructionTemplate
+from compas_rrc.trajectory import JointTrajectoryBuffer
 from compas_rrc.io import (
     PulseDigital,
     ReadAnalog,
@@ -108,7 +169,16 @@ from compas_rrc.io import (
     SetDigital,
     SetGroup,
 )
-from compas_rrc.motion import Motion, MoveToFrame, MoveToJoints, MoveToRobtarget, Zone
+from compas_rrc.motion import (
+    Motion,
+    MoveToFrame,
+    MoveToJoints,
+    MoveToRobtarget,
+    Zone,
+    build_move_to_frame,
+    build_move_to_joints,
+    build_move_to_robtarget,
+)
 from compas_rrc.msg import PrintText
 from compas_rrc.utility import (
     Debug,
@@ -116,6 +186,7 @@ from compas_rrc.utility import (
     GetJoints,
     GetRobtarget,
     Noop,
+    RawRobtarget,
     SetAcceleration,
     SetMaxSpeed,
     SetTool,
@@ -138,11 +209,39 @@ __all__ = [
     "ExecutionLevel",
     "InstructionException",
     "TimeoutException",
+    "ConnectionLostException",
     "FutureResult",
+    "ReturnWhen",
+    "wait",
+    "gather",
+    "as_completed",
     "ExternalAxes",
     "RobotJoints",
+    "CompactExternalAxes",
+    "CompactRobotJoints",
+    "JointTrajectoryBuffer",
     "RosClient",
     "AbbClient",
+    "AsyncAbbClient",
+    "RobotGroup",
+    "FlowControl",
+    "PendingRequests",
+    "SequencePartition",
+    "FeedbackDispatcher",
+    "Subscription",
+    "StateCache",
+    "Reconnection",
+    "SendJournal",
+    "RecordingWriter",
+    "RecordingReader",
+    "RecordedInstruction",
+    "JointStateMirror",
+    "JointStateSample",
+    "DeliveryPolicy",
+    "ReconnectPolicy",
+    "ClientStats",
+    "LatencyHistogram",
+    "InstructionTemplate",
     "SetDigital",
     "SetAnalog",
     "SetGroup",
@@ -155,9 +254,13 @@ __all__ = [
     "MoveToJoints",
     "MoveToFrame",
     "MoveToRobtarget",
+    "build_move_to_joints",
+    "build_move_to_frame",
+    "build_move_to_robtarget",
     "PrintText",
     "CustomInstruction",
     "Noop",
+    "RawRobtarget",
     "GetFrame",
     "GetJoints",
     "GetRobtarget",
@@ -1,36 +1,80 @@
+import heapq
+import logging
+import os
+import socket
 import threading
 import time
+import uuid
+import weakref
+from collections import OrderedDict
+from collections import deque
+from contextlib import contextmanager
 
 import roslibpy
 from compas_fab.backends import RosClient
 
 from .common import CLIENT_PROTOCOL_VERSION
+from .common import ConnectionLostException
+from .common import DeliveryPolicy
+from .common import ExecutionLevel
+from .common import FeedbackLevel
 from .common import FutureResult
 from .common import InstructionException
-
-__all__ = ["RosClient", "AbbClient"]
-
+from .common import ReconnectPolicy
+from .common import TimeoutException
+from .utility import INSTRUCTION_PREFIX
+from .utility import Debug
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+__all__ = [
+    "RosClient",
+    "AbbClient",
+    "AsyncAbbClient",
+    "FlowControl",
+    "PendingRequests",
+    "SequencePartition",
+    "FeedbackDispatcher",
+    "Subscription",
+    "StateCache",
+    "Reconnection",
+]
+
+LOGGER = logging.getLogger("compas_rrc")
 
 FEEDBACK_ERROR_PREFIX = "Done FError "
 
 
-def _get_key(message):
-    return "msg:{}".format(message.sequence_id)
-
-
-def _get_response_key(message):
-    return "msg:{}".format(message["feedback_id"])
-
-
 class SequenceCounter(object):
     """An atomic, thread-safe sequence increament counter."""
 
     ROLLOVER_THRESHOLD = 1000000
 
-    def __init__(self, start=0):
-        """Initialize a new counter to given initial value."""
+    def __init__(self, start=None, first=1, last=None):
+        """Initialize a new counter to given initial value.
+
+        Parameters
+        ----------
+        start : :obj:`int`
+            Initial value of the counter. Optional. Defaults to ``first - 1``.
+        first : :obj:`int`
+            First sequence id of the range. Defaults to ``1``.
+        last : :obj:`int`
+            Last sequence id of the range, after which the counter rolls over.
+            Optional. Defaults to :attr:`ROLLOVER_THRESHOLD`.
+        """
         self._lock = threading.Lock()
-        self._value = start
+        self.first = first
+        self.last = last if last is not None else SequenceCounter.ROLLOVER_THRESHOLD
+        self._value = start if start is not None else first - 1
 
     def increment(self, num=1):
         """Atomically increment the counter by ``num`` and
@@ -38,10 +82,45 @@ class SequenceCounter(object):
         """
         with self._lock:
             self._value += num
-            if self._value > SequenceCounter.ROLLOVER_THRESHOLD:
-                self._value = 1
+            if self._value > self.last:
+                self._value = self.first
             return self._value
 
+    def allocate(self, num):
+        """Atomically reserve ``num`` consecutive sequence ids.
+
+        If the reserved range would cross the rollover threshold,
+        the counter rolls over before reserving so that the
+        returned ids are always contiguous.
+
+        Parameters
+        ----------
+        num : :obj:`int`
+            Number of sequence ids, at most :attr:`size`.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`int`
+            The reserved sequence ids.
+        """
+        if num > self.size:
+            raise ValueError(
+                "Cannot allocate {} sequence ids from a range of {}".format(
+                    num, self.size
+                )
+            )
+        with self._lock:
+            if self._value + num > self.last:
+                self._value = self.first - 1
+            start = self._value + 1
+            self._value += num
+            return list(range(start, self._value + 1))
+
+    @property
+    def size(self):
+        """Number of sequence ids of the range of the counter."""
+        return self.last - self.first + 1
+
     @property
     def value(self):
         """Current sequence counter."""
@@ -49,6 +128,967 @@ class SequenceCounter(object):
             return self._value
 
 
+class SequencePartition(object):
+    """Disjoint range of sequence ids, to let several processes send to the same robot.
+
+    Feedback is matched to instructions by sequence id, so clients of
+    different processes connected to the same namespace must not use the
+    same ids. Each client is given a different partition of the range of
+    sequence ids, either configured explicitly, e.g. from the index of a
+    worker process, or claimed through a ROS parameter with :meth:`claim`.
+    A client with a partition ignores the feedback of other partitions.
+
+    Examples
+    --------
+
+    Split the preparation of a job across a pool of 4 worker processes::
+
+        def worker(index):
+            ros = rrc.RosClient()
+            ros.run()
+            partition = rrc.SequencePartition(index, 4)
+            abb = rrc.AbbClient(ros, '/rob1', partition=partition)
+
+    """
+
+    def __init__(self, index, count):
+        """Initialize a new partition.
+
+        Parameters
+        ----------
+        index : :obj:`int`
+            Index of the partition, from ``0`` to ``count - 1``.
+        count : :obj:`int`
+            Number of partitions the range of sequence ids is split into.
+        """
+        if count < 1 or count > SequenceCounter.ROLLOVER_THRESHOLD:
+            raise ValueError("Invalid number of partitions: {}".format(count))
+        if not 0 <= index < count:
+            raise ValueError(
+                "Partition index must be between 0 and {}, got {}".format(
+                    count - 1, index
+                )
+            )
+        self.index = index
+        self.count = count
+        size = SequenceCounter.ROLLOVER_THRESHOLD // count
+        self.first = index * size + 1
+        self.last = (index + 1) * size
+        self._param = None
+
+    def __repr__(self):
+        return "SequencePartition(index={}, count={})".format(self.index, self.count)
+
+    def __contains__(self, sequence_id):
+        return self.first <= sequence_id <= self.last
+
+    def create_counter(self):
+        """Create a sequence counter that rolls over within this partition."""
+        return SequenceCounter(first=self.first, last=self.last)
+
+    @classmethod
+    def claim(cls, ros, namespace, count, timeout=10, settle_time=0.2):
+        """Claim the first free partition of a robot through ROS parameters.
+
+        Each partition is claimed by writing a unique token to the parameter
+        ``<namespace>/sequence_partitions/<index>``, waiting ``settle_time`` and
+        reading it back. ROS parameters cannot be updated atomically, so processes
+        starting at exactly the same time may still collide: prefer explicit
+        indices when they are known. Claims are kept until :meth:`release` is called.
+
+        Parameters
+        ----------
+        ros : :class:`RosClient`
+            Instance of a ROS connection.
+        namespace : :obj:`str`
+            Namespace of the robot, e.g. ``/rob1``.
+        count : :obj:`int`
+            Number of partitions the range of sequence ids is split into.
+        timeout : :obj:`float`
+            Timeout in seconds of each parameter request. Defaults to ``10``.
+        settle_time : :obj:`float`
+            Time in seconds to wait before verifying a claim. Defaults to ``0.2``.
+
+        Returns
+        -------
+        :class:`SequencePartition`
+        """
+        if not namespace.endswith("/"):
+            namespace += "/"
+        token = "{}:{}:{}".format(socket.gethostname(), os.getpid(), uuid.uuid4().hex)
+
+        for index in range(count):
+            param = roslibpy.Param(
+                ros, "{}sequence_partitions/{}".format(namespace, index)
+            )
+            if param.get(timeout=timeout):
+                continue
+            param.set(token, timeout=timeout)
+            time.sleep(settle_time)
+            if param.get(timeout=timeout) == token:
+                partition = cls(index, count)
+                partition._param = param
+                return partition
+
+        raise Exception(
+            "All {} sequence partitions of {} are claimed".format(count, namespace)
+        )
+
+    def release(self, timeout=10):
+        """Release a partition claimed with :meth:`claim`."""
+        if self._param:
+            self._param.delete(timeout=timeout)
+            self._param = None
+
+
+class FlowControl(object):
+    """Bounded window of in-flight instructions to apply back-pressure on streaming sends.
+
+    Instructions executed on the robot task are acknowledged in order, so
+    feedback for one instruction implies that all instructions sent before it
+    have been executed as well. Flow control uses that to track how many
+    instructions are queued on the driver and controller: every ``ack_interval``
+    instructions, it requests :attr:`FeedbackLevel.DONE` feedback as a checkpoint,
+    and when the window is full, sending blocks until a checkpoint is acknowledged.
+
+    Optionally, the window can also be bounded by the estimated time needed to
+    execute the queued instructions. The estimation is based on the rate
+    of acknowledgements measured while streaming.
+
+    Examples
+    --------
+
+    Stream a long toolpath keeping at most 200 instructions or 5 seconds of motion queued::
+
+        abb = rrc.AbbClient(ros, '/rob1', flow_control=rrc.FlowControl(max_in_flight=200, max_queued_time=5.0))
+
+        for frame in frames:
+            abb.send(rrc.MoveToFrame(frame, 150, rrc.Zone.Z5, rrc.Motion.LINEAR))
+
+    """
+
+    SMOOTHING = 0.2
+
+    def __init__(
+        self, max_in_flight=100, ack_interval=10, max_queued_time=None, timeout=None
+    ):
+        """Initialize a new flow control window.
+
+        Parameters
+        ----------
+        max_in_flight : :obj:`int`
+            Maximum number of unacknowledged instructions.
+        ack_interval : :obj:`int`
+            Number of instructions between checkpoints. It is capped to ``max_in_flight``.
+        max_queued_time : :obj:`float`
+            Maximum estimated execution time in seconds of the unacknowledged instructions. Optional.
+        timeout : :obj:`float`
+            Timeout in seconds to wait for room in the window before raising
+            a :class:`TimeoutException`. Optional. Waits forever if not specified.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.ack_interval = max(1, min(ack_interval, max_in_flight))
+        self.max_queued_time = max_queued_time
+        self.timeout = timeout
+        self.rate = None
+        self.round_trip_time = None
+        self._condition = threading.Condition()
+        self._in_flight = deque()
+        self._checkpoints = {}
+        self._reserved = 0
+        self._since_checkpoint = 0
+        self._last_ack_time = None
+
+    @property
+    def in_flight(self):
+        """Number of instructions sent but not yet acknowledged."""
+        with self._condition:
+            return len(self._in_flight) + self._reserved
+
+    @property
+    def window(self):
+        """Current maximum number of unacknowledged instructions."""
+        if self.max_queued_time is None or not self.rate:
+            return self.max_in_flight
+        window = int(self.rate * self.max_queued_time)
+        return max(self.ack_interval, min(self.max_in_flight, window))
+
+    def reserve(self, instructions):
+        """Wait until there is room in the window and reserve it for the
+        first instructions of the given iterable.
+
+        Instructions not executed on the robot task are not limited by the window.
+
+        Returns
+        -------
+        :obj:`int`
+            Number of instructions that can be sent now, at least ``1``.
+        """
+        count = 0
+        with self._condition:
+            for instruction in instructions:
+                if instruction.exec_level != ExecutionLevel.ROBOT:
+                    count += 1
+                    continue
+                if len(self._in_flight) + self._reserved >= self.window:
+                    if count:
+                        break
+                    if not self._wait_for_room():
+                        raise TimeoutException(
+                            "Timeout: no acknowledgement received from the robot"
+                        )
+                self._reserved += 1
+                count += 1
+        return count
+
+    def _wait_for_room(self):
+        deadline = time.time() + self.timeout if self.timeout is not None else None
+        while len(self._in_flight) + self._reserved >= self.window:
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return False
+            self._condition.wait(remaining)
+        return True
+
+    def track(self, instruction):
+        """Track a reserved instruction once its sequence id is assigned.
+
+        Returns
+        -------
+        :obj:`bool`
+            ``True`` if flow control changed the feedback level of the
+            instruction to use it as a checkpoint, otherwise ``False``.
+        """
+        if instruction.exec_level != ExecutionLevel.ROBOT:
+            return False
+
+        forced = False
+        with self._condition:
+            self._reserved -= 1
+            self._in_flight.append(instruction.sequence_id)
+            self._since_checkpoint += 1
+
+            if (
+                self._since_checkpoint >= self.ack_interval
+                and not instruction.feedback_level
+            ):
+                instruction.feedback_level = FeedbackLevel.DONE
+                forced = True
+
+            if instruction.feedback_level:
+                self._since_checkpoint = 0
+                self._checkpoints[instruction.sequence_id] = time.time()
+
+        return forced
+
+    def acknowledge(self, sequence_id):
+        """Release the instruction with the given sequence id and all instructions sent before it."""
+        with self._condition:
+            sent_at = self._checkpoints.pop(sequence_id, None)
+            if sent_at is None:
+                return
+
+            count = 0
+            while self._in_flight:
+                count += 1
+                released = self._in_flight.popleft()
+                if released == sequence_id:
+                    break
+                self._checkpoints.pop(released, None)
+
+            now = time.time()
+            self.round_trip_time = now - sent_at
+            if self._last_ack_time is not None and now > self._last_ack_time:
+                rate = count / (now - self._last_ack_time)
+                if self.rate is None:
+                    self.rate = rate
+                else:
+                    self.rate += self.SMOOTHING * (rate - self.rate)
+            self._last_ack_time = now
+
+            self._condition.notify_all()
+
+    def reset(self):
+        """Release all in-flight instructions, e.g. after their feedback was lost."""
+        with self._condition:
+            self._in_flight.clear()
+            self._checkpoints.clear()
+            self._since_checkpoint = 0
+            self._last_ack_time = None
+            self._condition.notify_all()
+
+
+class PendingRequests(object):
+    """Thread-safe table of requests waiting for feedback from the robot, keyed by sequence id.
+
+    Every entry is tagged with a generation number, so that an entry registered
+    again for a sequence id after the counter rolls over never gets confused with
+    a stale one: the stale entry is failed when the new one is registered.
+    Entries can expire after a timeout, in which case their future fails with a
+    :class:`TimeoutException`, and the table can be bounded in size, in which case
+    the oldest entries are evicted first. Expired entries are swept by a background
+    thread that only runs while there are entries with a deadline.
+
+    Examples
+    --------
+
+    Fail any feedback request that is not answered within 10 minutes::
+
+        abb = rrc.AbbClient(ros, '/rob1', pending_requests=rrc.PendingRequests(timeout=600))
+
+    """
+
+    def __init__(self, timeout=None, max_size=None):
+        """Initialize a new table of pending requests.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Time in seconds after which requests waiting for a result expire. Optional.
+            Subscriptions never expire. If not specified, requests wait forever.
+        max_size : :obj:`int`
+            Maximum number of entries. Optional. If not specified, the table is not bounded.
+        """
+        self.timeout = timeout
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._deadlines = []
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._sweeper = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, sequence_id):
+        return sequence_id in self._entries
+
+    def keys(self):
+        """List of sequence ids of the pending entries."""
+        with self._condition:
+            return list(self._entries.keys())
+
+    def get(self, sequence_id):
+        """Get the pending entry of a sequence id, or ``None``."""
+        return self._entries.get(sequence_id)
+
+    def add(self, sequence_id, entry, timeout=None):
+        """Register an entry for a sequence id.
+
+        Parameters
+        ----------
+        sequence_id : :obj:`int`
+            Sequence id of the instruction.
+        entry : :obj:`dict`
+            Either a ``result`` future and a ``parser``, or a ``subscription``.
+        timeout : :obj:`float`
+            Overrides the default timeout of the table for this entry. Optional.
+        """
+        self.update({sequence_id: entry}, timeout)
+
+    def update(self, entries, timeout=None):
+        """Register several entries at once. See :meth:`add`."""
+        timeout = timeout if timeout is not None else self.timeout
+        failed = []
+
+        with self._condition:
+            deadline = time.time() + timeout if timeout is not None else None
+            for sequence_id, entry in entries.items():
+                stale = self._entries.pop(sequence_id, None)
+                if stale:
+                    failed.append((stale, "Sequence id reused before feedback arrived"))
+
+                self._generation += 1
+                entry["generation"] = self._generation
+                self._entries[sequence_id] = entry
+
+                if deadline is not None and "result" in entry:
+                    heapq.heappush(
+                        self._deadlines, (deadline, self._generation, sequence_id)
+                    )
+
+            while self.max_size is not None and len(self._entries) > self.max_size:
+                # Only requests waiting for a result, subscriptions stay active
+                evicted = next(
+                    (
+                        sequence_id
+                        for sequence_id, entry in self._entries.items()
+                        if "result" in entry
+                    ),
+                    None,
+                )
+                if evicted is None:
+                    break
+                failed.append(
+                    (
+                        self._entries.pop(evicted),
+                        "Evicted from the table of pending requests",
+                    )
+                )
+
+            if self._deadlines:
+                self._ensure_sweeper()
+
+        self._fail(failed)
+
+    def pop(self, sequence_id, generation=None):
+        """Remove and return the entry of a sequence id, or ``None``.
+
+        If ``generation`` is given, the entry is only removed if it matches.
+        """
+        with self._condition:
+            entry = self._entries.get(sequence_id)
+            if entry is None or (
+                generation is not None and entry["generation"] != generation
+            ):
+                return None
+            entry = self._entries.pop(sequence_id)
+            self._compact()
+            return entry
+
+    def fail_pending(self, error):
+        """Fail all requests waiting for a result with ``error``. Subscriptions are kept."""
+        with self._condition:
+            failed = [
+                (sequence_id, entry)
+                for sequence_id, entry in self._entries.items()
+                if "result" in entry
+            ]
+            for sequence_id, _ in failed:
+                del self._entries[sequence_id]
+            self._compact()
+
+        for _, entry in failed:
+            entry["result"]._set_result(error)
+
+    def sweep(self):
+        """Fail all expired entries."""
+        with self._condition:
+            expired = self._pop_expired(time.time())
+        self._fail(expired)
+
+    def _compact(self):
+        # Deadlines of removed entries stay in the heap until they pass, so the heap
+        # is rebuilt when mostly stale, to keep memory flat under high throughput
+        if len(self._deadlines) <= 2 * len(self._entries) + 64:
+            return
+        self._deadlines = [
+            item
+            for item in self._deadlines
+            if item[2] in self._entries
+            and self._entries[item[2]]["generation"] == item[1]
+        ]
+        heapq.heapify(self._deadlines)
+
+    def _pop_expired(self, now):
+        expired = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, generation, sequence_id = heapq.heappop(self._deadlines)
+            entry = self._entries.get(sequence_id)
+            if entry is not None and entry["generation"] == generation:
+                del self._entries[sequence_id]
+                expired.append((entry, "Timeout: no feedback received from the robot"))
+        return expired
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None:
+            self._condition.notify()
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop)
+        self._sweeper.daemon = True
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            with self._condition:
+                if not self._deadlines:
+                    self._sweeper = None
+                    return
+                now = time.time()
+                expired = self._pop_expired(now)
+                if not expired:
+                    self._condition.wait(self._deadlines[0][0] - now)
+            self._fail(expired)
+
+    def _fail(self, entries):
+        for entry, reason in entries:
+            if "result" in entry:
+                entry["result"]._set_result(TimeoutException(reason))
+            elif "subscription" in entry:
+                entry["subscription"].active = False
+
+
+class FeedbackDispatcher(object):
+    """Pool of worker threads to deliver subscription feedback outside of the ROS receive thread.
+
+    By default, feedback is handled on the thread that receives it from ROS,
+    so a slow subscription callback delays the feedback of all robots sharing
+    the same ROS connection, and a callback that waits for another instruction
+    blocks forever. A dispatcher hands subscription feedback over to worker
+    threads instead, while results of :meth:`AbbClient.send` are still resolved
+    immediately. A dispatcher can be shared by several clients.
+
+    Examples
+    --------
+
+    Keep plotting in a subscription callback from delaying other feedback::
+
+        dispatcher = rrc.FeedbackDispatcher(max_workers=2)
+        abb = rrc.AbbClient(ros, '/rob1', dispatcher=dispatcher)
+        abb.send_and_subscribe(instruction, plot_value)
+
+    """
+
+    def __init__(self, max_workers=1, ordered=True):
+        """Initialize a new dispatcher.
+
+        Parameters
+        ----------
+        max_workers : :obj:`int`
+            Number of worker threads.
+        ordered : :obj:`bool`
+            If ``True``, the feedback of each subscription is delivered in order,
+            one value at a time, like a serial executor per subscription.
+            Otherwise, values are delivered by any idle worker as they arrive.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.ordered = ordered
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._serial_queues = {}
+        self._workers = []
+
+    def dispatch(self, key, callback, *args):
+        """Schedule a call to ``callback(*args)`` on a worker thread.
+
+        Parameters
+        ----------
+        key : :obj:`object`
+            Identifies the subscription, calls with the same key are
+            delivered in order if the dispatcher is ``ordered``.
+        callback
+            Function to invoke.
+        """
+        self._ensure_workers()
+
+        if not self.ordered:
+            self._tasks.put((callback, args))
+            return
+
+        with self._lock:
+            pending = self._serial_queues.get(key)
+            if pending is not None:
+                pending.append((callback, args))
+                return
+            self._serial_queues[key] = deque([(callback, args)])
+        self._tasks.put((self._drain, (key,)))
+
+    def shutdown(self, wait=True):
+        """Stop all worker threads after the feedback already dispatched has been delivered."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._tasks.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _ensure_workers(self):
+        if len(self._workers) >= self.max_workers:
+            return
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work)
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+    def _drain(self, key):
+        while True:
+            with self._lock:
+                pending = self._serial_queues[key]
+                if not pending:
+                    del self._serial_queues[key]
+                    return
+                callback, args = pending.popleft()
+            self._run(callback, args)
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            self._run(*task)
+
+    def _run(self, callback, args):
+        try:
+            callback(*args)
+        except Exception:
+            LOGGER.exception("Error while delivering feedback")
+
+
+class StateCache(object):
+    """Coalesces concurrent reads of the robot state, and optionally caches their feedback.
+
+    Used by :meth:`AbbClient.read`. When several threads read the same state
+    at the same time, e.g. with :class:`GetJoints`, only one instruction is sent
+    and all of them receive its feedback (single-flight). With a ``ttl``, the
+    feedback is also reused for reads made within that many seconds. Sending any
+    instruction that is not a read, e.g. a motion or an IO write, invalidates the
+    cache and detaches new reads from the ones in flight.
+
+    Every reader parses the feedback on its own, so results are never shared
+    between threads.
+
+    Examples
+    --------
+
+    Serve joint reads from several threads at most every 50 milliseconds::
+
+        abb = rrc.AbbClient(ros, '/rob1', state_cache=rrc.StateCache(ttl=0.05))
+        robot_joints, external_axes = abb.read(rrc.GetJoints())
+
+    """
+
+    READ_INSTRUCTIONS = frozenset(
+        INSTRUCTION_PREFIX + name
+        for name in (
+            "Noop",
+            "GetJoints",
+            "GetRobtarget",
+            "ReadAnalog",
+            "ReadDigital",
+            "ReadGroup",
+            "ReadWatch",
+        )
+    )
+    """Names of the instructions that do not change the state of the robot."""
+
+    def __init__(self, ttl=0.0, read_instructions=None):
+        """Initialize a new state cache.
+
+        Parameters
+        ----------
+        ttl : :obj:`float`
+            Time in seconds during which the feedback of a read is reused.
+            Defaults to ``0.0``, i.e. only concurrent reads are coalesced.
+        read_instructions : :obj:`list` of :obj:`str`
+            Names of additional instructions, e.g. custom ones, that do not change the state of the robot. Optional.
+        """
+        self.ttl = ttl
+        self.read_instructions = self.READ_INSTRUCTIONS.union(read_instructions or [])
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._in_flight = {}
+        self._epoch = 0
+
+    @staticmethod
+    def _key(instruction):
+        return (
+            instruction.instruction,
+            tuple(instruction.string_values),
+            tuple(instruction.float_values),
+        )
+
+    def invalidate(self):
+        """Discard all cached feedback, and detach new reads from the ones in flight."""
+        with self._lock:
+            self._epoch += 1
+            self._cache.clear()
+            self._in_flight.clear()
+
+    def record_sent(self, instructions):
+        """Invalidate the cache if any of the sent instructions may change the state of the robot."""
+        if not self._cache and not self._in_flight:
+            return
+
+        for instruction in instructions:
+            if instruction.instruction not in self.read_instructions:
+                self.invalidate()
+                return
+
+    def read(self, client, instruction, timeout=None):
+        """Read the state of the robot through ``client``, see :meth:`AbbClient.read`."""
+        key = self._key(instruction)
+        parser = _get_parser(instruction)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.time() - cached[0] <= self.ttl:
+                return self._parse(parser, cached[1])
+
+            shared = self._in_flight.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._in_flight[key] = FutureResult()
+                epoch = self._epoch
+
+        if not leader:
+            return self._parse(parser, shared.result(timeout))
+
+        try:
+            message = client.send_and_wait(Debug(instruction), timeout)
+        except Exception as error:
+            message = error
+
+        with self._lock:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+            if self.ttl and epoch == self._epoch and not isinstance(message, Exception):
+                self._cache[key] = (time.time(), message)
+        shared._set_result(message)
+
+        if isinstance(message, Exception):
+            raise message
+        return self._parse(parser, message)
+
+    @staticmethod
+    def _parse(parser, message):
+        result = _parse_feedback(dict(parser=parser), message)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class Reconnection(object):
+    """Keeps a client usable across brief losses of the connection to ROS.
+
+    :class:`RosClient` reconnects on its own and restores its topics, but the
+    feedback sent by the driver while disconnected is lost, and so can be the
+    instructions sent just before the connection dropped. While disconnected,
+    sending blocks. Once the connection is restored, and after a short ``delay``
+    to let the topics be restored, the protocol version is checked again and
+    sending resumes.
+
+    The instructions waiting for feedback are handled according to the
+    ``policy``. With :attr:`ReconnectPolicy.FAIL`, they fail with a
+    :class:`ConnectionLostException` as soon as the connection drops. With
+    :attr:`ReconnectPolicy.REPLAY`, all instructions sent and not yet acknowledged
+    are sent again, with the same sequence ids, before any new one. Instructions of
+    a task are executed in order, so feedback for an instruction acknowledges all
+    the ones sent before it to the same task. Instructions whose feedback was lost
+    after they were executed are executed twice, so replay is meant for
+    instructions that can safely be repeated, like absolute motions. Replay
+    requires the client to use :class:`FlowControl`, whose regular checkpoints
+    acknowledge executed instructions, otherwise instructions that never request
+    feedback would be kept, and executed again, up to ``max_replay`` of them.
+
+    Examples
+    --------
+
+    Stream a long toolpath over an unreliable network::
+
+        abb = rrc.AbbClient(ros, '/rob1',
+                            flow_control=rrc.FlowControl(max_in_flight=200),
+                            reconnection=rrc.Reconnection(rrc.ReconnectPolicy.REPLAY, timeout=60))
+
+    """
+
+    def __init__(
+        self, policy=ReconnectPolicy.FAIL, timeout=None, delay=1.5, max_replay=10000
+    ):
+        """Initialize a new reconnection handler.
+
+        Parameters
+        ----------
+        policy : :class:`ReconnectPolicy`
+            Defines what happens to instructions waiting for feedback. Defaults to :attr:`ReconnectPolicy.FAIL`.
+        timeout : :obj:`float`
+            Time in seconds sending waits for the connection to be restored before raising
+            a :class:`ConnectionLostException`. Optional. Waits forever if not specified.
+        delay : :obj:`float`
+            Time in seconds to wait after reconnecting before resuming. Defaults to ``1.5``.
+        max_replay : :obj:`int`
+            Maximum number of unacknowledged instructions kept for replay, per task. Defaults to ``10000``.
+        """
+        if policy not in (ReconnectPolicy.FAIL, ReconnectPolicy.REPLAY):
+            raise ValueError("Unknown reconnect policy: {}".format(policy))
+
+        self.policy = policy
+        self.timeout = timeout
+        self.delay = delay
+        self.max_replay = max_replay
+        self.client = None
+        self.reconnections = 0
+        self.error = None
+        self._connected = threading.Event()
+        self._connected.set()
+        self._closing = False
+        self._lock = threading.Lock()
+        self._sent = {}
+        self._index = 0
+
+    @property
+    def is_connected(self):
+        """``True`` unless the connection is lost or being restored."""
+        return self._connected.is_set()
+
+    def attach(self, client):
+        """Start handling the connection of a client."""
+        if self.policy == ReconnectPolicy.REPLAY and not client.flow_control:
+            raise ValueError(
+                "Replaying instructions requires flow control to acknowledge them regularly"
+            )
+        self.client = client
+        client.ros.on("closing", self._on_closing)
+        client.ros.on("close", self._on_close)
+        client.ros.on("ready", self._on_ready)
+
+    def wait(self):
+        """Wait until the connection is available, see :attr:`timeout`."""
+        if not self._connected.is_set() and not self._connected.wait(self.timeout):
+            raise ConnectionLostException(
+                "Timeout: the connection to ROS was not restored"
+            )
+        if self.error:
+            raise self.error
+
+    def record_sent(self, instructions, messages):
+        """Keep the messages of sent instructions until they are acknowledged."""
+        if self.policy != ReconnectPolicy.REPLAY:
+            return
+
+        with self._lock:
+            for instruction, message in zip(instructions, messages):
+                sent = self._sent.get(instruction.exec_level)
+                if sent is None:
+                    sent = self._sent[instruction.exec_level] = OrderedDict()
+                self._index += 1
+                sent.pop(instruction.sequence_id, None)
+                sent[instruction.sequence_id] = (self._index, message)
+                if len(sent) > self.max_replay:
+                    sent.popitem(last=False)
+
+    def acknowledge(self, sequence_id):
+        """Release the instruction with the given sequence id and the ones sent before it to the same task."""
+        if not self._sent:
+            return
+
+        with self._lock:
+            for sent in self._sent.values():
+                if sequence_id in sent:
+                    while sent:
+                        released, _ = sent.popitem(last=False)
+                        if released == sequence_id:
+                            break
+                    return
+
+    def _on_closing(self, *args):
+        self._closing = True
+
+    def _on_close(self, *args):
+        if self._closing or not self._connected.is_set():
+            return
+
+        LOGGER.warning("Connection to ROS lost, waiting to reconnect")
+        self._connected.clear()
+
+        if self.policy == ReconnectPolicy.FAIL:
+            self.client.futures.fail_pending(
+                ConnectionLostException(
+                    "Connection to ROS lost before feedback was received"
+                )
+            )
+            if self.client.flow_control:
+                self.client.flow_control.reset()
+
+    def _on_ready(self, *args):
+        if self._closing or self._connected.is_set():
+            return
+
+        # Called on the thread of the connection, so resume on another one
+        ros = self.client.ros
+        ros.call_later(self.delay, lambda: ros.call_in_thread(self._resume))
+
+    def _resume(self):
+        try:
+            self.client._recheck_protocol_version()
+            if self.policy == ReconnectPolicy.REPLAY:
+                self._replay()
+            self.error = None
+        except Exception as error:
+            LOGGER.exception("Could not resume after reconnecting to ROS")
+            self.error = error
+            self.client.futures.fail_pending(error)
+
+        self.reconnections += 1
+        self._connected.set()
+
+    def _replay(self):
+        with self.client._publish_lock:
+            with self._lock:
+                entries = sorted(
+                    entry for sent in self._sent.values() for entry in sent.values()
+                )
+            LOGGER.info("Replaying %d unacknowledged instructions", len(entries))
+            for _, message in entries:
+                self.client.topic.publish(message)
+
+
+_PARAM_NAMES = weakref.WeakKeyDictionary()
+_PARAM_NAMES_LOCK = threading.Lock()
+
+
+def _get_param_names(ros, callback, errback):
+    """Fetch the parameter names of the ROS connection once, and share them with all callers."""
+    with _PARAM_NAMES_LOCK:
+        entry = _PARAM_NAMES.get(ros)
+        if entry is None:
+            entry = _PARAM_NAMES[ros] = dict(names=None, waiting=[])
+        names = entry["names"]
+        if names is None:
+            entry["waiting"].append((callback, errback))
+            fetch = len(entry["waiting"]) == 1
+
+    if names is not None:
+        callback(names)
+        return
+    if not fetch:
+        return
+
+    def _received(names):
+        with _PARAM_NAMES_LOCK:
+            entry["names"] = names
+            waiting, entry["waiting"] = entry["waiting"], []
+        for callback, _ in waiting:
+            callback(names)
+
+    def _failed(error):
+        with _PARAM_NAMES_LOCK:
+            _PARAM_NAMES.pop(ros, None)
+            waiting, entry["waiting"] = entry["waiting"], []
+        for _, errback in waiting:
+            errback(error)
+
+    ros.get_params(_received, _failed)
+
+
+def _namespace_error(params):
+    detected_namespaces = set()
+    tentative_namespaces = set()
+    for param in params:
+        if param.endswith("/robot_state_port") or param.endswith("/protocol_version"):
+            namespace = param[: param.rindex("/")]
+            if namespace not in tentative_namespaces:
+                tentative_namespaces.add(namespace)
+            else:
+                detected_namespaces.add(namespace)
+
+    return "Cannot find the specified namespace. Detected namespaces={}".format(
+        sorted(detected_namespaces)
+    )
+
+
+def _get_parser(instruction):
+    return (
+        instruction.parse_feedback if hasattr(instruction, "parse_feedback") else None
+    )
+
+
 def default_feedback_parser(result):
     feedback_value = result["feedback"]
 
@@ -58,6 +1098,120 @@ def default_feedback_parser(result):
     return feedback_value
 
 
+def _parse_feedback(future, message):
+    if future["parser"]:
+        return future["parser"](message)
+    return default_feedback_parser(message)
+
+
+class Subscription(object):
+    """Handle to the feedback stream activated by :meth:`AbbClient.send_and_subscribe`.
+
+    Unsubscribing stops the delivery of feedback to the callback and releases
+    the subscription from the client. Values still streamed by the robot
+    afterwards are discarded.
+    """
+
+    def __init__(
+        self, client, callback, parser, policy=DeliveryPolicy.ALL, interval=None
+    ):
+        if policy not in (
+            DeliveryPolicy.ALL,
+            DeliveryPolicy.LATEST,
+            DeliveryPolicy.RATE,
+        ):
+            raise ValueError("Unknown delivery policy: {}".format(policy))
+        if policy == DeliveryPolicy.RATE and not interval:
+            raise ValueError("The rate delivery policy requires an interval")
+
+        self.client = client
+        self.callback = callback
+        self.parser = parser
+        self.policy = policy
+        self.interval = interval
+        self.sequence_id = None
+        self.generation = None
+        self.active = True
+        self._lock = threading.Lock()
+        self._latest = None
+        self._scheduled = False
+        self._last_delivery = None
+
+    def unsubscribe(self):
+        """Stop delivering feedback to the callback of this subscription."""
+        self.active = False
+        if self.sequence_id is not None:
+            self.client.futures.pop(self.sequence_id, self.generation)
+
+    def _receive(self, message):
+        if not self.active:
+            return
+
+        if self.policy == DeliveryPolicy.RATE:
+            now = time.time()
+            if (
+                self._last_delivery is not None
+                and now - self._last_delivery < self.interval
+            ):
+                return
+            self._last_delivery = now
+
+        if self.policy == DeliveryPolicy.LATEST:
+            with self._lock:
+                self._latest = message
+                if self._scheduled:
+                    return
+                self._scheduled = True
+            self._schedule(self._deliver_latest)
+        else:
+            self._schedule(self._deliver, message)
+
+    def _schedule(self, callback, *args):
+        if self.client.dispatcher:
+            self.client.dispatcher.dispatch(self, callback, *args)
+        else:
+            callback(*args)
+
+    def _deliver_latest(self):
+        with self._lock:
+            message, self._latest = self._latest, None
+            self._scheduled = False
+        self._deliver(message)
+
+    def _deliver(self, message):
+        if not self.active:
+            return
+        result = (
+            self.parser(message) if self.parser else default_feedback_parser(message)
+        )
+        self.callback(result)
+
+
+class _Outgoing(object):
+    """Entries of one producer in the outbox of a client, and the outcome of their publication."""
+
+    __slots__ = ("entries", "done", "error")
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.done = False
+        self.error = None
+
+    def complete(self, error=None):
+        self.done = True
+        self.error = error
+        if error is None:
+            return
+
+        for _, result in self.entries:
+            if result is None or isinstance(result, Subscription):
+                continue
+            # Asynchronous results ignore values set once resolved
+            if isinstance(result, FutureResult) and result.done:
+                continue
+            result._set_result(error)
+
+
 class AbbClient(object):
     """Client used to communicate with ABB robots via ROS.
 
@@ -102,9 +1256,28 @@ class AbbClient(object):
         ros.close()
         ros.terminate()
 
+    A client can be shared by several threads. The instructions sent by each
+    thread are published in the order in which that thread sent them, and
+    concurrent sends are combined into a single publication step, so that adding
+    threads does not add contention.
+
     """
 
-    def __init__(self, ros, namespace="/rob1"):
+    def __init__(
+        self,
+        ros,
+        namespace="/rob1",
+        flow_control=None,
+        pending_requests=None,
+        dispatcher=None,
+        stats=None,
+        state_cache=None,
+        joint_states=None,
+        partition=None,
+        reconnection=None,
+        journal=None,
+        recorder=None,
+    ):
         """Initialize a new robot client instance.
 
         Parameters
@@ -114,9 +1287,40 @@ class AbbClient(object):
         namespace : :obj:`str`
             Namespace to allow multiple robots to be controlled through the same ROS instance.
             Optional. If not specified, it will use namespace ``/rob1``.
+        flow_control : :class:`FlowControl`
+            Limits the number of instructions in flight towards the robot. Optional.
+            If not specified, instructions are sent as fast as possible.
+        pending_requests : :class:`PendingRequests`
+            Table of requests waiting for feedback. Optional.
+            If not specified, requests never expire.
+        dispatcher : :class:`FeedbackDispatcher`
+            Delivers subscription feedback on worker threads. Optional.
+            If not specified, callbacks are invoked on the ROS receive thread.
+        stats : :class:`ClientStats`
+            Collects latency and throughput statistics. Optional.
+        state_cache : :class:`StateCache`
+            Coalesces and caches reads made with :meth:`read`. Optional.
+            If not specified, concurrent reads are coalesced but not cached.
+        joint_states : :class:`JointStateMirror`
+            Mirrors the joint state published by the driver, without round trips. Optional.
+        partition : :class:`SequencePartition`
+            Range of sequence ids reserved to this client, when other processes send to the same robot. Optional.
+            If not specified, the client uses all sequence ids.
+        reconnection : :class:`Reconnection`
+            Keeps the client usable when the connection to ROS drops and is restored. Optional.
+            If not specified, instructions waiting for feedback lost while disconnected wait forever.
+        journal : :class:`SendJournal`
+            Records the instructions sent and acknowledged, to resume a job after a crash. Optional.
+        recorder : :class:`RecordingWriter`
+            Records every instruction sent, to replay the program later. Optional.
         """
         self.ros = ros
-        self.counter = SequenceCounter()
+        self.stats = stats
+        self.state_cache = state_cache if state_cache is not None else StateCache()
+        self.flow_control = flow_control
+        self.dispatcher = dispatcher
+        self.partition = partition
+        self.counter = partition.create_counter() if partition else SequenceCounter()
         if not namespace.endswith("/"):
             namespace += "/"
         self._version_checked = False
@@ -124,8 +1328,9 @@ class AbbClient(object):
             event=threading.Event(),
             param=roslibpy.Param(ros, namespace + "protocol_version"),
             version=None,
+            error=None,
         )
-        self.ros.on_ready(self.version_check)
+        self.ros.on_ready(self._request_protocol_version, run_in_thread=False)
         self.topic = roslibpy.Topic(
             ros,
             namespace + "robot_command",
@@ -140,47 +1345,86 @@ class AbbClient(object):
         )
         self.feedback.subscribe(self.feedback_callback)
         self.topic.advertise()
-        self.futures = {}
+        self.joint_states = joint_states
+        if self.joint_states:
+            self.joint_states.attach(ros, namespace)
+        self.futures = (
+            pending_requests if pending_requests is not None else PendingRequests()
+        )
+        self._local = threading.local()
+        self._outbox = deque()
+        self._publish_lock = threading.Lock()
+        self.journal = journal
+        self.recorder = recorder
+        self.reconnection = reconnection
+        if self.reconnection:
+            self.reconnection.attach(self)
 
         self.ros.on("closing", self._disconnect_topics)
 
     def version_check(self):
         """Check if the protocol version on the server matches the protocol version on the client."""
-        self._server_protocol_check["version"] = self._server_protocol_check[
-            "param"
-        ].get()
+        version = self._server_protocol_check["param"].get()
         # No version is usually caused by wrong namespace in the connection, check that and raise correct error
-        if self._server_protocol_check["version"] is None:
-            params = self.ros.get_params()
-
-            detected_namespaces = set()
-            tentative_namespaces = set()
-            for param in params:
-                if param.endswith("/robot_state_port") or param.endswith(
-                    "/protocol_version"
-                ):
-                    namespace = param[: param.rindex("/")]
-                    if namespace not in tentative_namespaces:
-                        tentative_namespaces.add(namespace)
-                    else:
-                        detected_namespaces.add(namespace)
+        if version is None:
+            raise Exception(_namespace_error(self.ros.get_params()))
 
-            raise Exception(
-                "Cannot find the specified namespace. Detected namespaces={}".format(
-                    sorted(detected_namespaces)
-                )
+        self._server_protocol_check["version"] = version
+        self._server_protocol_check["event"].set()
+
+    def _recheck_protocol_version(self, timeout=10):
+        self._version_checked = False
+        self._server_protocol_check["version"] = None
+        self._server_protocol_check["error"] = None
+        self._server_protocol_check["event"].clear()
+        self._request_protocol_version()
+        self.ensure_protocol_version(timeout)
+
+    def _request_protocol_version(self):
+        # Non-blocking, so that the versions of many clients are fetched in parallel
+        self._server_protocol_check["param"].get(
+            self._receive_protocol_version, self._protocol_version_failed
+        )
+
+    def _receive_protocol_version(self, version):
+        if version is None:
+            # No version is usually caused by wrong namespace in the connection, check that and raise correct error
+            _get_param_names(
+                self.ros,
+                lambda names: self._protocol_version_failed(
+                    Exception(_namespace_error(names))
+                ),
+                self._protocol_version_failed,
             )
+            return
+
+        self._server_protocol_check["version"] = version
+        self._server_protocol_check["event"].set()
 
+    def _protocol_version_failed(self, error):
+        if not isinstance(error, Exception):
+            error = Exception(
+                "Could not retrieve server protocol version: {}".format(error)
+            )
+        self._server_protocol_check["error"] = error
         self._server_protocol_check["event"].set()
 
-    def ensure_protocol_version(self):
-        """Ensure protocol version on the server matches the protocol version on the client."""
+    def ensure_protocol_version(self, timeout=10):
+        """Ensure protocol version on the server matches the protocol version on the client.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Time in seconds to wait for the protocol version of the server. Defaults to ``10``.
+        """
         if self._version_checked:
             return
 
-        if not self._server_protocol_check["version"]:
-            if not self._server_protocol_check["event"].wait(10):
-                raise Exception("Could not yet retrieve server protocol version")
+        if not self._server_protocol_check["event"].wait(timeout):
+            raise Exception("Could not yet retrieve server protocol version")
+
+        if self._server_protocol_check["error"]:
+            raise self._server_protocol_check["error"]
 
         if self._server_protocol_check["version"] != CLIENT_PROTOCOL_VERSION:
             raise Exception(
@@ -191,11 +1435,43 @@ class AbbClient(object):
 
         self._version_checked = True
 
+    def connect(self, timeout=None):
+        """Wait until the client is ready to send instructions.
+
+        The protocol version of the server is requested as soon as the client
+        is created, without blocking, so creating several clients first and
+        then connecting them waits for all of them in parallel.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Timeout in seconds to wait before raising an exception. Optional.
+            If not specified, waits until the server replies.
+
+        Examples
+        --------
+
+        Bring up all the robots of a cell::
+
+            clients = [rrc.AbbClient(ros, '/rob{}'.format(i)) for i in range(1, 9)]
+            for abb in clients:
+                abb.connect(timeout=5)
+
+        """
+        self.ensure_protocol_version(timeout)
+
     def _disconnect_topics(self):
         self.topic.unadvertise()
         self.feedback.unsubscribe()
+        if self.joint_states:
+            self.joint_states.detach()
         time.sleep(0.5)
 
+    def _create_future(self, instruction):
+        if instruction.feedback_level > 0:
+            return FutureResult()
+        return None
+
     def send(self, instruction):
         """Sends an instruction to the robot without waiting.
 
@@ -244,24 +1520,222 @@ class AbbClient(object):
             print('Print Time [s] = ', watch_time)
 
         """
+        result = self._create_future(instruction)
+
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            batch.append((instruction, result))
+            return result
+
+        self._publish_many([(instruction, result)])
+
+        return result
+
+    def send_many(self, instructions):
+        """Sends a sequence of instructions to the robot without waiting.
+
+        This is equivalent to calling :meth:`send` for each instruction,
+        but sequence ids are reserved in one step and all feedback
+        requests are registered at once before publishing, which
+        considerably reduces the per-instruction overhead when
+        streaming long toolpaths.
+
+        Parameters
+        ----------
+        instructions : :obj:`list` of :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Messages representing the instructions to send.
+
+        Returns
+        -------
+        :obj:`list`
+            One item per instruction, either a :class:`FutureResult` or ``None``
+            if the instruction does not request feedback (see :meth:`send`).
+
+        Examples
+        --------
+
+        Streaming a complete toolpath in one call::
+
+            # Print path
+            abb.send_many([rrc.MoveToFrame(frame, 150, rrc.Zone.Z5, rrc.Motion.LINEAR) for frame in frames])
+
+        """
+        entries = [
+            (instruction, self._create_future(instruction))
+            for instruction in instructions
+        ]
+
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            batch.extend(entries)
+        else:
+            self._publish_many(entries)
+
+        return [result for _, result in entries]
+
+    @contextmanager
+    def batch(self):
+        """Context manager to coalesce all instructions sent within its block.
+
+        Calls to :meth:`send` made by the current thread inside the block
+        return immediately and the instructions are published together,
+        as with :meth:`send_many`, when the block exits. Calling
+        :meth:`send_and_wait` or :meth:`send_and_subscribe` inside the block
+        publishes the instructions queued so far before continuing.
+
+        If the block raises an exception, the instructions still queued are
+        not published and their results fail with that exception.
+
+        Examples
+        --------
+
+        Queue a toolpath and publish it in one go::
+
+            with abb.batch():
+                for frame in frames:
+                    abb.send(rrc.MoveToFrame(frame, 150, rrc.Zone.Z5, rrc.Motion.LINEAR))
+                done = abb.send(rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE))
+
+            done.result()
+
+        """
+        if getattr(self._local, "batch", None) is not None:
+            # Nested batches are merged into the outermost one
+            yield
+            return
+
+        self._local.batch = []
+        try:
+            yield
+        except BaseException as error:
+            self._discard_batch(error)
+            raise
+        self._flush_batch(reset=True)
+
+    def _discard_batch(self, error):
+        batch = self._local.batch
+        self._local.batch = None
+
+        if not isinstance(error, Exception):
+            error = Exception("Batch discarded: {!r}".format(error))
+        for _, result in batch:
+            if result is not None and not isinstance(result, Subscription):
+                result._set_result(error)
+
+    def _flush_batch(self, reset=False):
+        batch = getattr(self._local, "batch", None)
+        if batch is None:
+            return
+
+        self._local.batch = None if reset else []
+        if batch:
+            self._publish_many(batch)
+
+    def _publish_many(self, entries):
+        if self.reconnection:
+            self.reconnection.wait()
         self.ensure_protocol_version()
-        instruction.sequence_id = self.counter.increment()
 
-        key = _get_key(instruction)
-        result = None
+        if not self.flow_control:
+            self._enqueue(entries)
+            return
 
-        if instruction.feedback_level > 0:
-            result = FutureResult()
-            parser = (
-                instruction.parse_feedback
-                if hasattr(instruction, "parse_feedback")
-                else None
-            )
-            self.futures[key] = dict(result=result, parser=parser)
+        start = 0
+        while start < len(entries):
+            pending = (entries[i][0] for i in range(start, len(entries)))
+            end = start + self.flow_control.reserve(pending)
+            self._enqueue(entries[start:end])
+            start = end
+
+    def _enqueue(self, entries):
+        # Producers queue their entries and whoever holds the publish lock
+        # publishes the entries of all of them, so that sequence ids, flow
+        # control and the order of messages on the topic always agree
+        outgoing = _Outgoing(entries)
+        self._outbox.append(outgoing)
+
+        with self._publish_lock:
+            # Unless already published by another producer
+            if not outgoing.done:
+                combined = []
+                while True:
+                    try:
+                        combined.append(self._outbox.popleft())
+                    except IndexError:
+                        break
+
+                error = None
+                try:
+                    self._publish_entries(
+                        [entry for item in combined for entry in item.entries]
+                    )
+                except Exception as publish_error:
+                    error = publish_error
+
+                for item in combined:
+                    item.complete(error)
+
+        # Every producer gets the error of the publication of its own entries
+        if outgoing.error is not None:
+            raise outgoing.error
+
+    def _publish_entries(self, entries):
+        size = self.counter.size
+        if len(entries) > size:
+            # More instructions than sequence ids in the range of the counter
+            for start in range(0, len(entries), size):
+                end = start + size
+                self._publish_entries(entries[start:end])
+            return
 
-        self.topic.publish(roslibpy.Message(instruction.msg))
+        sequence_ids = self.counter.allocate(len(entries))
 
-        return result
+        futures = {}
+        messages = []
+        for (instruction, result), sequence_id in zip(entries, sequence_ids):
+            instruction.sequence_id = sequence_id
+            if isinstance(result, Subscription):
+                futures[sequence_id] = dict(subscription=result)
+            else:
+                if self.flow_control and self.flow_control.track(instruction):
+                    # Checkpoint requested by flow control, the result is not exposed
+                    result = result or FutureResult()
+                if result is not None:
+                    futures[sequence_id] = dict(
+                        result=result, parser=_get_parser(instruction)
+                    )
+            messages.append(roslibpy.Message(instruction.msg))
+
+        instructions = [instruction for instruction, _ in entries]
+        self.state_cache.record_sent(instructions)
+
+        if self.journal:
+            self.journal.record_sent(instructions)
+
+        if self.recorder:
+            self.recorder.write(messages)
+
+        self.futures.update(futures)
+
+        for sequence_id, entry in futures.items():
+            if "subscription" in entry:
+                entry["subscription"].sequence_id = sequence_id
+                entry["subscription"].generation = entry["generation"]
+
+        try:
+            if self.reconnection:
+                self.reconnection.record_sent(instructions, messages)
+
+            if self.stats:
+                self.stats.record_sent(instructions)
+
+            for message in messages:
+                self.topic.publish(message)
+        except Exception:
+            # Nothing will resolve the entries of a failed publication
+            for sequence_id, entry in futures.items():
+                self.futures.pop(sequence_id, entry["generation"])
+            raise
 
     def send_and_wait(self, instruction, timeout=None):
         """Send instruction and wait for feedback.
@@ -299,9 +1773,41 @@ class AbbClient(object):
             instruction.feedback_level = 1
 
         future = self.send(instruction)
+        self._flush_batch()
         return future.result(timeout)
 
-    def send_and_subscribe(self, instruction, callback):
+    def read(self, instruction, timeout=None):
+        """Send an instruction that reads the state of the robot and wait for feedback.
+
+        Behaves like :meth:`send_and_wait`, but concurrent reads of the same
+        state share a single instruction, and feedback can be reused for a
+        short time, as configured by the :class:`StateCache` of the client.
+
+        Parameters
+        ----------
+        instruction : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Message representing the read instruction, e.g. :class:`GetJoints` or :class:`ReadDigital`.
+        timeout : :obj:`int`
+            Timeout in seconds to wait before raising an exception. Optional.
+
+        Returns
+        -------
+        object
+            Returns the feedback value of the read instruction.
+
+        Examples
+        --------
+
+        Read the current position from any thread of the cell controller::
+
+            frame = abb.read(rrc.GetFrame())
+
+        """
+        return self.state_cache.read(self, instruction, timeout)
+
+    def send_and_subscribe(
+        self, instruction, callback, policy=DeliveryPolicy.ALL, interval=None
+    ):
         """Send instruction and activate a service on the robot to stream feedback at a regular inverval.
 
         Parameters
@@ -310,40 +1816,419 @@ class AbbClient(object):
             ROS Message representing the instruction to send.
         callback
             Python function to be invoked every time a new value is made available.
+        policy : :class:`DeliveryPolicy`
+            Defines which values are delivered to the callback. Defaults to :attr:`DeliveryPolicy.ALL`.
+        interval : :obj:`float`
+            Minimum time in seconds between deliveries, required by :attr:`DeliveryPolicy.RATE`.
+
+        Returns
+        -------
+        :class:`Subscription`
+            Handle to stop receiving feedback.
+
+        Examples
+        --------
+
+        Only handle the newest value of a high-rate stream, and stop after a while::
+
+            subscription = abb.send_and_subscribe(instruction, plot_value, policy=rrc.DeliveryPolicy.LATEST)
+            time.sleep(10)
+            subscription.unsubscribe()
 
         Notes
         -----
             This feature is currently only usable with custom instructions.
 
         """
-        self.ensure_protocol_version()
-        instruction.sequence_id = self.counter.increment()
-
-        key = _get_key(instruction)
-
-        parser = (
-            instruction.parse_feedback
-            if hasattr(instruction, "parse_feedback")
-            else None
+        subscription = Subscription(
+            self, callback, _get_parser(instruction), policy, interval
         )
-        self.futures[key] = dict(callback=callback, parser=parser)
 
-        self.topic.publish(roslibpy.Message(instruction.msg))
+        self._flush_batch()
+        self.ensure_protocol_version()
+        self._enqueue([(instruction, subscription)])
+
+        return subscription
 
     def feedback_callback(self, message):
         """Internal method."""
-        response_key = _get_response_key(message)
-        future = self.futures.get(response_key, None)
+        feedback_id = message["feedback_id"]
+        if self.partition and feedback_id not in self.partition:
+            # Feedback of an instruction sent by another process
+            return
+
+        if self.reconnection:
+            self.reconnection.acknowledge(feedback_id)
+
+        if self.journal:
+            self.journal.acknowledge(feedback_id)
+
+        future = self.futures.get(feedback_id)
+
+        if self.stats:
+            self.stats.record_feedback(feedback_id)
+
+        if self.flow_control:
+            self.flow_control.acknowledge(feedback_id)
 
         if future:
-            result = message
-            if future["parser"]:
-                result = future["parser"](result)
-            else:
-                result = default_feedback_parser(result)
             if "result" in future:
-                future["result"]._set_result(result)
-                self.futures.pop(response_key)
-            elif "callback" in future:
-                future["callback"](result)
-                # TODO: Handle unsubscribes
+                # Only the thread that removes the entry resolves it
+                if not self.futures.pop(feedback_id, future["generation"]):
+                    return
+                future["result"]._set_result(_parse_feedback(future, message))
+            elif "subscription" in future:
+                future["subscription"]._receive(message)
+
+
+class AsyncFutureResult(object):
+    """Represents a future result value that can be awaited from an ``asyncio`` event loop.
+
+    The value is set from the ROS receive thread and handed over
+    to the event loop in a thread-safe way."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def done(self):
+        """Return ``True`` if the feedback value is available."""
+        return self.future.done()
+
+    def _set_result(self, value):
+        self.loop.call_soon_threadsafe(self._resolve, value)
+
+    def _resolve(self, value):
+        if self.future.done():
+            return
+        if isinstance(value, Exception):
+            self.future.set_exception(value)
+        else:
+            self.future.set_result(value)
+
+
+class AsyncSubscription(object):
+    """Asynchronous iterator over the feedback values streamed by
+    :meth:`AsyncAbbClient.send_and_subscribe`.
+
+    The iteration ends when :meth:`unsubscribe` is called."""
+
+    def __init__(self, loop, conflate=False):
+        self.loop = loop
+        self.conflate = conflate
+        self.subscription = None
+        self.values = deque()
+        self.waiters = deque()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self.loop.create_future()
+        if self.values:
+            future.set_result(self.values.popleft())
+        elif self.closed:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self.waiters.append(future)
+        return future
+
+    def unsubscribe(self):
+        """Stop the subscription and end the iteration."""
+        if self.subscription:
+            self.subscription.unsubscribe()
+        self.loop.call_soon_threadsafe(self._close)
+
+    def _push(self, value):
+        self.loop.call_soon_threadsafe(self._deliver, value)
+
+    def _deliver(self, value):
+        if self.closed:
+            return
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(value)
+                return
+        if self.conflate:
+            self.values.clear()
+        self.values.append(value)
+
+    def _close(self):
+        self.closed = True
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(StopAsyncIteration())
+
+
+class _BlockingSender(object):
+    """Blocking :meth:`AbbClient.send_and_wait` of an asynchronous client, for its state cache."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def send_and_wait(self, instruction, timeout=None):
+        if instruction.feedback_level == 0:
+            instruction.feedback_level = 1
+
+        future = FutureResult()
+        self.client._publish_many([(instruction, future)])
+        return future.result(timeout)
+
+
+class AsyncAbbClient(AbbClient):
+    """Client used to communicate with ABB robots via ROS from ``asyncio`` code.
+
+    It behaves like :class:`AbbClient`, but instead of blocking, all
+    methods return awaitables, so that a single event loop can coordinate
+    many robots concurrently without one thread per waiting call.
+    Feedback received on the ROS thread is handed over to the event loop.
+
+    Examples
+    --------
+
+    Drive two robots concurrently from one event loop::
+
+        async def main():
+            ros = rrc.RosClient()
+            ros.run()
+
+            abb_rob1 = rrc.AsyncAbbClient(ros, '/rob1')
+            abb_rob2 = rrc.AsyncAbbClient(ros, '/rob2')
+            await asyncio.gather(abb_rob1.connect(), abb_rob2.connect())
+
+            # Both robots move at the same time
+            await asyncio.gather(
+                abb_rob1.send_and_wait(rrc.MoveToJoints(joints_rob1, [], 1000, rrc.Zone.FINE)),
+                abb_rob2.send_and_wait(rrc.MoveToJoints(joints_rob2, [], 1000, rrc.Zone.FINE)),
+            )
+
+            ros.close()
+            ros.terminate()
+
+        asyncio.run(main())
+
+    """
+
+    def __init__(
+        self,
+        ros,
+        namespace="/rob1",
+        loop=None,
+        flow_control=None,
+        pending_requests=None,
+        dispatcher=None,
+        stats=None,
+        **kwargs
+    ):
+        """Initialize a new asynchronous robot client instance.
+
+        Parameters
+        ----------
+        ros : :class:`RosClient`
+            Instance of a ROS connection.
+        namespace : :obj:`str`
+            Namespace to allow multiple robots to be controlled through the same ROS instance.
+            Optional. If not specified, it will use namespace ``/rob1``.
+        loop : :class:`asyncio.AbstractEventLoop`
+            Event loop on which feedback is delivered. Optional.
+            Defaults to the event loop running when the client is first used.
+        flow_control : :class:`FlowControl`
+            Limits the number of instructions in flight towards the robot. Optional.
+            Note that waiting for room in the window blocks the event loop.
+        pending_requests : :class:`PendingRequests`
+            Table of requests waiting for feedback. Optional.
+        dispatcher : :class:`FeedbackDispatcher`
+            Parses subscription feedback on worker threads. Optional.
+        stats : :class:`ClientStats`
+            Collects latency and throughput statistics. Optional.
+        **kwargs
+            Other options of :class:`AbbClient`, e.g. ``state_cache``, ``reconnection`` or ``journal``.
+        """
+        if asyncio is None:
+            raise Exception("AsyncAbbClient requires asyncio support")
+        super(AsyncAbbClient, self).__init__(
+            ros, namespace, flow_control, pending_requests, dispatcher, stats, **kwargs
+        )
+        self.loop = loop
+
+    def _get_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.get_event_loop()
+        return self.loop
+
+    def _create_future(self, instruction):
+        if instruction.feedback_level > 0:
+            return AsyncFutureResult(self._get_loop())
+        return None
+
+    def _completed(self, value=None):
+        future = self._get_loop().create_future()
+        future.set_result(value)
+        return future
+
+    def connect(self, timeout=None):
+        """Wait until the protocol version of the server has been verified.
+
+        Returns
+        -------
+        awaitable
+            Completes once the client is ready to send instructions.
+        """
+        loop = self._get_loop()
+        future = loop.run_in_executor(None, self.ensure_protocol_version)
+        return self._wait_for(future, timeout)
+
+    def send(self, instruction):
+        """Sends an instruction to the robot without waiting.
+
+        If the client has not yet verified the server protocol version,
+        this call may block the event loop while it does so; await
+        :meth:`connect` first to avoid it.
+
+        Parameters
+        ----------
+        instruction : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Message representing the instruction to send.
+
+        Returns
+        -------
+        awaitable
+            Resolves to the feedback value of the instruction, or
+            to ``None`` immediately if the instruction does not request feedback.
+        """
+        result = super(AsyncAbbClient, self).send(instruction)
+        if result is None:
+            return self._completed()
+        return result
+
+    def send_many(self, instructions):
+        """Sends a sequence of instructions to the robot without waiting.
+
+        See :meth:`AbbClient.send_many`.
+
+        Returns
+        -------
+        :obj:`list` of awaitable
+            One awaitable per instruction, as returned by :meth:`send`.
+        """
+        results = super(AsyncAbbClient, self).send_many(instructions)
+        return [self._completed() if result is None else result for result in results]
+
+    def send_and_wait(self, instruction, timeout=None):
+        """Send instruction and wait for feedback.
+
+        If ``feedback_level`` of the ``instruction`` parameter is ``0``,
+        it will be automatically set to ``1``.
+
+        Parameters
+        ----------
+        instruction : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Message representing the instruction to send.
+        timeout : :obj:`int`
+            Timeout in seconds to wait before raising a :class:`TimeoutException`. Optional.
+
+        Returns
+        -------
+        awaitable
+            Resolves to the feedback value that resulted from the execution of the instruction.
+        """
+        if instruction.feedback_level == 0:
+            instruction.feedback_level = 1
+
+        future = self.send(instruction)
+        self._flush_batch()
+        return self._wait_for(future, timeout)
+
+    def read(self, instruction, timeout=None):
+        """Send an instruction that reads the state of the robot and wait for feedback.
+
+        See :meth:`AbbClient.read`. Waiting for a read shared with other
+        callers happens on a worker thread, so the event loop is never blocked.
+
+        Parameters
+        ----------
+        instruction : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Message representing the read instruction, e.g. :class:`GetJoints` or :class:`ReadDigital`.
+        timeout : :obj:`int`
+            Timeout in seconds to wait before raising an exception. Optional.
+
+        Returns
+        -------
+        awaitable
+            Resolves to the feedback value of the read instruction.
+        """
+        return self._get_loop().run_in_executor(
+            None, self.state_cache.read, _BlockingSender(self), instruction, timeout
+        )
+
+    def send_and_subscribe(self, instruction, policy=DeliveryPolicy.ALL, interval=None):
+        """Send instruction and activate a service on the robot to stream feedback at a regular inverval.
+
+        Parameters
+        ----------
+        instruction : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            ROS Message representing the instruction to send.
+        policy : :class:`DeliveryPolicy`
+            Defines which values are yielded. Defaults to :attr:`DeliveryPolicy.ALL`.
+            With :attr:`DeliveryPolicy.LATEST`, only the newest value is kept until it is consumed.
+        interval : :obj:`float`
+            Minimum time in seconds between values, required by :attr:`DeliveryPolicy.RATE`.
+
+        Returns
+        -------
+        :class:`AsyncSubscription`
+            Asynchronous iterator yielding every new feedback value.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            async for value in abb.send_and_subscribe(instruction):
+                print(value)
+
+        """
+        subscription = AsyncSubscription(
+            self._get_loop(), conflate=policy == DeliveryPolicy.LATEST
+        )
+        subscription.subscription = super(AsyncAbbClient, self).send_and_subscribe(
+            instruction, subscription._push, policy, interval
+        )
+        return subscription
+
+    def _wait_for(self, awaitable, timeout):
+        future = (
+            awaitable.future if isinstance(awaitable, AsyncFutureResult) else awaitable
+        )
+        if timeout is None:
+            return future
+
+        outer = self._get_loop().create_future()
+
+        def _on_timeout():
+            if not outer.done():
+                outer.set_exception(
+                    TimeoutException("Timeout: future result not available")
+                )
+
+        handle = self._get_loop().call_later(timeout, _on_timeout)
+
+        def _on_done(inner):
+            handle.cancel()
+            if outer.done():
+                return
+            if inner.cancelled():
+                outer.cancel()
+            elif inner.exception() is not None:
+                outer.set_exception(inner.exception())
+            else:
+                outer.set_result(inner.result())
+
+        future.add_done_callback(_on_done)
+        return outer
@@ -1,6 +1,10 @@
+import array
 import itertools
+import logging
 import math
 import threading
+import time
+from collections import deque
 
 from compas_robots import Configuration
 from compas_robots.model import Joint
@@ -9,15 +13,26 @@ __all__ = [
     "CLIENT_PROTOCOL_VERSION",
     "FeedbackLevel",
     "ExecutionLevel",
+    "DeliveryPolicy",
+    "ReconnectPolicy",
     "InstructionException",
     "TimeoutException",
+    "ConnectionLostException",
     "FutureResult",
+    "ReturnWhen",
+    "wait",
+    "gather",
+    "as_completed",
     "ExternalAxes",
     "RobotJoints",
+    "CompactExternalAxes",
+    "CompactRobotJoints",
 ]
 
 CLIENT_PROTOCOL_VERSION = 2
 
+LOGGER = logging.getLogger("compas_rrc")
+
 
 def _convert_unit_to_meters_radians(value, type_):
     if type_ in {Joint.REVOLUTE, Joint.CONTINUOUS}:
@@ -61,6 +76,38 @@ class ExecutionLevel(object):
     """Execute instruction on the ``controller`` task (only usable with custom instructions)."""
 
 
+class DeliveryPolicy(object):
+    """Defines how the feedback of a subscription is delivered to its callback.
+
+    .. autoattribute:: ALL
+    .. autoattribute:: LATEST
+    .. autoattribute:: RATE
+    """
+
+    ALL = "all"
+    """Deliver every value in the order it was received."""
+
+    LATEST = "latest"
+    """Deliver only the newest value, discarding values received while the callback is busy."""
+
+    RATE = "rate"
+    """Deliver at most one value per interval, discarding values received in between."""
+
+
+class ReconnectPolicy(object):
+    """Defines what happens to instructions waiting for feedback when the connection to ROS is lost.
+
+    .. autoattribute:: FAIL
+    .. autoattribute:: REPLAY
+    """
+
+    FAIL = "fail"
+    """Fail the instructions waiting for feedback as soon as the connection is lost."""
+
+    REPLAY = "replay"
+    """Send again the instructions not yet acknowledged once the connection is restored."""
+
+
 class InstructionException(Exception):
     """Exception caused during/after the execution of an instruction."""
 
@@ -77,6 +124,12 @@ class TimeoutException(Exception):
     pass
 
 
+class ConnectionLostException(Exception):
+    """Exception caused by the loss of the connection to ROS while waiting for feedback."""
+
+    pass
+
+
 class FutureResult(object):
     """Represents a future result value.
 
@@ -88,6 +141,8 @@ class FutureResult(object):
         self.done = False
         self.value = None
         self.event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
 
     def result(self, timeout=None):
         """Return the feedback value returned by the instruction.
@@ -105,27 +160,224 @@ class FutureResult(object):
 
         return self.value
 
+    def add_done_callback(self, callback):
+        """Add a function to be called with the future as argument once it is done.
+
+        If the future is already done, the function is called immediately.
+        Otherwise, it is called on the thread that completes the future, usually
+        the ROS receive thread, so it should return quickly.
+        """
+        with self._lock:
+            if not self.done:
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def _remove_done_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def _run_callback(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            LOGGER.exception("Error in done callback of future result")
+
     def _set_result(self, value):
-        self.value = value
-        self.done = True
+        with self._lock:
+            self.value = value
+            self.done = True
+            callbacks, self._callbacks = self._callbacks, []
         self.event.set()
 
+        for callback in callbacks:
+            self._run_callback(callback)
 
-class ExternalAxes(object):
-    """Represents a configuration for external axes."""
 
-    def __init__(self, *values):
-        """Initialize a new object with the specified values for external axes.
+class ReturnWhen(object):
+    """Defines when :func:`wait` returns.
 
-        Parameters
-        ----------
-        values : :obj:`list`
-            List of floats indicating the external axis positions.
-        """
-        try:
-            self.values = list(itertools.chain.from_iterable(values))
-        except TypeError:
-            self.values = list(values)
+    .. autoattribute:: FIRST_COMPLETED
+    .. autoattribute:: FIRST_EXCEPTION
+    .. autoattribute:: ALL_COMPLETED
+    """
+
+    FIRST_COMPLETED = "first_completed"
+    """Return as soon as any future is done."""
+
+    FIRST_EXCEPTION = "first_exception"
+    """Return as soon as any future fails, or when all futures are done."""
+
+    ALL_COMPLETED = "all_completed"
+    """Return when all futures are done."""
+
+
+def _failed(future):
+    return isinstance(future.value, Exception)
+
+
+def wait(futures, timeout=None, return_when=ReturnWhen.ALL_COMPLETED):
+    """Wait for many future results at once, without a thread per future.
+
+    Parameters
+    ----------
+    futures : :obj:`list` of :class:`FutureResult`
+        Futures to wait for. ``None`` items, e.g. returned by :meth:`AbbClient.send`
+        for instructions without feedback, are ignored.
+    timeout : :obj:`float`
+        Maximum time in seconds to wait. Optional. If not specified, waits until the condition is met.
+    return_when : :class:`ReturnWhen`
+        Defines when to return. Defaults to :attr:`ReturnWhen.ALL_COMPLETED`.
+
+    Returns
+    -------
+    :obj:`tuple`
+        Two sets with the futures that are done and the ones that are not.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        # Wait for the first robot to finish
+        futures = [abb.send(rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE)) for abb in clients]
+        done, not_done = rrc.wait(futures, return_when=rrc.ReturnWhen.FIRST_COMPLETED)
+
+    """
+    futures = set(future for future in futures if future is not None)
+    condition = threading.Condition()
+    finished = set()
+    failures = []
+
+    def _on_done(future):
+        with condition:
+            finished.add(future)
+            if _failed(future):
+                failures.append(future)
+            condition.notify_all()
+
+    def _satisfied():
+        if len(finished) == len(futures):
+            return True
+        if return_when == ReturnWhen.FIRST_COMPLETED:
+            return len(finished) > 0
+        if return_when == ReturnWhen.FIRST_EXCEPTION:
+            return len(failures) > 0
+        return False
+
+    for future in futures:
+        future.add_done_callback(_on_done)
+
+    deadline = time.time() + timeout if timeout is not None else None
+    try:
+        with condition:
+            while not _satisfied():
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                condition.wait(remaining)
+            done = set(finished)
+    finally:
+        for future in futures:
+            future._remove_done_callback(_on_done)
+
+    return done, futures - done
+
+
+def gather(futures, timeout=None):
+    """Wait for all future results and return their values.
+
+    Fails as soon as any of the futures fails.
+
+    Parameters
+    ----------
+    futures : :obj:`list` of :class:`FutureResult`
+        Futures to wait for. ``None`` items are returned as ``None``.
+    timeout : :obj:`float`
+        Maximum time in seconds to wait. Optional.
+
+    Returns
+    -------
+    :obj:`list`
+        Values of the futures, in the same order.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        # Pipeline reads, and wait for all of them
+        futures = [abb.send(rrc.ReadDigital(signal)) for signal in signals]
+        values = rrc.gather(futures, timeout=5)
+
+    """
+    futures = list(futures)
+    done, not_done = wait(futures, timeout, ReturnWhen.FIRST_EXCEPTION)
+
+    for future in done:
+        if _failed(future):
+            raise future.value
+    if not_done:
+        raise TimeoutException("Timeout: future result not available")
+
+    return [future.value if future is not None else None for future in futures]
+
+
+def as_completed(futures, timeout=None):
+    """Iterate over future results as they are done.
+
+    Parameters
+    ----------
+    futures : :obj:`list` of :class:`FutureResult`
+        Futures to wait for. ``None`` items are ignored.
+    timeout : :obj:`float`
+        Maximum time in seconds to wait for all futures. Optional.
+
+    Yields
+    ------
+    :class:`FutureResult`
+        Futures in the order in which they are done. If the ``timeout`` expires
+        before all are done, a :class:`TimeoutException` is raised.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        for future in rrc.as_completed(futures, timeout=10):
+            print(future.result())
+
+    """
+    futures = set(future for future in futures if future is not None)
+    condition = threading.Condition()
+    finished = deque()
+
+    def _on_done(future):
+        with condition:
+            finished.append(future)
+            condition.notify_all()
+
+    for future in futures:
+        future.add_done_callback(_on_done)
+
+    deadline = time.time() + timeout if timeout is not None else None
+    try:
+        for _ in range(len(futures)):
+            with condition:
+                while not finished:
+                    remaining = deadline - time.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutException("Timeout: future results not available")
+                    condition.wait(remaining)
+                future = finished.popleft()
+            yield future
+    finally:
+        for future in futures:
+            future._remove_done_callback(_on_done)
+
+
+class _ExternalAxesMixin(object):
+    """Properties and conversion methods shared by :class:`ExternalAxes` and :class:`CompactExternalAxes`."""
+
+    __slots__ = ()
 
     # Properties
     @property
@@ -182,24 +434,8 @@ class ExternalAxes(object):
     def eax_f(self, value):
         self[5] = value
 
-    # List accessors
     def __repr__(self):
-        return "ExternalAxes({})".format([round(i, 2) for i in self.values])
-
-    def __len__(self):
-        return len(self.values)
-
-    def __getitem__(self, item):
-        if item >= len(self.values):
-            return None
-
-        return self.values[item]
-
-    def __setitem__(self, item, value):
-        self.values[item] = value
-
-    def __iter__(self):
-        return iter(self.values)
+        return "{}({})".format(type(self).__name__, [round(i, 2) for i in self.values])
 
     # Conversion methods
     def to_configuration_primitive(self, joint_types, joint_names=None):
@@ -299,15 +535,44 @@ class ExternalAxes(object):
         return cls.from_configuration_primitive(configuration, joint_names)
 
 
-class RobotJoints(object):
-    """Represents a configuration for robot joints"""
+class ExternalAxes(_ExternalAxesMixin):
+    """Represents a configuration for external axes."""
 
     def __init__(self, *values):
+        """Initialize a new object with the specified values for external axes.
+
+        Parameters
+        ----------
+        values : :obj:`list`
+            List of floats indicating the external axis positions.
+        """
         try:
             self.values = list(itertools.chain.from_iterable(values))
         except TypeError:
             self.values = list(values)
 
+    # List accessors
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, item):
+        if item >= len(self.values):
+            return None
+
+        return self.values[item]
+
+    def __setitem__(self, item, value):
+        self.values[item] = value
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+class _RobotJointsMixin(object):
+    """Properties and conversion methods shared by :class:`RobotJoints` and :class:`CompactRobotJoints`."""
+
+    __slots__ = ()
+
     # Properties
     @property
     def rax_1(self):
@@ -357,24 +622,8 @@ class RobotJoints(object):
     def rax_6(self, value):
         self[5] = value
 
-    # List accessors
     def __repr__(self):
-        return "RobotJoints({})".format([round(i, 2) for i in self.values])
-
-    def __len__(self):
-        return len(self.values)
-
-    def __getitem__(self, item):
-        if item >= len(self.values):
-            return None
-
-        return self.values[item]
-
-    def __setitem__(self, item, value):
-        self.values[item] = value
-
-    def __iter__(self):
-        return iter(self.values)
+        return "{}({})".format(type(self).__name__, [round(i, 2) for i in self.values])
 
     # Conversion methods
     def to_configuration_primitive(self, joint_types, joint_names=None):
@@ -472,3 +721,177 @@ class RobotJoints(object):
         """
         joint_names = robot.get_configurable_joint_names(group) if robot else []
         return cls.from_configuration_primitive(configuration, joint_names)
+
+
+class RobotJoints(_RobotJointsMixin):
+    """Represents a configuration for robot joints"""
+
+    def __init__(self, *values):
+        try:
+            self.values = list(itertools.chain.from_iterable(values))
+        except TypeError:
+            self.values = list(values)
+
+    # List accessors
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, item):
+        if item >= len(self.values):
+            return None
+
+        return self.values[item]
+
+    def __setitem__(self, item, value):
+        self.values[item] = value
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+def _flatten_values(values):
+    try:
+        return list(itertools.chain.from_iterable(values))
+    except TypeError:
+        return list(values)
+
+
+class _CompactAxes(array.array):
+    """Axes values stored as doubles in a contiguous buffer instead of a list of float objects.
+
+    The number of values is checked on creation, so methods of ``array`` that
+    change it are not supported, and the values can only be replaced as a whole.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *values):
+        return array.array.__new__(cls, "d", cls._check_values(_flatten_values(values)))
+
+    @classmethod
+    def _check_values(cls, values):
+        raise NotImplementedError
+
+    @property
+    def values(self):
+        """The values themselves, as a buffer of doubles."""
+        return self
+
+    @values.setter
+    def values(self, values):
+        values = array.array("d", self._check_values(_flatten_values(values)))
+        array.array.__setitem__(self, slice(None), values)
+
+    def __getitem__(self, item):
+        if isinstance(item, int) and item >= len(self):
+            return None
+
+        return array.array.__getitem__(self, item)
+
+    def __setitem__(self, item, value):
+        if isinstance(item, slice):
+            value = array.array("d", value)
+            if len(range(*item.indices(len(self)))) != len(value):
+                self._resize()
+        array.array.__setitem__(self, item, value)
+
+    def __setslice__(self, start, stop, value):
+        # Used instead of __setitem__ for simple slices on Python 2
+        self.__setitem__(slice(start, stop), value)
+
+    def _resize(self, *args, **kwargs):
+        raise TypeError(
+            "The number of values of {} cannot be changed".format(type(self).__name__)
+        )
+
+    append = extend = insert = pop = remove = _resize
+    fromlist = frombytes = fromstring = fromfile = fromunicode = _resize
+    __delitem__ = __delslice__ = __iadd__ = __imul__ = _resize
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+    def __copy__(self):
+        return type(self)(self)
+
+    def __deepcopy__(self, memo):
+        return type(self)(self)
+
+
+class CompactExternalAxes(_ExternalAxesMixin, _CompactAxes):
+    """Represents a configuration for external axes with a compact memory layout.
+
+    Offers the same API as :class:`ExternalAxes`, but stores up to 6 values
+    in an ``array('d')`` without a per-instance ``__dict__``, which reduces the
+    memory used by each instance to less than half. It also supports the buffer
+    protocol, so that NumPy can use the values without copying them.
+
+    Examples
+    --------
+
+    Keep a long recording of external axes in memory::
+
+        axes = rrc.CompactExternalAxes(ext_axes)
+        view = numpy.frombuffer(axes)
+
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *values):
+        """Create a new object with the specified values for external axes.
+
+        Parameters
+        ----------
+        values : :obj:`list`
+            List of up to 6 floats indicating the external axis positions.
+        """
+        return _CompactAxes.__new__(cls, *values)
+
+    @classmethod
+    def _check_values(cls, values):
+        if len(values) > 6:
+            raise ValueError("Only up to 6 external axes are supported")
+        return values
+
+
+class CompactRobotJoints(_RobotJointsMixin, _CompactAxes):
+    """Represents a configuration for robot joints with a compact memory layout.
+
+    Offers the same API as :class:`RobotJoints`, but stores exactly 6 values
+    in an ``array('d')`` without a per-instance ``__dict__``, which reduces the
+    memory used by each instance to less than half. It also supports the buffer
+    protocol, so that NumPy can use the values without copying them.
+
+    Examples
+    --------
+
+    Keep a long recording of joint positions in memory::
+
+        samples = []
+        for _ in range(10000):
+            robot_joints, _ = abb.send_and_wait(rrc.GetJoints())
+            samples.append(rrc.CompactRobotJoints(robot_joints))
+
+        trajectory = numpy.frombuffer(b''.join(samples)).reshape(-1, 6)
+
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *values):
+        """Create a new object with the specified values for robot joints.
+
+        Parameters
+        ----------
+        values : :obj:`list`
+            List of up to 6 floats indicating the joint positions.
+            Missing joints are set to ``0.0``.
+        """
+        return _CompactAxes.__new__(cls, *values)
+
+    @classmethod
+    def _check_values(cls, values):
+        if len(values) > 6:
+            raise ValueError("Only up to 6 joints are supported")
+        return values + [0.0] * (6 - len(values))
@@ -0,0 +1,488 @@
+"""
+Stand-in for the RRC driver and the robot controller, running in-process.
+
+The :class:`FakeRos` connection can be passed to :class:`~compas_rrc.AbbClient`
+instead of a :class:`~compas_rrc.RosClient`. It routes the ``robot_command``,
+``robot_response`` and ``joint_states`` topics, and the ``protocol_version`` parameter of every
+namespace to a :class:`FakeDriver`, which executes the built-in instructions
+against a simulated robot state. This allows to exercise and benchmark client
+code without docker, RobotStudio or a real controller::
+
+    driver = FakeDriver(namespaces=['/rob1'], processing_time=0.004)
+    ros = FakeRos(driver)
+    ros.run()
+
+    abb = rrc.AbbClient(ros, '/rob1')
+    robot_joints, external_axes = abb.send_and_wait(rrc.GetJoints())
+
+    ros.terminate()
+
+"""
+
+import json
+import math
+import threading
+import time
+
+from roslibpy.event_emitter import EventEmitterMixin
+
+from compas_rrc.client import FEEDBACK_ERROR_PREFIX
+from compas_rrc.common import CLIENT_PROTOCOL_VERSION
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+__all__ = [
+    "FakeRos",
+    "FakeDriver",
+    "FakeRobot",
+]
+
+INSTRUCTION_PREFIX = "r_RRC_"
+
+RAPID_NONE = 8999999488
+"""Value of ``9E+9``, used by RAPID for undefined values, as received in Python."""
+
+
+class FakeRobot(object):
+    """Simulated state and RAPID task of the robot of one namespace.
+
+    Instructions are executed in order, one at a time, on a dedicated thread.
+    """
+
+    def __init__(self, driver, namespace):
+        self.driver = driver
+        self.namespace = namespace
+        self.joints = [0.0] * 6
+        self.external_axes = [RAPID_NONE] * 6
+        self.position = [0.0, 0.0, 0.0]
+        self.orientation = [1.0, 0.0, 0.0, 0.0]
+        self.signals = {}
+        self.printed = []
+        self.executed = 0
+        self._watch_started = None
+        self._watch_elapsed = 0.0
+        self._commands = queue.Queue(maxsize=driver.buffer_size or 0)
+        self._thread = None
+        self._sequence_id = 0
+
+    def start(self):
+        """Start executing instructions."""
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop executing instructions after the ones already received."""
+        if self._thread:
+            self._commands.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def enqueue(self, message):
+        """Queue an instruction message for execution.
+
+        Blocks while the buffer of the robot is full.
+        """
+        self._commands.put(message)
+
+    def _run(self):
+        while True:
+            message = self._commands.get()
+            if message is None:
+                return
+
+            if self.driver.processing_time:
+                time.sleep(self.driver.processing_time)
+
+            replies = self.execute(message)
+            self.executed += 1
+
+            if message.get("feedback_level", 0) > 0:
+                for reply in replies:
+                    self.driver.respond(self.namespace, message, **reply)
+
+    def execute(self, message):
+        """Execute an instruction message and return the list of feedback replies."""
+        name = message["instruction"]
+        handler = self.driver.handlers.get(name)
+
+        if handler is not None:
+            reply = handler(self, message)
+        else:
+            builtin = None
+            if name.startswith(INSTRUCTION_PREFIX):
+                builtin = getattr(
+                    self, name.replace(INSTRUCTION_PREFIX, "_do_", 1), None
+                )
+            if builtin is None:
+                return [dict(feedback=FEEDBACK_ERROR_PREFIX + "Unknown instruction")]
+            reply = builtin(message)
+
+        if reply is None:
+            return [dict()]
+        if isinstance(reply, dict):
+            return [reply]
+        return list(reply)
+
+    # Built-in instructions
+    def _do_Noop(self, message):
+        pass
+
+    def _do_PrintText(self, message):
+        self.printed.append(message["string_values"][0])
+
+    def _do_GetJoints(self, message):
+        return dict(float_values=self.joints + self.external_axes)
+
+    def _do_GetRobtarget(self, message):
+        return dict(float_values=self.position + self.orientation + self.external_axes)
+
+    def _do_MoveToJoints(self, message):
+        values = message["float_values"]
+        self.joints = list(values[0:6])
+        self.external_axes = list(values[6:12])
+        self.driver.publish_joint_state(self.namespace)
+
+    def _do_MoveTo(self, message):
+        values = message["float_values"]
+        self.position = list(values[0:3])
+        self.orientation = list(values[3:7])
+        if message["string_values"][0] in ("J", "L"):
+            self.external_axes = list(values[7:13])
+
+    def _do_WaitTime(self, message):
+        if self.driver.time_scale:
+            time.sleep(message["float_values"][0] * self.driver.time_scale)
+
+    def _do_StartWatch(self, message):
+        self._watch_started = time.time()
+
+    def _do_StopWatch(self, message):
+        if self._watch_started is not None:
+            self._watch_elapsed += time.time() - self._watch_started
+            self._watch_started = None
+
+    def _do_ReadWatch(self, message):
+        elapsed = self._watch_elapsed
+        if self._watch_started is not None:
+            elapsed += time.time() - self._watch_started
+        return dict(float_values=[elapsed])
+
+    def _set_signal(self, message):
+        self.signals[message["string_values"][0]] = message["float_values"][0]
+
+    def _read_signal(self, message):
+        return dict(float_values=[self.signals.get(message["string_values"][0], 0)])
+
+    _do_SetDigital = _do_SetAnalog = _do_SetGroup = _set_signal
+    _do_ReadDigital = _do_ReadAnalog = _do_ReadGroup = _read_signal
+
+    def _do_PulseDigital(self, message):
+        pass
+
+    def _do_SetAcceleration(self, message):
+        pass
+
+    def _do_SetMaxSpeed(self, message):
+        pass
+
+    def _do_SetTool(self, message):
+        pass
+
+    def _do_SetWorkObject(self, message):
+        pass
+
+    def _do_Stop(self, message):
+        pass
+
+
+class FakeDriver(object):
+    """Simulated RRC driver serving one or more robot namespaces.
+
+    Custom instructions can be simulated by registering handlers with :meth:`add_handler`.
+    """
+
+    def __init__(
+        self,
+        namespaces=("/rob1",),
+        protocol_version=CLIENT_PROTOCOL_VERSION,
+        processing_time=0.0,
+        buffer_size=None,
+        time_scale=0.0,
+    ):
+        """Initialize a new driver.
+
+        Parameters
+        ----------
+        namespaces : :obj:`list` of :obj:`str`
+            Namespaces of the simulated robots.
+        protocol_version : :obj:`int`
+            Protocol version advertised in the ``protocol_version`` parameter of every namespace.
+        processing_time : :obj:`float`
+            Time in seconds the robot takes to process each instruction.
+        buffer_size : :obj:`int`
+            Maximum number of instructions queued per robot. Publishing blocks while
+            the buffer is full. Optional. If not specified, the buffer is not bounded.
+        time_scale : :obj:`float`
+            Factor applied to the duration of ``WaitTime`` instructions. Defaults to ``0``, i.e. no waiting.
+        """
+        self.processing_time = processing_time
+        self.buffer_size = buffer_size
+        self.time_scale = time_scale
+        self.handlers = {}
+        self.ros = None
+        self.robots = {}
+        self.params = {}
+
+        for namespace in namespaces:
+            namespace = namespace.rstrip("/")
+            self.robots[namespace] = FakeRobot(self, namespace)
+            self.params[namespace + "/protocol_version"] = protocol_version
+            self.params[namespace + "/robot_state_port"] = 30101
+            self.params[namespace + "/robot_streaming_port"] = 30102
+
+    def add_handler(self, name, handler):
+        """Register the simulation of a custom instruction.
+
+        Parameters
+        ----------
+        name : :obj:`str`
+            Name of the instruction.
+        handler
+            Function invoked as ``handler(robot, message)`` with the :class:`FakeRobot` and the
+            instruction message. It returns ``None`` to reply ``Done``, a dictionary of reply
+            fields such as ``float_values``, or a list of them to stream several replies.
+        """
+        self.handlers[name] = handler
+
+    def start(self, ros):
+        """Start serving the given connection."""
+        self.ros = ros
+        for robot in self.robots.values():
+            robot.start()
+
+    def stop(self):
+        """Stop all robots."""
+        for robot in self.robots.values():
+            robot.stop()
+
+    def publish(self, topic, message):
+        """Handle a message published by a client."""
+        namespace, _, name = topic.rpartition("/")
+        robot = self.robots.get(namespace)
+        if robot and name == "robot_command":
+            robot.enqueue(message)
+
+    def respond(self, namespace, message, **reply):
+        """Send a feedback reply for an instruction message."""
+        robot = self.robots[namespace]
+        robot._sequence_id += 1
+        response = dict(
+            instruction=message["instruction"],
+            sequence_id=robot._sequence_id,
+            feedback_id=message["sequence_id"],
+            exec_level=message.get("exec_level", 0),
+            feedback_level=message.get("feedback_level", 0),
+            feedback="Done",
+            string_values=[],
+            float_values=[],
+        )
+        response.update(reply)
+        self.ros._receive(namespace + "/robot_response", response)
+
+    def publish_joint_state(self, namespace):
+        """Publish the joint state of a robot, in radians, on its ``joint_states`` topic."""
+        robot = self.robots[namespace]
+        now = time.time()
+        message = dict(
+            header=dict(stamp=dict(secs=int(now), nsecs=int((now % 1) * 1e9))),
+            name=["joint_{}".format(i + 1) for i in range(6)],
+            position=[math.radians(value) for value in robot.joints],
+            velocity=[],
+            effort=[],
+        )
+        self.ros._receive(namespace + "/joint_states", message)
+
+    def call_service(self, service, args):
+        """Handle the ROS API services used by the client."""
+        if service == "/rosapi/get_param":
+            return dict(value=json.dumps(self.params.get(args["name"])))
+        if service == "/rosapi/get_param_names":
+            return dict(names=sorted(self.params.keys()))
+        if service == "/rosapi/set_param":
+            self.params[args["name"]] = json.loads(args["value"])
+            return dict()
+        if service == "/rosapi/delete_param":
+            self.params.pop(args["name"], None)
+            return dict()
+        raise ValueError("Unsupported service: {}".format(service))
+
+
+class FakeRos(EventEmitterMixin):
+    """In-process replacement of :class:`~compas_rrc.RosClient` connected to a :class:`FakeDriver`.
+
+    Like a websocket connection, all feedback is delivered on a single receive thread.
+    """
+
+    def __init__(self, driver=None):
+        """Initialize a new connection.
+
+        Parameters
+        ----------
+        driver : :class:`FakeDriver`
+            Driver serving this connection. Optional. Defaults to a driver with one robot on ``/rob1``.
+        """
+        super(FakeRos, self).__init__()
+        self.driver = driver or FakeDriver()
+        self.is_connected = False
+        self.published = 0
+        self._id_counter = 0
+        self._ready_callbacks = []
+        self._pending_messages = []
+        self._inbox = queue.Queue()
+        self._receiver = None
+
+    @property
+    def id_counter(self):
+        """Generate an auto-incremental ID starting from 1."""
+        self._id_counter += 1
+        return self._id_counter
+
+    def run(self, timeout=None):
+        """Start the driver and the receive thread."""
+        if self.is_connected:
+            return
+        self.driver.start(self)
+        self._receiver = threading.Thread(target=self._receive_loop)
+        self._receiver.daemon = True
+        self._receiver.start()
+        self._connected()
+
+    def disconnect(self):
+        """Simulate the loss of the connection, the driver keeps running.
+
+        Messages sent while disconnected are queued, and feedback is lost, until :meth:`reconnect`.
+        """
+        if self.is_connected:
+            self.is_connected = False
+            self.emit("close", self)
+
+    def reconnect(self):
+        """Simulate the connection being restored after :meth:`disconnect`."""
+        if not self.is_connected:
+            self._connected()
+
+    def _connected(self):
+        self.is_connected = True
+
+        for message in self._pending_messages:
+            self._route(message)
+        self._pending_messages = []
+
+        callbacks, self._ready_callbacks = self._ready_callbacks, []
+        for callback, run_in_thread in callbacks:
+            self._call(callback, run_in_thread)
+        self.emit("ready", self)
+
+    def close(self, timeout=None):
+        """Disconnect from the driver."""
+        if self.is_connected:
+            self.emit("closing")
+            self.is_connected = False
+            self.emit("close", self)
+
+    def terminate(self):
+        """Stop the driver and the receive thread."""
+        self.is_connected = False
+        self.driver.stop()
+        if self._receiver:
+            self._inbox.put(None)
+            self._receiver.join()
+            self._receiver = None
+
+    def on_ready(self, callback, run_in_thread=True):
+        """Add a callback to be executed when the connection is established."""
+        if self.is_connected:
+            self._call(callback, run_in_thread)
+        else:
+            self._ready_callbacks.append((callback, run_in_thread))
+
+    def off(self, event_name, callback=None):
+        """Remove a callback, or all callbacks if not specified, from an event."""
+        if callback:
+            super(FakeRos, self).off(event_name, callback)
+        else:
+            self.remove_all_listeners(event_name)
+
+    def send_on_ready(self, message):
+        """Send message to the driver once the connection is established."""
+        if self.is_connected:
+            self._route(message)
+        else:
+            self._pending_messages.append(message)
+
+    def call_sync_service(self, message, timeout):
+        """Call a service of the driver and wait for its result."""
+        return dict(
+            result=self.driver.call_service(message["service"], message["args"])
+        )
+
+    def call_async_service(self, message, callback, errback):
+        """Call a service of the driver in a thread."""
+
+        def _call():
+            try:
+                result = self.driver.call_service(message["service"], message["args"])
+            except Exception as error:
+                if errback:
+                    errback(error)
+                return
+            callback(result)
+
+        self.call_in_thread(_call)
+
+    def get_params(self, callback=None, errback=None):
+        """Retrieve list of param names."""
+        names = self.driver.call_service("/rosapi/get_param_names", {})["names"]
+        if callback:
+            callback(names)
+            return
+        return names
+
+    def call_in_thread(self, callback):
+        """Call the given function in a thread."""
+        thread = threading.Thread(target=callback)
+        thread.daemon = True
+        thread.start()
+
+    def call_later(self, delay, callback):
+        """Call the given function after a certain period of time has passed."""
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+
+    def _call(self, callback, run_in_thread):
+        if run_in_thread:
+            self.call_in_thread(callback)
+        else:
+            callback()
+
+    def _route(self, message):
+        if message["op"] == "publish":
+            self.published += 1
+            self.driver.publish(message["topic"], message["msg"])
+
+    def _receive(self, topic, message):
+        if self.is_connected:
+            self._inbox.put((topic, message))
+
+    def _receive_loop(self):
+        while True:
+            item = self._inbox.get()
+            if item is None:
+                return
+            topic, message = item
+            self.emit(topic, message)
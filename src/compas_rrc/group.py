@@ -0,0 +1,215 @@
+import copy
+import threading
+import time
+
+from compas_rrc.common import FeedbackLevel
+from compas_rrc.common import ReturnWhen
+from compas_rrc.common import TimeoutException
+from compas_rrc.common import gather
+from compas_rrc.common import wait
+from compas_rrc.utility import Noop
+
+__all__ = ["RobotGroup"]
+
+
+class RobotGroup(object):
+    """Group of robot clients that receive instructions together.
+
+    Instructions are sent to all members before waiting for any of them, so that
+    the round trips of the robots overlap instead of adding up. The clients can
+    share a :class:`RosClient` or use different ones, e.g. one per controller.
+
+    Examples
+    --------
+
+    Move two robots to their start positions and wait for both::
+
+        group = rrc.RobotGroup([abb_rob1, abb_rob2])
+
+        group.send_and_wait([
+            rrc.MoveToJoints(start_rob1, [], 1000, rrc.Zone.FINE),
+            rrc.MoveToJoints(start_rob2, [], 1000, rrc.Zone.FINE),
+        ])
+
+        # Make sure both robots are idle, then start a coordinated move
+        group.barrier(timeout=10)
+        group.send(rrc.MoveToFrame(frame, 100, rrc.Zone.FINE))
+
+    """
+
+    def __init__(self, clients):
+        """Initialize a new group.
+
+        Parameters
+        ----------
+        clients : :obj:`list` of :class:`AbbClient`
+            Clients of the robots of the group.
+        """
+        self.clients = list(clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __getitem__(self, item):
+        return self.clients[item]
+
+    def connect(self, timeout=None):
+        """Wait until all clients of the group are ready to send instructions.
+
+        The protocol versions of all robots are requested in parallel, so the
+        group is ready as soon as the slowest robot is.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Timeout in seconds to wait for all robots before raising an exception. Optional.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        for client in self.clients:
+            remaining = max(0, deadline - time.time()) if deadline is not None else None
+            client.connect(remaining)
+
+    def _per_client(self, instructions):
+        if isinstance(instructions, (list, tuple)):
+            if len(instructions) != len(self.clients):
+                raise ValueError(
+                    "Expected {} instructions, got {}".format(
+                        len(self.clients), len(instructions)
+                    )
+                )
+            return list(instructions)
+
+        # Instructions carry their sequence id, so every robot gets its own copy
+        return [copy.deepcopy(instructions) for _ in self.clients]
+
+    def _fan_out(self, method, instructions):
+        calls = list(zip(self.clients, self._per_client(instructions)))
+
+        if not any(client.flow_control for client, _ in calls):
+            return [
+                getattr(client, method)(instruction) for client, instruction in calls
+            ]
+
+        # Flow control can block a member, so do not let it delay the others
+        results = [None] * len(calls)
+        errors = []
+
+        def _call(index, client, instruction):
+            try:
+                results[index] = getattr(client, method)(instruction)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [
+            threading.Thread(target=_call, args=(index, client, instruction))
+            for index, (client, instruction) in enumerate(calls)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def send(self, instructions):
+        """Send instructions to all robots of the group without waiting.
+
+        Parameters
+        ----------
+        instructions : :class:`compas_fab.backends.ros.messages.ROSmsg` or :obj:`list`
+            Either one instruction, of which each robot receives a copy,
+            or a list with one instruction per robot, in the order of the clients.
+
+        Returns
+        -------
+        :obj:`list`
+            One item per robot, either a :class:`FutureResult` or ``None``
+            if the instruction does not request feedback.
+        """
+        return self._fan_out("send", instructions)
+
+    def send_many(self, instructions):
+        """Send a sequence of instructions to each robot of the group without waiting.
+
+        Parameters
+        ----------
+        instructions : :obj:`list`
+            One list of instructions per robot, in the order of the clients.
+
+        Returns
+        -------
+        :obj:`list`
+            One list of results per robot, see :meth:`AbbClient.send_many`.
+        """
+        return self._fan_out("send_many", instructions)
+
+    def send_and_wait(self, instructions, timeout=None):
+        """Send instructions to all robots of the group and wait for all feedback.
+
+        Parameters
+        ----------
+        instructions : :class:`compas_fab.backends.ros.messages.ROSmsg` or :obj:`list`
+            Either one instruction, of which each robot receives a copy,
+            or a list with one instruction per robot, in the order of the clients.
+        timeout : :obj:`float`
+            Timeout in seconds to wait for all robots before raising an exception. Optional.
+
+        Returns
+        -------
+        :obj:`list`
+            Feedback value of each robot.
+        """
+        instructions = self._per_client(instructions)
+        for instruction in instructions:
+            if instruction.feedback_level == FeedbackLevel.NONE:
+                instruction.feedback_level = FeedbackLevel.DONE
+
+        return gather(self.send(instructions), timeout)
+
+    def send_and_wait_any(self, instructions, timeout=None):
+        """Send instructions to all robots of the group and wait for the first feedback.
+
+        Parameters
+        ----------
+        instructions : :class:`compas_fab.backends.ros.messages.ROSmsg` or :obj:`list`
+            Either one instruction, of which each robot receives a copy,
+            or a list with one instruction per robot, in the order of the clients.
+        timeout : :obj:`float`
+            Timeout in seconds to wait before raising an exception. Optional.
+
+        Returns
+        -------
+        :obj:`tuple`
+            The client of the first robot that replied, and its feedback value.
+        """
+        instructions = self._per_client(instructions)
+        for instruction in instructions:
+            if instruction.feedback_level == FeedbackLevel.NONE:
+                instruction.feedback_level = FeedbackLevel.DONE
+
+        futures = self.send(instructions)
+        done, _ = wait(futures, timeout, ReturnWhen.FIRST_COMPLETED)
+        for client, future in zip(self.clients, futures):
+            if future in done:
+                return client, future.result()
+
+        raise TimeoutException("Timeout: no robot of the group replied")
+
+    def barrier(self, timeout=None):
+        """Wait until every robot of the group has processed all instructions sent before.
+
+        A :class:`Noop` is sent to every robot and the call returns once all of
+        them have replied, so that instructions sent afterwards start from a
+        common point in time, within one round trip of each other.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Timeout in seconds to wait for all robots before raising an exception. Optional.
+        """
+        gather(self.send(Noop(feedback_level=FeedbackLevel.DONE)), timeout)
@@ -0,0 +1,240 @@
+import os
+import struct
+import threading
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+__all__ = ["SendJournal"]
+
+_MAGIC = b"RRCJ"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+_RECORD = struct.Struct("<B3xiq")
+
+_SENT = 1
+_ACKNOWLEDGED = 2
+
+
+class SendJournal(object):
+    """Crash-safe record of the instructions of a job sent to the robot, and of their acknowledgements.
+
+    Every instruction of the job sent with :meth:`resume` is recorded with its
+    index in the job, and every feedback received marks its instruction as
+    acknowledged. Instructions are executed in order, so after a crash of the
+    process, the job can be resumed right after the last acknowledged instruction.
+    Other instructions sent through the client, e.g. setup instructions or
+    reads, are not part of the job and are not recorded.
+
+    The journal is an append-only file of fixed-size records, mapped in memory.
+    Records are written to the mapping while sending, which is as cheap as a
+    memory copy and survives a crash of the process, and a background thread
+    flushes the mapping to disk every ``flush_interval`` seconds, so that it
+    also survives a crash of the computer, without slowing down sending.
+
+    Examples
+    --------
+
+    Run a long job that can be resumed if the process is restarted::
+
+        journal = rrc.SendJournal('print.journal')
+        abb = rrc.AbbClient(ros, '/rob1', journal=journal,
+                            flow_control=rrc.FlowControl(max_in_flight=200, ack_interval=10))
+
+        # Starts from the beginning, or after the last acknowledged instruction
+        futures = journal.resume(abb, instructions)
+
+    """
+
+    def __init__(self, path, capacity=65536, flush_interval=1.0, truncate=False):
+        """Open a journal, creating it if it does not exist.
+
+        Parameters
+        ----------
+        path : :obj:`str`
+            Path of the journal file.
+        capacity : :obj:`int`
+            Number of records the file is initially sized for. It grows as needed. Defaults to ``65536``.
+        flush_interval : :obj:`float`
+            Time in seconds between flushes to disk. Defaults to ``1.0``.
+        truncate : :obj:`bool`
+            ``True`` to discard the records of a previous job. Defaults to ``False``.
+        """
+        if mmap is None:
+            raise ImportError("SendJournal requires mmap")
+
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.last_acknowledged = None
+        self._job = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if truncate or not exists:
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, 0))
+                f.truncate(_HEADER.size + capacity * _RECORD.size)
+
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, record_size, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            self.close()
+            raise ValueError("Not a send journal: {}".format(path))
+
+        self.count = count
+        self.last_acknowledged = self._find_last_acknowledged()
+        self.next_index = self.resume_index
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    @property
+    def resume_index(self):
+        """Index of the first instruction of the job not yet acknowledged."""
+        if self.last_acknowledged is None:
+            return 0
+        return self.last_acknowledged + 1
+
+    def resume(self, client, instructions):
+        """Send the instructions of a job that have not been acknowledged yet.
+
+        Parameters
+        ----------
+        client : :class:`AbbClient`
+            Client whose journal this is.
+        instructions : :obj:`list`
+            All instructions of the job, including the ones already executed.
+
+        Returns
+        -------
+        :obj:`list`
+            The results of sending the remaining instructions, see :meth:`AbbClient.send_many`.
+        """
+        if client.journal is not self:
+            raise ValueError("The client does not use this journal")
+
+        start = self.resume_index
+        with self._lock:
+            if self._map is None:
+                raise ValueError("The journal is closed")
+            self._job = instructions
+            self.next_index = start
+        return client.send_many(instructions[start:])
+
+    def record_sent(self, instructions):
+        """Record the sending of the instructions of the job among instructions with sequence ids assigned.
+
+        Once the journal is closed, nothing is recorded anymore, but the client can still send.
+        """
+        with self._lock:
+            job = self._job
+            if job is None or self._map is None:
+                return
+
+            # The instructions of the job are published in order, so the next
+            # one is the only one that can appear, among any others
+            index = self.next_index
+            pack = _RECORD.pack
+            records = []
+            for instruction in instructions:
+                if index >= len(job) or instruction is not job[index]:
+                    continue
+                records.append(pack(_SENT, instruction.sequence_id, index))
+                if instruction.feedback_level > 0:
+                    self._pending[instruction.sequence_id] = index
+                index += 1
+            self.next_index = index
+            if records:
+                self._append(b"".join(records), len(records))
+
+    def acknowledge(self, sequence_id):
+        """Record the feedback of the instruction with the given sequence id."""
+        with self._lock:
+            index = self._pending.pop(sequence_id, None)
+            if index is None or self._map is None:
+                return
+            if self.last_acknowledged is None or index > self.last_acknowledged:
+                self.last_acknowledged = index
+            self._append(_RECORD.pack(_ACKNOWLEDGED, sequence_id, index), 1)
+
+    def records(self):
+        """List of ``(kind, sequence_id, index)`` of all the records, where kind is ``sent`` or ``acknowledged``."""
+        kinds = {_SENT: "sent", _ACKNOWLEDGED: "acknowledged"}
+        with self._lock:
+            return [
+                (kinds[kind], sequence_id, index)
+                for kind, sequence_id, index in self._read(0, self.count)
+            ]
+
+    def flush(self):
+        """Write the journal to disk."""
+        with self._lock:
+            if self._map is None or not self._dirty:
+                return
+            self._dirty = False
+            mapping = self._map
+
+        # Not holding the lock, so that sending is not blocked while writing to disk
+        with self._flush_lock:
+            # Unless it was replaced by a larger mapping, flushed while growing
+            if mapping is self._map:
+                mapping.flush()
+
+    def close(self):
+        """Flush and close the journal."""
+        if getattr(self, "_stop", None) is not None:
+            self._stop.set()
+            self._flusher.join()
+            self.flush()
+        with self._lock, self._flush_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+                self._file.close()
+
+    def _append(self, data, count):
+        offset = _HEADER.size + self.count * _RECORD.size
+        end = offset + len(data)
+        if end > len(self._map):
+            self._grow(end)
+
+        self._map[offset:end] = data
+
+        # The count is updated last, so that a partially written batch is ignored
+        self.count += count
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, _RECORD.size, self.count)
+        self._dirty = True
+
+    def _grow(self, size):
+        size = max(size, 2 * len(self._map))
+        # Swapped while holding the flush lock, so that a flush never sees the closed mapping as current
+        with self._flush_lock:
+            self._map.flush()
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _read(self, start, stop, step=1):
+        for position in range(start, stop, step):
+            yield _RECORD.unpack_from(self._map, _HEADER.size + position * _RECORD.size)
+
+    def _find_last_acknowledged(self):
+        # Indices only increase, also after resuming, so the latest acknowledgement is the last one
+        for kind, _, index in self._read(self.count - 1, -1, -1):
+            if kind == _ACKNOWLEDGED:
+                return index
+        return None
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
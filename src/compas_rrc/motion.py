@@ -1,7 +1,15 @@
+from compas.geometry import Frame
 from compas_fab.backends.ros.messages import ROSmsg
 
 from compas_rrc.common import ExecutionLevel
 from compas_rrc.common import FeedbackLevel
+from compas_rrc.template import InstructionTemplate
+from compas_rrc.template import TemplateInstruction
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 INSTRUCTION_PREFIX = "r_RRC_"
 
@@ -11,6 +19,9 @@ __all__ = [
     "MoveToJoints",
     "MoveToFrame",
     "MoveToRobtarget",
+    "build_move_to_joints",
+    "build_move_to_frame",
+    "build_move_to_robtarget",
 ]
 
 
@@ -340,3 +351,223 @@ class MoveToRobtarget(MoveGeneric):
         instruction = "MoveTo"
         self.instruction = INSTRUCTION_PREFIX + instruction
         self.string_values = ["J"] if motion_type == Motion.JOINT else ["L"]
+
+
+def _check_finite(name, values):
+    if not numpy.all(numpy.isfinite(values)):
+        raise ValueError("All values of {} must be finite".format(name))
+    return values
+
+
+def _as_columns(name, values, count, max_columns):
+    if values is None:
+        values = numpy.zeros((count, 0))
+    values = numpy.asarray(values, dtype=float)
+    if values.ndim != 2:
+        raise ValueError(
+            "Expected {} with a shape of ({}, k), got {}".format(
+                name, count, values.shape
+            )
+        )
+    if values.shape[0] != count:
+        raise ValueError(
+            "Expected {} rows of {}, got {}".format(count, name, values.shape[0])
+        )
+    if values.shape[1] > max_columns:
+        raise ValueError("Only up to {} {} are supported".format(max_columns, name))
+    _check_finite(name, values)
+    padding = numpy.zeros((count, max_columns - values.shape[1]))
+    return numpy.hstack((values, padding))
+
+
+def _as_column(name, values, count):
+    values = numpy.broadcast_to(numpy.asarray(values, dtype=float), (count,))
+    _check_finite(name, values)
+    return values.reshape(-1, 1)
+
+
+def _speed_and_zone(speed, zone, count):
+    speed = _as_column("speed", speed, count)
+    if numpy.any(speed <= 0):
+        raise ValueError(
+            "Speed must be higher than zero. Current value={}".format(speed.min())
+        )
+    return numpy.hstack((speed, _as_column("zone", zone, count)))
+
+
+def _build(prototype, columns):
+    template = InstructionTemplate(prototype, variable=len(prototype.float_values))
+    feedback_level = template.feedback_level
+    return [
+        TemplateInstruction(template, values, feedback_level)
+        for values in numpy.hstack(columns).tolist()
+    ]
+
+
+def _normalized_quaternions(quaternions, count):
+    quaternions = numpy.asarray(quaternions, dtype=float)
+    if quaternions.shape != (count, 4):
+        raise ValueError("Quaternions must have a shape of ({}, 4)".format(count))
+    _check_finite("quaternions", quaternions)
+    norms = numpy.linalg.norm(quaternions, axis=1)
+    if numpy.any(norms < 1e-12):
+        raise ValueError("Quaternions must not be zero")
+    return quaternions / norms.reshape(-1, 1)
+
+
+def _build_cartesian(prototype, positions, quaternions, ext_axes, speed, zone):
+    if numpy is None:
+        raise ImportError("Building instructions from arrays requires NumPy")
+
+    positions = numpy.asarray(positions, dtype=float)
+    count = len(positions)
+    if positions.shape != (count, 3):
+        raise ValueError("Positions must have a shape of ({}, 3)".format(count))
+    _check_finite("positions", positions)
+
+    columns = [
+        positions,
+        _normalized_quaternions(quaternions, count),
+        _as_columns("external axes", ext_axes, count, 6),
+        _speed_and_zone(speed, zone, count),
+    ]
+    return _build(prototype, columns)
+
+
+def build_move_to_joints(
+    joints, ext_axes, speed, zone, feedback_level=FeedbackLevel.NONE
+):
+    """Build many :class:`MoveToJoints` instructions at once from arrays.
+
+    Validation and padding are done on whole arrays instead of per instruction.
+    The returned instructions can be sent like any other instruction, e.g. with
+    :meth:`AbbClient.send_many`. Requires NumPy.
+
+    Parameters
+    ----------
+    joints : array-like
+        Robot joint positions in degrees, with a shape of ``(N, j)`` where ``j`` is up to 6.
+    ext_axes : array-like
+        External axes positions, with a shape of ``(N, k)`` where ``k`` is up to 6, or ``None``.
+    speed : :obj:`float` or array-like
+        Speed in mm/s, either one for all or one per instruction.
+    zone : :class:`Zone` or array-like
+        Zone data, either one for all or one per instruction.
+    feedback_level : :obj:`int`
+        Defines the feedback level requested from the robot. Defaults to :attr:`FeedbackLevel.NONE`.
+
+    Returns
+    -------
+    :obj:`list`
+        List of ``N`` instructions.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        instructions = rrc.build_move_to_joints(joints, None, 100, rrc.Zone.Z5)
+        abb.send_many(instructions)
+
+    """
+    if numpy is None:
+        raise ImportError("Building instructions from arrays requires NumPy")
+
+    joints = numpy.asarray(joints, dtype=float)
+    count = len(joints) if joints.ndim else 0
+    columns = [
+        _as_columns("joints", joints, count, 6),
+        _as_columns("external axes", ext_axes, count, 6),
+        _speed_and_zone(speed, zone, count),
+    ]
+    prototype = MoveToJoints([], [], 1, Zone.FINE, feedback_level)
+    return _build(prototype, columns)
+
+
+def build_move_to_frame(
+    positions,
+    quaternions,
+    speed,
+    zone,
+    motion_type=Motion.JOINT,
+    feedback_level=FeedbackLevel.NONE,
+):
+    """Build many :class:`MoveToFrame` instructions at once from arrays of positions and quaternions.
+
+    No :class:`compas.geometry.Frame` is created per instruction. Quaternions are
+    normalized, and validation is done on whole arrays instead of per instruction.
+    Requires NumPy.
+
+    Parameters
+    ----------
+    positions : array-like
+        Target positions in mm, with a shape of ``(N, 3)``.
+    quaternions : array-like
+        Target orientations as ``(w, x, y, z)`` quaternions, with a shape of ``(N, 4)``.
+    speed : :obj:`float` or array-like
+        Speed in mm/s, either one for all or one per instruction.
+    zone : :class:`Zone` or array-like
+        Zone data, either one for all or one per instruction.
+    motion_type : :class:`Motion`
+        Motion type. Defaults to :attr:`Motion.JOINT`.
+    feedback_level : :obj:`int`
+        Defines the feedback level requested from the robot. Defaults to :attr:`FeedbackLevel.NONE`.
+
+    Returns
+    -------
+    :obj:`list`
+        List of ``N`` instructions.
+    """
+    prototype = MoveToFrame(Frame.worldXY(), 1, Zone.FINE, motion_type, feedback_level)
+    return _build_cartesian(prototype, positions, quaternions, None, speed, zone)
+
+
+def build_move_to_robtarget(
+    positions,
+    quaternions,
+    ext_axes,
+    speed,
+    zone,
+    motion_type=Motion.JOINT,
+    feedback_level=FeedbackLevel.NONE,
+):
+    """Build many :class:`MoveToRobtarget` instructions at once from arrays of positions,
+    quaternions and external axes.
+
+    No :class:`compas.geometry.Frame` is created per instruction. Quaternions are
+    normalized, and validation and padding are done on whole arrays instead of per
+    instruction. Requires NumPy.
+
+    Parameters
+    ----------
+    positions : array-like
+        Target positions in mm, with a shape of ``(N, 3)``.
+    quaternions : array-like
+        Target orientations as ``(w, x, y, z)`` quaternions, with a shape of ``(N, 4)``.
+    ext_axes : array-like
+        External axes positions, with a shape of ``(N, k)`` where ``k`` is up to 6, or ``None``.
+    speed : :obj:`float` or array-like
+        Speed in mm/s, either one for all or one per instruction.
+    zone : :class:`Zone` or array-like
+        Zone data, either one for all or one per instruction.
+    motion_type : :class:`Motion`
+        Motion type. Defaults to :attr:`Motion.JOINT`.
+    feedback_level : :obj:`int`
+        Defines the feedback level requested from the robot. Defaults to :attr:`FeedbackLevel.NONE`.
+
+    Returns
+    -------
+    :obj:`list`
+        List of ``N`` instructions.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        instructions = rrc.build_move_to_robtarget(points, quaternions, axes, speeds, rrc.Zone.Z1, rrc.Motion.LINEAR)
+        abb.send_many(instructions)
+
+    """
+    prototype = MoveToRobtarget(
+        Frame.worldXY(), [], 1, Zone.FINE, motion_type, feedback_level
+    )
+    return _build_cartesian(prototype, positions, quaternions, ext_axes, speed, zone)
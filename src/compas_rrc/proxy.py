@@ -0,0 +1,638 @@
+"""
+Local proxy to share the connection to the robots between many processes.
+
+Every process creating its own :class:`~compas_rrc.RosClient` opens a websocket
+to rosbridge, subscribes to the feedback of the robot, and receives every feedback
+message, including the ones of other processes. The proxy owns a single ROS
+connection and one :class:`~compas_rrc.AbbClient` per namespace, and processes
+talk to it over a Unix socket (or a TCP socket on platforms without them).
+Feedback is only sent to the process that sent the instruction.
+
+Start the proxy next to the cell software::
+
+    python -m compas_rrc.proxy --address /tmp/compas_rrc.sock --ros-host 192.168.0.10
+
+Then connect to it from any number of processes::
+
+    from compas_rrc.proxy import ProxyAbbClient
+    from compas_rrc.proxy import ProxyClient
+
+    proxy = ProxyClient('/tmp/compas_rrc.sock')
+    abb = ProxyAbbClient(proxy, '/rob1')
+    abb.connect(timeout=5)
+
+    robot_joints, external_axes = abb.send_and_wait(rrc.GetJoints())
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    ProxyServer
+    ProxyClient
+    ProxyAbbClient
+    ProxySubscription
+
+"""
+
+from __future__ import print_function
+
+import json
+import logging
+import os
+import socket
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from compas_rrc.client import AbbClient
+from compas_rrc.client import Subscription
+from compas_rrc.client import _get_parser
+from compas_rrc.client import _parse_feedback
+from compas_rrc.common import DeliveryPolicy
+from compas_rrc.common import FeedbackLevel
+from compas_rrc.common import FutureResult
+from compas_rrc.common import TimeoutException
+
+__all__ = [
+    "ProxyServer",
+    "ProxyClient",
+    "ProxyAbbClient",
+    "ProxySubscription",
+]
+
+LOGGER = logging.getLogger("compas_rrc")
+
+# Replies waiting to be written to a process before it is considered stalled
+MAX_QUEUED_REPLIES = 100000
+
+
+def _create_socket(address):
+    if isinstance(address, (tuple, list)):
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM), tuple(address)
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("Unix sockets are not supported, use a (host, port) address")
+    return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM), address
+
+
+class _FrameStream(object):
+    """Newline-delimited JSON frames over a connected socket."""
+
+    def __init__(self, sock):
+        self.socket = sock
+        self._reader = sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def read(self):
+        line = self._reader.readline()
+        if not line:
+            return None
+        return json.loads(line.decode("utf-8"))
+
+    def write(self, frame):
+        data = (json.dumps(frame) + "\n").encode("utf-8")
+        with self._lock:
+            self.socket.sendall(data)
+
+    def close(self):
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self._reader.close()
+        self.socket.close()
+
+
+class _RemoteInstruction(object):
+    """Instruction message received from a process, forwarded to the robot as is.
+
+    Feedback is returned unparsed, the process that sent the instruction parses it.
+    """
+
+    __slots__ = ("_msg",)
+
+    def __init__(self, msg):
+        self._msg = dict(msg)
+
+    @property
+    def instruction(self):
+        return self._msg["instruction"]
+
+    @property
+    def exec_level(self):
+        return self._msg["exec_level"]
+
+    @property
+    def feedback_level(self):
+        return self._msg["feedback_level"]
+
+    @feedback_level.setter
+    def feedback_level(self, value):
+        self._msg["feedback_level"] = value
+
+    @property
+    def sequence_id(self):
+        return self._msg["sequence_id"]
+
+    @sequence_id.setter
+    def sequence_id(self, value):
+        self._msg["sequence_id"] = value
+
+    @property
+    def msg(self):
+        return self._msg
+
+    def parse_feedback(self, result):
+        return result
+
+
+class ProxyServer(object):
+    """Proxy owning the ROS connection and the clients of the robots, shared by many processes.
+
+    Each namespace gets a single :class:`~compas_rrc.AbbClient`, created the first time a
+    process connects to it, so sequence ids never collide between processes.
+    """
+
+    def __init__(self, ros, address, client_factory=None):
+        """Initialize a new proxy.
+
+        Parameters
+        ----------
+        ros : :class:`~compas_rrc.RosClient`
+            Instance of a ROS connection.
+        address : :obj:`str` or :obj:`tuple`
+            Path of the Unix socket, or ``(host, port)`` of a TCP socket.
+        client_factory : callable
+            Function creating the client of a namespace, called with the ROS connection and the namespace. Optional.
+            Defaults to a plain :class:`~compas_rrc.AbbClient`, e.g. pass one configuring flow control.
+        """
+        self.ros = ros
+        self.address = address
+        self.client_factory = client_factory or AbbClient
+        self.clients = {}
+        self._clients_lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self._connections = set()
+
+    def start(self):
+        """Start accepting processes on a background thread."""
+        sock, address = _create_socket(self.address)
+        if not isinstance(address, tuple) and os.path.exists(address):
+            probe, _ = _create_socket(address)
+            try:
+                probe.connect(address)
+            except socket.error:
+                # Left over by a proxy that did not shut down cleanly
+                os.unlink(address)
+            else:
+                sock.close()
+                raise ValueError("A proxy is already running at {}".format(address))
+            finally:
+                probe.close()
+
+        self._socket = sock
+        self._socket.bind(address)
+        self._socket.listen(16)
+        if isinstance(address, tuple):
+            self.address = self._socket.getsockname()
+
+        self._thread = threading.Thread(target=self._accept_loop, args=(self._socket,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def serve_forever(self):
+        """Start accepting processes and block until the proxy is closed."""
+        self.start()
+        while self._thread.is_alive():
+            self._thread.join(1)
+
+    def close(self):
+        """Stop accepting processes and disconnect the connected ones."""
+        if self._socket is None:
+            return
+        sock, self._socket = self._socket, None
+        try:
+            # Wakes up the accepting thread
+            sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        sock.close()
+        for connection in list(self._connections):
+            connection.close()
+        if not isinstance(self.address, tuple) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def get_client(self, namespace):
+        """Get the client of a namespace, creating it if needed."""
+        with self._clients_lock:
+            client = self.clients.get(namespace)
+            if client is None:
+                client = self.clients[namespace] = self.client_factory(
+                    self.ros, namespace
+                )
+            return client
+
+    def _accept_loop(self, listener):
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except socket.error:
+                return
+            connection = _ProxyConnection(self, sock)
+            self._connections.add(connection)
+            connection.start()
+
+
+class _ProxyConnection(object):
+    """Requests of one process connected to the proxy.
+
+    Replies are written by a dedicated thread, because they are produced on the
+    ROS receive thread, which a process that stops reading must not block.
+    """
+
+    def __init__(self, server, sock):
+        self.server = server
+        self.stream = _FrameStream(sock)
+        self.subscriptions = {}
+        self.closed = False
+        self._replies = queue.Queue(maxsize=MAX_QUEUED_REPLIES)
+
+    def start(self):
+        for target in (self._read_loop, self._write_loop):
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for subscription in list(self.subscriptions.values()):
+            subscription.unsubscribe()
+        self.subscriptions.clear()
+        self.stream.close()
+        self.server._connections.discard(self)
+        try:
+            # Wakes up the writing thread
+            self._replies.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def reply(self, frame):
+        if self.closed:
+            return
+        try:
+            self._replies.put_nowait(frame)
+        except queue.Full:
+            LOGGER.warning("Proxy disconnects a process that stopped reading replies")
+            self.close()
+
+    def _write_loop(self):
+        while True:
+            frame = self._replies.get()
+            if frame is None or self.closed:
+                return
+            try:
+                self.stream.write(frame)
+            except (socket.error, ValueError):
+                self.close()
+                return
+
+    def _read_loop(self):
+        try:
+            while True:
+                frame = self.stream.read()
+                if frame is None:
+                    break
+                try:
+                    getattr(self, "_do_" + frame["op"])(frame)
+                except Exception as error:
+                    LOGGER.exception("Proxy request failed")
+                    self._reply_error(frame.get("id"), error)
+        except (socket.error, ValueError):
+            pass
+        finally:
+            self.close()
+
+    def _reply_error(self, request_id, error):
+        self.reply(
+            dict(
+                op="error",
+                id=request_id,
+                timeout=isinstance(error, TimeoutException),
+                error=str(error),
+            )
+        )
+
+    def _do_connect(self, frame):
+        self.server.get_client(frame["namespace"]).connect(frame.get("timeout"))
+        self.reply(dict(op="feedback", id=frame["id"], message=None))
+
+    def _do_send(self, frame):
+        requests = frame["requests"]
+        try:
+            client = self.server.get_client(frame["namespace"])
+            futures = client.send_many(
+                [_RemoteInstruction(request["msg"]) for request in requests]
+            )
+        except Exception as error:
+            # The frame has no id of its own, so every request is answered
+            LOGGER.exception("Proxy send failed")
+            for request in requests:
+                if request.get("id") is not None:
+                    self._reply_error(request["id"], error)
+            return
+
+        for request, future in zip(requests, futures):
+            if future is not None and request.get("id") is not None:
+                future.add_done_callback(self._on_done(request["id"]))
+
+    def _on_done(self, request_id):
+        def _callback(future):
+            if isinstance(future.value, Exception):
+                self._reply_error(request_id, future.value)
+            else:
+                self.reply(dict(op="feedback", id=request_id, message=future.value))
+
+        return _callback
+
+    def _do_subscribe(self, frame):
+        request_id = frame["id"]
+        client = self.server.get_client(frame["namespace"])
+
+        def _callback(message):
+            self.reply(dict(op="feedback", id=request_id, message=message))
+
+        self.subscriptions[request_id] = client.send_and_subscribe(
+            _RemoteInstruction(frame["msg"]), _callback
+        )
+
+    def _do_unsubscribe(self, frame):
+        subscription = self.subscriptions.pop(frame["id"], None)
+        if subscription:
+            subscription.unsubscribe()
+
+
+class ProxyClient(object):
+    """Connection of a process to a :class:`ProxyServer`, shared by all its robot clients."""
+
+    def __init__(self, address):
+        """Connect to a proxy.
+
+        Parameters
+        ----------
+        address : :obj:`str` or :obj:`tuple`
+            Path of the Unix socket, or ``(host, port)`` of a TCP socket of the proxy.
+        """
+        sock, address = _create_socket(address)
+        sock.connect(address)
+        self.stream = _FrameStream(sock)
+        self.received = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._thread = threading.Thread(target=self._read_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def close(self):
+        """Disconnect from the proxy."""
+        self.stream.close()
+
+    def request(self, frame, handler=None, stream=False):
+        """Send a request frame.
+
+        Parameters
+        ----------
+        frame : :obj:`dict`
+            Request to send.
+        handler : callable
+            Function called with the reply frame. Optional.
+        stream : :obj:`bool`
+            ``True`` to call ``handler`` with every reply frame until :meth:`forget` is called,
+            otherwise only with the first one.
+
+        Returns
+        -------
+        :obj:`int`
+            Id of the request.
+        """
+        if handler is not None:
+            with self._lock:
+                self._next_id += 1
+                frame["id"] = self._next_id
+                self._pending[frame["id"]] = (handler, stream)
+        self.stream.write(frame)
+        return frame.get("id")
+
+    def send_requests(self, namespace, requests):
+        """Send several instruction requests to the robot of a namespace in one frame.
+
+        Parameters
+        ----------
+        namespace : :obj:`str`
+            Namespace of the robot.
+        requests : :obj:`list` of :obj:`tuple`
+            Message of each instruction and the function handling its reply frame, or ``None``.
+        """
+        frames = []
+        with self._lock:
+            for msg, handler in requests:
+                request = dict(msg=msg)
+                if handler is not None:
+                    self._next_id += 1
+                    request["id"] = self._next_id
+                    self._pending[self._next_id] = (handler, False)
+                frames.append(request)
+        self.stream.write(dict(op="send", namespace=namespace, requests=frames))
+
+    def forget(self, request_id):
+        """Stop handling the replies of a request."""
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def _read_loop(self):
+        try:
+            while True:
+                frame = self.stream.read()
+                if frame is None:
+                    break
+                self.received += 1
+                with self._lock:
+                    handler, stream = self._pending.get(frame["id"], (None, False))
+                    if handler and not stream:
+                        del self._pending[frame["id"]]
+                if handler:
+                    handler(frame)
+        except (socket.error, ValueError):
+            pass
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for handler, _ in pending.values():
+            handler(dict(op="error", timeout=False, error="Connection to proxy lost"))
+
+
+def _resolve(future, parser, frame):
+    """Set the result of a future from a reply frame."""
+    if frame["op"] == "error":
+        error = TimeoutException if frame["timeout"] else Exception
+        future._set_result(error(frame["error"]))
+    else:
+        future._set_result(_parse_feedback(dict(parser=parser), frame["message"]))
+
+
+class ProxySubscription(Subscription):
+    """Handle to the feedback stream activated by :meth:`ProxyAbbClient.send_and_subscribe`."""
+
+    def unsubscribe(self):
+        """Stop delivering feedback to the callback of this subscription."""
+        self.active = False
+        if self.sequence_id is not None:
+            self.client.proxy.forget(self.sequence_id)
+            self.client.proxy.request(dict(op="unsubscribe", id=self.sequence_id))
+
+
+class ProxyAbbClient(object):
+    """Client of the robot of one namespace, communicating through a :class:`ProxyServer`.
+
+    It offers the same ways of communication as :class:`~compas_rrc.AbbClient`.
+    Sequence ids are assigned by the proxy, so any number of processes can
+    send to the same robot.
+    """
+
+    def __init__(self, proxy, namespace="/rob1", dispatcher=None):
+        """Initialize a new robot client.
+
+        Parameters
+        ----------
+        proxy : :class:`ProxyClient`
+            Connection to the proxy.
+        namespace : :obj:`str`
+            Namespace of the robot. Optional. If not specified, it will use namespace ``/rob1``.
+        dispatcher : :class:`~compas_rrc.FeedbackDispatcher`
+            Delivers subscription feedback on worker threads. Optional.
+            If not specified, callbacks are invoked on the receive thread of the proxy connection.
+        """
+        self.proxy = proxy
+        self.namespace = namespace
+        self.dispatcher = dispatcher
+
+    def connect(self, timeout=None):
+        """Wait until the proxy is connected to the robot.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Timeout in seconds to wait before raising an exception. Optional.
+        """
+        future = FutureResult()
+
+        def _handler(frame):
+            if frame["op"] == "error":
+                future._set_result(Exception(frame["error"]))
+            else:
+                future._set_result(None)
+
+        self.proxy.request(
+            dict(op="connect", namespace=self.namespace, timeout=timeout), _handler
+        )
+        future.result(timeout + 1 if timeout is not None else None)
+
+    def send(self, instruction):
+        """Sends an instruction to the robot without waiting, see :meth:`AbbClient.send`."""
+        return self.send_many([instruction])[0]
+
+    def send_many(self, instructions):
+        """Sends a sequence of instructions to the robot without waiting, see :meth:`AbbClient.send_many`."""
+        requests = []
+        results = []
+        for instruction in instructions:
+            result = None
+            handler = None
+            if instruction.feedback_level > 0:
+                result = FutureResult()
+                handler = self._create_handler(result, _get_parser(instruction))
+            requests.append((instruction.msg, handler))
+            results.append(result)
+
+        self.proxy.send_requests(self.namespace, requests)
+        return results
+
+    def _create_handler(self, future, parser):
+        return lambda frame: _resolve(future, parser, frame)
+
+    def send_and_wait(self, instruction, timeout=None):
+        """Send instruction and wait for feedback, see :meth:`AbbClient.send_and_wait`."""
+        if instruction.feedback_level == FeedbackLevel.NONE:
+            instruction.feedback_level = FeedbackLevel.DONE
+
+        return self.send(instruction).result(timeout)
+
+    def send_and_subscribe(
+        self, instruction, callback, policy=DeliveryPolicy.ALL, interval=None
+    ):
+        """Send instruction and stream its feedback, see :meth:`AbbClient.send_and_subscribe`.
+
+        Returns
+        -------
+        :class:`ProxySubscription`
+            Handle to stop receiving feedback.
+        """
+        subscription = ProxySubscription(
+            self, callback, _get_parser(instruction), policy, interval
+        )
+
+        def _handler(frame):
+            if frame["op"] == "feedback":
+                subscription._receive(frame["message"])
+            else:
+                subscription.active = False
+
+        subscription.sequence_id = self.proxy.request(
+            dict(op="subscribe", namespace=self.namespace, msg=instruction.msg),
+            _handler,
+            stream=True,
+        )
+        return subscription
+
+
+def main():
+    import argparse
+
+    from compas_rrc.client import RosClient
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--address",
+        default="/tmp/compas_rrc.sock",
+        help="Path of the Unix socket, or port of a local TCP socket",
+    )
+    parser.add_argument("--ros-host", default="localhost", help="Host of rosbridge")
+    parser.add_argument("--ros-port", type=int, default=9090, help="Port of rosbridge")
+    args = parser.parse_args()
+
+    address = args.address
+    if address.isdigit():
+        address = ("127.0.0.1", int(address))
+
+    ros = RosClient(args.ros_host, args.ros_port)
+    ros.run()
+
+    server = ProxyServer(ros, address)
+    print("Proxy listening on {}".format(address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        ros.close()
+        ros.terminate()
+
+
+if __name__ == "__main__":
+    main()
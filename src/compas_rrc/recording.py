@@ -0,0 +1,329 @@
+import struct
+import threading
+import time
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+__all__ = [
+    "RecordingWriter",
+    "RecordingReader",
+    "RecordedInstruction",
+]
+
+_MAGIC = b"RRCR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+_RECORD = struct.Struct("<dIBBHH")
+_LENGTH = struct.Struct("<I")
+
+_VALUES = {}
+
+
+def _values_struct(string_count, float_count):
+    """Struct of the string ids and float values of a record, cached per size."""
+    values = _VALUES.get((string_count, float_count))
+    if values is None:
+        values = _VALUES[(string_count, float_count)] = struct.Struct(
+            "<{}I{}d".format(string_count, float_count)
+        )
+    return values
+
+
+class RecordedInstruction(object):
+    """Lightweight instruction read from a recording."""
+
+    __slots__ = (
+        "instruction",
+        "exec_level",
+        "feedback_level",
+        "string_values",
+        "float_values",
+        "sequence_id",
+    )
+
+    def __init__(
+        self, instruction, exec_level, feedback_level, string_values, float_values
+    ):
+        self.instruction = instruction
+        self.exec_level = exec_level
+        self.feedback_level = feedback_level
+        self.string_values = string_values
+        self.float_values = float_values
+        self.sequence_id = None
+
+    def __repr__(self):
+        return "RecordedInstruction({!r}, {}, {})".format(
+            self.instruction, self.string_values, self.float_values
+        )
+
+    @property
+    def msg(self):
+        """Raw message."""
+        return dict(
+            instruction=self.instruction,
+            exec_level=self.exec_level,
+            feedback_level=self.feedback_level,
+            string_values=self.string_values,
+            float_values=self.float_values,
+            sequence_id=self.sequence_id,
+        )
+
+
+class RecordingWriter(object):
+    """Writes instructions to a compact binary recording, to send the same program again later.
+
+    Each instruction takes a fixed 18 bytes, plus 4 bytes per string value and 8 bytes
+    per float value. Instruction names and string values are interned in a table
+    written at the end of the file, so repeating them costs nothing. The time at
+    which each instruction was recorded is kept, to replay it at the same pace.
+
+    Passed to a client, it records every instruction the client publishes,
+    including the feedback level requested by :class:`FlowControl` checkpoints.
+    The recording is only readable after :meth:`close`, and the client keeps
+    sending without recording once it is closed.
+
+    Examples
+    --------
+
+    Record a program while running it::
+
+        with rrc.RecordingWriter('program.rrc') as recording:
+            abb = rrc.AbbClient(ros, '/rob1', recorder=recording)
+            run_program(abb)
+
+    """
+
+    def __init__(self, path):
+        """Create a new recording.
+
+        Parameters
+        ----------
+        path : :obj:`str`
+            Path of the recording file. An existing file is overwritten.
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0, 0))
+        self._strings = {}
+        self._start = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _intern(self, value):
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+        return index
+
+    def write(self, instructions):
+        """Append instructions to the recording.
+
+        Parameters
+        ----------
+        instructions : :obj:`list`
+            Instructions, or their raw messages. Ignored once the recording is closed.
+        """
+        now = time.time()
+        with self._lock:
+            if self._file is None:
+                return
+            if self._start is None:
+                self._start = now
+            elapsed = now - self._start
+
+            chunks = []
+            for instruction in instructions:
+                msg = getattr(instruction, "msg", instruction)
+                string_ids = [self._intern(value) for value in msg["string_values"]]
+                float_values = msg["float_values"]
+                chunks.append(
+                    _RECORD.pack(
+                        elapsed,
+                        self._intern(msg["instruction"]),
+                        msg["feedback_level"],
+                        msg["exec_level"],
+                        len(string_ids),
+                        len(float_values),
+                    )
+                )
+                chunks.append(
+                    _values_struct(len(string_ids), len(float_values)).pack(
+                        *(string_ids + list(float_values))
+                    )
+                )
+            self._file.write(b"".join(chunks))
+            self.count += len(instructions)
+
+    def close(self):
+        """Write the string table and close the recording."""
+        with self._lock:
+            if self._file is None:
+                return
+
+            strings_offset = self._file.tell()
+            strings = sorted(self._strings, key=self._strings.get)
+            chunks = [_LENGTH.pack(len(strings))]
+            for value in strings:
+                data = value.encode("utf-8")
+                chunks.append(_LENGTH.pack(len(data)))
+                chunks.append(data)
+            self._file.write(b"".join(chunks))
+
+            self._file.seek(0)
+            self._file.write(
+                _HEADER.pack(_MAGIC, _VERSION, 0, self.count, strings_offset)
+            )
+            self._file.close()
+            self._file = None
+
+
+class RecordingReader(object):
+    """Reads a recording written by :class:`RecordingWriter`.
+
+    The file is mapped in memory and instructions are only created while
+    iterating, so replaying a program of millions of instructions only
+    keeps a few of them in memory at a time.
+
+    Examples
+    --------
+
+    Send a recorded program again, twice as fast as it was recorded::
+
+        with rrc.RecordingReader('program.rrc') as recording:
+            futures = recording.replay(abb, speed=2.0)
+
+    """
+
+    def __init__(self, path):
+        """Open a recording.
+
+        Parameters
+        ----------
+        path : :obj:`str`
+            Path of the recording file.
+        """
+        if mmap is None:
+            raise ImportError("RecordingReader requires mmap")
+
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, strings_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION or not strings_offset:
+            self.close()
+            raise ValueError("Not a complete recording: {}".format(path))
+
+        self.count = count
+        self._end = strings_offset
+        self.strings = self._read_strings(strings_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for _, instruction in self.records():
+            yield instruction
+
+    def close(self):
+        """Close the recording."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._file.close()
+
+    def _read_strings(self, offset):
+        (count,) = _LENGTH.unpack_from(self._map, offset)
+        offset += _LENGTH.size
+        strings = []
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(self._map, offset)
+            start = offset + _LENGTH.size
+            offset = start + length
+            strings.append(self._map[start:offset].decode("utf-8"))
+        return strings
+
+    def records(self):
+        """Iterate over the recorded instructions.
+
+        Yields
+        ------
+        :obj:`tuple`
+            The time in seconds since the start of the recording, and the :class:`RecordedInstruction`.
+        """
+        strings = self.strings
+        offset = _HEADER.size
+        while offset < self._end:
+            elapsed, name, feedback_level, exec_level, string_count, float_count = (
+                _RECORD.unpack_from(self._map, offset)
+            )
+            offset += _RECORD.size
+
+            values_struct = _values_struct(string_count, float_count)
+            values = values_struct.unpack_from(self._map, offset)
+            offset += values_struct.size
+
+            yield elapsed, RecordedInstruction(
+                strings[name],
+                exec_level,
+                feedback_level,
+                [strings[index] for index in values[:string_count]],
+                list(values[string_count:]),
+            )
+
+    def replay(self, client, speed=None, batch_size=100):
+        """Send the recorded instructions through a client.
+
+        Parameters
+        ----------
+        client : :class:`AbbClient`
+            Client of the robot.
+        speed : :obj:`float`
+            Pace of the replay relative to the recording, e.g. ``2.0`` sends twice as fast. Optional.
+            If not specified, instructions are sent as fast as the client allows.
+        batch_size : :obj:`int`
+            Maximum number of instructions sent at once with :meth:`AbbClient.send_many`. Defaults to ``100``.
+
+        Returns
+        -------
+        :obj:`list` of :class:`FutureResult`
+            Results of the instructions that request feedback.
+        """
+        futures = []
+        batch = []
+        start = time.time()
+
+        def _send():
+            futures.extend(result for result in client.send_many(batch) if result)
+            del batch[:]
+
+        for elapsed, instruction in self.records():
+            if speed:
+                delay = start + elapsed / speed - time.time()
+                if delay > 0:
+                    if batch:
+                        _send()
+                    time.sleep(delay)
+
+            batch.append(instruction)
+            if len(batch) >= batch_size:
+                _send()
+
+        if batch:
+            _send()
+        return futures
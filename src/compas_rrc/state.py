@@ -0,0 +1,179 @@
+import math
+import threading
+import time
+
+import roslibpy
+
+from compas_rrc.common import RobotJoints
+from compas_rrc.common import TimeoutException
+
+__all__ = [
+    "JointStateMirror",
+    "JointStateSample",
+]
+
+
+class JointStateSample(object):
+    """Immutable joint state of the robot, as published by the driver.
+
+    Attributes
+    ----------
+    names : :obj:`tuple` of :obj:`str`
+        Names of the joints.
+    positions : :obj:`tuple` of :obj:`float`
+        Joint positions in ROS units, i.e. radians and meters.
+    velocities : :obj:`tuple` of :obj:`float`
+        Joint velocities, if published by the driver.
+    efforts : :obj:`tuple` of :obj:`float`
+        Joint efforts, if published by the driver.
+    stamp : :obj:`float`
+        Time in seconds at which the driver read the state.
+    received : :obj:`float`
+        Local time in seconds, as returned by ``time.time()``, at which the state was received.
+    """
+
+    __slots__ = ("names", "positions", "velocities", "efforts", "stamp", "received")
+
+    def __init__(self, names, positions, velocities, efforts, stamp, received):
+        self.names = names
+        self.positions = positions
+        self.velocities = velocities
+        self.efforts = efforts
+        self.stamp = stamp
+        self.received = received
+
+    def __repr__(self):
+        return "JointStateSample(stamp={}, positions={})".format(
+            self.stamp, [round(i, 4) for i in self.positions]
+        )
+
+    @property
+    def robot_joints(self):
+        """The first 6 joint positions as :class:`RobotJoints`, in degrees."""
+        return RobotJoints([math.degrees(value) for value in self.positions[0:6]])
+
+    @classmethod
+    def from_msg(cls, msg, received=None):
+        """Create a sample from a ``sensor_msgs/JointState`` message."""
+        stamp = msg.get("header", {}).get("stamp", {})
+        return cls(
+            tuple(msg.get("name", ())),
+            tuple(msg.get("position", ())),
+            tuple(msg.get("velocity", ())),
+            tuple(msg.get("effort", ())),
+            stamp.get("secs", 0) + stamp.get("nsecs", 0) * 1e-9,
+            received if received is not None else time.time(),
+        )
+
+
+class JointStateMirror(object):
+    """Continuously updated copy of the joint state published by the driver.
+
+    The driver publishes the joint state of the robot on its own connection to
+    the controller (see ``robot_state_port``), independently of the instructions
+    queued in the RAPID task. The mirror subscribes to it and keeps the latest
+    state, so that it can be queried from any thread without a round trip, even
+    while a long sequence of motions is executing.
+
+    Examples
+    --------
+
+    Monitor the robot while streaming a toolpath::
+
+        abb = rrc.AbbClient(ros, '/rob1', joint_states=rrc.JointStateMirror())
+        abb.send_many(toolpath)
+
+        while True:
+            state = abb.joint_states.wait(timeout=1)
+            print(state.stamp, state.robot_joints)
+
+    """
+
+    def __init__(self, topic_name="joint_states", throttle_rate=0):
+        """Initialize a new mirror.
+
+        Parameters
+        ----------
+        topic_name : :obj:`str`
+            Name of the joint state topic, relative to the namespace of the robot. Defaults to ``joint_states``.
+        throttle_rate : :obj:`int`
+            Minimum time in milliseconds between messages sent by ROS. Defaults to ``0``, i.e. all messages.
+        """
+        self.topic_name = topic_name
+        self.throttle_rate = throttle_rate
+        self.topic = None
+        self.count = 0
+        self._latest = None
+        self._condition = threading.Condition()
+
+    @property
+    def latest(self):
+        """Latest :class:`JointStateSample`, or ``None`` if no state has been received yet."""
+        return self._latest
+
+    @property
+    def age(self):
+        """Time in seconds since the latest state was received, or ``None`` if no state has been received yet."""
+        latest = self._latest
+        if latest is None:
+            return None
+        return time.time() - latest.received
+
+    def attach(self, ros, namespace):
+        """Subscribe to the joint state topic of a robot.
+
+        Parameters
+        ----------
+        ros : :class:`RosClient`
+            Instance of a ROS connection.
+        namespace : :obj:`str`
+            Namespace of the robot, e.g. ``/rob1/``.
+        """
+        if not namespace.endswith("/"):
+            namespace += "/"
+        self.topic = roslibpy.Topic(
+            ros,
+            namespace + self.topic_name,
+            "sensor_msgs/JointState",
+            throttle_rate=self.throttle_rate,
+            queue_length=1,
+        )
+        self.topic.subscribe(self._receive)
+
+    def detach(self):
+        """Unsubscribe from the joint state topic."""
+        if self.topic:
+            self.topic.unsubscribe()
+            self.topic = None
+
+    def wait(self, timeout=None, newer_than=None):
+        """Wait for a joint state newer than a given one.
+
+        Parameters
+        ----------
+        timeout : :obj:`float`
+            Timeout in seconds to wait before raising an exception. Optional.
+        newer_than : :class:`JointStateSample`
+            State to compare with. Optional. Defaults to the latest state.
+
+        Returns
+        -------
+        :class:`JointStateSample`
+        """
+        with self._condition:
+            if newer_than is None:
+                newer_than = self._latest
+            deadline = time.time() + timeout if timeout is not None else None
+            while self._latest is None or self._latest is newer_than:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutException("Timeout: no joint state received")
+                self._condition.wait(remaining)
+            return self._latest
+
+    def _receive(self, message):
+        sample = JointStateSample.from_msg(message)
+        with self._condition:
+            self._latest = sample
+            self.count += 1
+            self._condition.notify_all()
@@ -0,0 +1,199 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = [
+    "ClientStats",
+    "LatencyHistogram",
+]
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+class LatencyHistogram(object):
+    """Histogram of latencies with logarithmic buckets.
+
+    Recording a value is a constant-time operation and the memory used is
+    fixed, independently of the number of recorded values. Percentiles are
+    approximated within the relative ``precision`` of the buckets.
+    """
+
+    def __init__(self, min_value=1e-6, max_value=1e3, precision=0.01):
+        """Initialize a new histogram.
+
+        Parameters
+        ----------
+        min_value : :obj:`float`
+            Lowest latency in seconds that can be told apart. Smaller values are counted in the first bucket.
+        max_value : :obj:`float`
+            Highest latency in seconds that can be told apart. Larger values are counted in the last bucket.
+        precision : :obj:`float`
+            Relative width of the buckets.
+        """
+        self.min_value = min_value
+        self._log_growth = math.log(1.0 + precision)
+        self._buckets = [0] * (self._index(max_value) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_growth) + 1
+
+    def record(self, value):
+        """Record a latency value expressed in seconds."""
+        index = min(self._index(value), len(self._buckets) - 1)
+        self._buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        """Mean of the recorded values, or ``None`` if empty."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, percent):
+        """Approximate value below which ``percent`` percent of the recorded values fall.
+
+        Returns
+        -------
+        :obj:`float`
+            Latency in seconds, or ``None`` if the histogram is empty.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for index, bucket in enumerate(self._buckets):
+            seen += bucket
+            if seen >= rank:
+                if index == 0:
+                    value = self.min_value
+                else:
+                    value = self.min_value * math.exp(index * self._log_growth)
+                return max(self.min, min(self.max, value))
+
+    def summary(self):
+        """Summary of the histogram as a dictionary of count, mean, min, max and percentiles."""
+        return dict(
+            count=self.count,
+            mean=self.mean,
+            min=self.min,
+            max=self.max,
+            p50=self.percentile(50),
+            p95=self.percentile(95),
+            p99=self.percentile(99),
+        )
+
+
+class ClientStats(object):
+    """Latency and throughput instrumentation of an :class:`AbbClient`.
+
+    For every instruction that requests feedback, the time between publishing
+    it and receiving its feedback is recorded in a histogram per instruction name.
+    The client only collects statistics when an instance is attached to it.
+
+    Examples
+    --------
+
+    Find which procedures dominate the cycle time::
+
+        abb = rrc.AbbClient(ros, '/rob1', stats=rrc.ClientStats())
+
+        # ... run the job ...
+
+        for name, latency in abb.stats.summary()['latency'].items():
+            print(name, latency['p50'], latency['p99'])
+
+    """
+
+    def __init__(self, max_pending=100000):
+        """Initialize a new set of statistics.
+
+        Parameters
+        ----------
+        max_pending : :obj:`int`
+            Maximum number of instructions waiting for feedback to keep track of.
+            When exceeded, the oldest ones are discarded.
+        """
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard all collected statistics."""
+        with self._lock:
+            self.started = _clock()
+            self.sent = 0
+            self.received = 0
+            self.histograms = {}
+            self._pending = OrderedDict()
+
+    @property
+    def in_flight(self):
+        """Number of instructions waiting for feedback."""
+        return len(self._pending)
+
+    def record_sent(self, instructions):
+        """Record the publication of a sequence of instructions with sequence ids assigned."""
+        now = _clock()
+        with self._lock:
+            for instruction in instructions:
+                self.sent += 1
+                if instruction.feedback_level > 0:
+                    self._pending[instruction.sequence_id] = (
+                        instruction.instruction,
+                        now,
+                    )
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+
+    def record_feedback(self, sequence_id):
+        """Record the reception of the feedback of an instruction."""
+        now = _clock()
+        with self._lock:
+            self.received += 1
+            sent = self._pending.pop(sequence_id, None)
+            if sent is None:
+                return
+            name, sent_at = sent
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(now - sent_at)
+
+    def summary(self):
+        """Summary of the statistics collected since the last reset.
+
+        Returns
+        -------
+        :obj:`dict`
+            Counters of ``sent`` instructions and ``received`` feedback, their
+            rates per second, the number of instructions ``in_flight``, and the
+            ``latency`` summary in seconds per instruction name.
+        """
+        with self._lock:
+            elapsed = max(_clock() - self.started, 1e-9)
+            return dict(
+                elapsed=elapsed,
+                sent=self.sent,
+                received=self.received,
+                sent_per_second=self.sent / elapsed,
+                received_per_second=self.received / elapsed,
+                in_flight=len(self._pending),
+                latency=dict(
+                    (name, histogram.summary())
+                    for name, histogram in self.histograms.items()
+                ),
+            )
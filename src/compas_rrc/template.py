@@ -0,0 +1,122 @@
+__all__ = ["InstructionTemplate"]
+
+
+class InstructionTemplate(object):
+    """Reusable template to create many instructions that only differ in their leading float values.
+
+    Creating an instruction validates and pads its values, and publishing it
+    collects all its attributes into a message. When streaming thousands of
+    similar instructions, e.g. the points of a toolpath, most of that work is the
+    same every time. A template prepares the static parts of the message once,
+    i.e. the instruction name, string values, execution and feedback levels and the
+    trailing float values, such as speed and zone, so that creating an instruction
+    from it only needs the values that change.
+
+    Examples
+    --------
+
+    Stream a toolpath of joint positions with a constant speed and zone::
+
+        template = rrc.InstructionTemplate(rrc.MoveToJoints([], [], 100, rrc.Zone.Z5), variable=12)
+
+        for joints in toolpath:
+            # 6 robot joints and 6 external axes
+            abb.send(template.create(joints))
+
+    """
+
+    def __init__(self, prototype, variable):
+        """Initialize a new template.
+
+        Parameters
+        ----------
+        prototype : :class:`compas_fab.backends.ros.messages.ROSmsg`
+            Instruction providing all the static values of the template.
+        variable : :obj:`int`
+            Number of leading float values provided when creating each instruction.
+            The remaining float values of the ``prototype`` are kept as they are.
+        """
+        float_values = getattr(prototype, "float_values", [])
+        if variable > len(float_values):
+            raise ValueError(
+                "The prototype only has {} float values".format(len(float_values))
+            )
+        self.variable = variable
+        self.instruction = prototype.instruction
+        self.exec_level = prototype.exec_level
+        self.feedback_level = prototype.feedback_level
+        self.string_values = list(prototype.string_values)
+        self.suffix = list(float_values[variable:])
+        self.parser = getattr(prototype, "parse_feedback", None)
+        self._static = dict(
+            instruction=self.instruction,
+            exec_level=self.exec_level,
+            string_values=self.string_values,
+        )
+
+    def create(self, values, feedback_level=None):
+        """Create a new instruction from the template.
+
+        Parameters
+        ----------
+        values : :obj:`list` of :obj:`float`
+            The leading float values of the instruction.
+        feedback_level : :obj:`int`
+            Overrides the feedback level of the template. Optional.
+
+        Returns
+        -------
+        :class:`TemplateInstruction`
+        """
+        values = list(values)
+        if len(values) != self.variable:
+            raise ValueError(
+                "Expected {} values, got {}".format(self.variable, len(values))
+            )
+        values.extend(self.suffix)
+        if feedback_level is None:
+            feedback_level = self.feedback_level
+        return TemplateInstruction(self, values, feedback_level)
+
+
+class TemplateInstruction(object):
+    """Lightweight instruction created by an :class:`InstructionTemplate`."""
+
+    __slots__ = ("template", "float_values", "feedback_level", "sequence_id")
+
+    def __init__(self, template, float_values, feedback_level):
+        self.template = template
+        self.float_values = float_values
+        self.feedback_level = feedback_level
+        self.sequence_id = None
+
+    @property
+    def instruction(self):
+        """Name of the instruction."""
+        return self.template.instruction
+
+    @property
+    def exec_level(self):
+        """Execution level."""
+        return self.template.exec_level
+
+    @property
+    def string_values(self):
+        """List of string values."""
+        return self.template.string_values
+
+    @property
+    def parse_feedback(self):
+        """Feedback parser of the prototype instruction, if any."""
+        if self.template.parser is None:
+            raise AttributeError("parse_feedback")
+        return self.template.parser
+
+    @property
+    def msg(self):
+        """Raw message."""
+        msg = dict(self.template._static)
+        msg["float_values"] = self.float_values
+        msg["feedback_level"] = self.feedback_level
+        msg["sequence_id"] = self.sequence_id
+        return msg
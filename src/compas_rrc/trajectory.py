@@ -0,0 +1,302 @@
+import math
+import weakref
+
+from compas_fab.robots import Duration
+from compas_fab.robots import JointTrajectory
+from compas_fab.robots import JointTrajectoryPoint
+from compas_robots.model import Joint
+
+from compas_rrc.common import CompactExternalAxes
+from compas_rrc.common import CompactRobotJoints
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ["JointTrajectoryBuffer"]
+
+_JOINT_METADATA = weakref.WeakKeyDictionary()
+
+
+def _get_joint_metadata(robot, group=None):
+    """Configurable joint names and types of a group of the robot, cached per robot and group."""
+    groups = _JOINT_METADATA.get(robot)
+    if groups is None:
+        groups = _JOINT_METADATA[robot] = {}
+
+    metadata = groups.get(group)
+    if metadata is None:
+        metadata = groups[group] = (
+            list(robot.get_configurable_joint_names(group)),
+            list(robot.get_configurable_joint_types(group)),
+        )
+    return metadata
+
+
+def _to_meters_radians_factors(joint_types):
+    """Factors that convert mm and degrees to meters and radians, one per joint type."""
+    return numpy.array(
+        [
+            math.pi / 180.0 if type_ in {Joint.REVOLUTE, Joint.CONTINUOUS} else 0.001
+            for type_ in joint_types
+        ]
+    )
+
+
+class JointTrajectoryBuffer(object):
+    """Columnar container of a trajectory of robot joints and external axes.
+
+    The joint values of all points of the trajectory are stored in two NumPy
+    arrays, with one row per point, so that converting units or exchanging
+    trajectories with ``compas_fab`` is done for all points at once instead of
+    one :class:`RobotJoints` at a time. Values are expressed in mm and degrees,
+    like in the rest of ``compas_rrc``.
+
+    This class requires NumPy.
+
+    Examples
+    --------
+
+    Execute a trajectory planned with ``compas_fab``::
+
+        buffer = rrc.JointTrajectoryBuffer.from_joint_trajectory(trajectory, robot)
+
+        for robot_joints, external_axes in buffer:
+            abb.send(rrc.MoveToJoints(robot_joints, external_axes, 100, rrc.Zone.Z5))
+
+    """
+
+    def __init__(self, robot_joints, external_axes=None, time_from_start=None):
+        """Initialize a new buffer.
+
+        Parameters
+        ----------
+        robot_joints : array-like
+            Robot joint values of each point, with a shape of ``(N, 6)``.
+        external_axes : array-like
+            External axes values of each point, with a shape of ``(N, k)`` where ``k`` is up to 6. Optional.
+        time_from_start : array-like
+            Time in seconds at which each point is reached. Optional.
+        """
+        if numpy is None:
+            raise ImportError("JointTrajectoryBuffer requires NumPy")
+
+        self.robot_joints = numpy.array(robot_joints, dtype=float, ndmin=2)
+        if self.robot_joints.size == 0:
+            self.robot_joints = self.robot_joints.reshape(0, 6)
+        if self.robot_joints.ndim != 2 or self.robot_joints.shape[1] != 6:
+            raise ValueError("Robot joints must have a shape of (N, 6)")
+
+        count = len(self.robot_joints)
+        if external_axes is None:
+            external_axes = numpy.zeros((count, 0))
+        self.external_axes = numpy.array(external_axes, dtype=float, ndmin=2)
+        if self.external_axes.size == 0:
+            self.external_axes = self.external_axes.reshape(count, 0)
+        if self.external_axes.shape[0] != count or self.external_axes.shape[1] > 6:
+            raise ValueError(
+                "External axes must have a shape of (N, k), with k up to 6"
+            )
+
+        self.time_from_start = None
+        if time_from_start is not None:
+            self.time_from_start = numpy.array(time_from_start, dtype=float)
+            if self.time_from_start.shape != (count,):
+                raise ValueError("Time from start must have a shape of (N,)")
+
+    def __len__(self):
+        return len(self.robot_joints)
+
+    def __getitem__(self, item):
+        return (
+            CompactRobotJoints(self.robot_joints[item]),
+            CompactExternalAxes(self.external_axes[item]),
+        )
+
+    def __iter__(self):
+        for joints, axes in zip(
+            self.robot_joints.tolist(), self.external_axes.tolist()
+        ):
+            yield CompactRobotJoints(joints), CompactExternalAxes(axes)
+
+    @property
+    def joint_values(self):
+        """Robot joints followed by the external axes of each point, with a shape of ``(N, 6 + k)``."""
+        return numpy.hstack((self.robot_joints, self.external_axes))
+
+    @classmethod
+    def from_samples(cls, samples):
+        """Create a buffer from a sequence of robot joints and external axes pairs,
+        e.g. as returned by :class:`GetJoints`.
+
+        Parameters
+        ----------
+        samples : :obj:`list` of :obj:`tuple`
+            Pairs of :class:`RobotJoints` and :class:`ExternalAxes`.
+
+        Returns
+        -------
+        :class:`JointTrajectoryBuffer`
+        """
+        robot_joints = []
+        external_axes = []
+        for joints, axes in samples:
+            robot_joints.append(list(joints))
+            external_axes.append(list(axes))
+        return cls(robot_joints, external_axes or None)
+
+    def to_meters_radians(self, joint_types):
+        """Joint values of all points converted from mm and degrees to meters and radians.
+
+        Parameters
+        ----------
+        joint_types : :obj:`list`
+            List of integers representing the joint types of the robot joints followed by the external axes.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Converted values with a shape of ``(N, 6 + k)``.
+        """
+        factors = _to_meters_radians_factors(joint_types)
+        return self.joint_values * factors
+
+    @classmethod
+    def from_meters_radians(cls, joint_values, joint_types, time_from_start=None):
+        """Create a buffer from joint values in meters and radians.
+
+        Parameters
+        ----------
+        joint_values : array-like
+            Robot joints followed by the external axes of each point, with a shape of ``(N, 6 + k)``.
+        joint_types : :obj:`list`
+            List of integers representing the joint types of each column.
+        time_from_start : array-like
+            Time in seconds at which each point is reached. Optional.
+
+        Returns
+        -------
+        :class:`JointTrajectoryBuffer`
+        """
+        if numpy is None:
+            raise ImportError("JointTrajectoryBuffer requires NumPy")
+
+        factors = _to_meters_radians_factors(joint_types)
+        values = numpy.array(joint_values, dtype=float, ndmin=2)
+        if values.size == 0:
+            values = values.reshape(0, len(factors))
+        values = values / factors
+        return cls(values[:, :6], values[:, 6:], time_from_start)
+
+    def to_joint_trajectory_primitive(self, joint_types, joint_names=None):
+        """Convert the buffer to a :class:`compas_fab.robots.JointTrajectory`, including the unit conversion
+        from mm and degrees to meters and radians.
+
+        Parameters
+        ----------
+        joint_types : :obj:`list`
+            List of integers representing the joint types of the robot joints followed by the external axes.
+        joint_names : :obj:`list`
+            List of strings representing the joint names of the robot joints followed by the external axes. Optional.
+
+        Returns
+        -------
+        :class:`compas_fab.robots.JointTrajectory`
+        """
+        rows = self.to_meters_radians(joint_types).tolist()
+        joint_types = list(joint_types)
+
+        if self.time_from_start is None:
+            times = [None] * len(rows)
+        else:
+            times = [
+                Duration(int(secs), int(round((secs - int(secs)) * 1e9)))
+                for secs in self.time_from_start.tolist()
+            ]
+
+        points = [
+            JointTrajectoryPoint(values, joint_types, time_from_start=time_from_start)
+            for values, time_from_start in zip(rows, times)
+        ]
+        return JointTrajectory(points, list(joint_names or []))
+
+    def to_joint_trajectory(self, robot, group=None):
+        """Convert the buffer to a :class:`compas_fab.robots.JointTrajectory`, including the unit conversion
+        from mm and degrees to meters and radians.
+
+        The configurable joints of the ``group`` must be the robot joints followed by the external axes.
+
+        Parameters
+        ----------
+        robot : :class:`compas_fab.robots.Robot`
+            The robot executing the trajectory.
+        group : :obj:`str`
+            The name of the group of joints of the trajectory. Optional.
+            Defaults to the ``robot``'s main group name.
+
+        Returns
+        -------
+        :class:`compas_fab.robots.JointTrajectory`
+        """
+        joint_names, joint_types = _get_joint_metadata(robot, group)
+        return self.to_joint_trajectory_primitive(joint_types, joint_names)
+
+    @classmethod
+    def from_joint_trajectory_primitive(cls, trajectory, joint_names=None):
+        """Create a buffer from a :class:`compas_fab.robots.JointTrajectory`, including the unit
+        conversion from meters and radians to mm and degrees.
+
+        Parameters
+        ----------
+        trajectory : :class:`compas_fab.robots.JointTrajectory`
+            The trajectory from which to create the buffer.
+        joint_names : :obj:`list`
+            An optional list of joint names of the ``trajectory`` whose corresponding values will fill
+            the robot joints, followed by the external axes. Defaults to all the joints of the trajectory.
+
+        Returns
+        -------
+        :class:`JointTrajectoryBuffer`
+        """
+        if numpy is None:
+            raise ImportError("JointTrajectoryBuffer requires NumPy")
+
+        points = trajectory.points
+        if not points:
+            return cls(numpy.zeros((0, 6)))
+
+        joint_types = points[0].joint_types
+        joint_values = numpy.array(
+            [point.joint_values for point in points], dtype=float
+        )
+        time_from_start = [point.time_from_start.seconds for point in points]
+
+        if joint_names:
+            indices = [trajectory.joint_names.index(name) for name in joint_names]
+            joint_types = [joint_types[index] for index in indices]
+            joint_values = joint_values[:, indices]
+
+        return cls.from_meters_radians(joint_values, joint_types, time_from_start)
+
+    @classmethod
+    def from_joint_trajectory(cls, trajectory, robot=None, group=None):
+        """Create a buffer from a :class:`compas_fab.robots.JointTrajectory`, including the unit
+        conversion from meters and radians to mm and degrees.
+
+        Parameters
+        ----------
+        trajectory : :class:`compas_fab.robots.JointTrajectory`
+            The trajectory from which to create the buffer.
+        robot : :class:`compas_fab.robots.Robot`
+            The robot executing the trajectory. Optional.
+        group : :obj:`str`
+            The name of the group of joints whose values fill the robot joints, followed by the external axes. Optional.
+            Defaults to the ``robot``'s main group name.
+
+        Returns
+        -------
+        :class:`JointTrajectoryBuffer`
+        """
+        joint_names = _get_joint_metadata(robot, group)[0] if robot else []
+        return cls.from_joint_trajectory_primitive(trajectory, joint_names)
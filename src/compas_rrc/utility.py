@@ -20,6 +20,7 @@ __all__ = [
     "WaitTime",
     "SetWorkObject",
     "Debug",
+    "RawRobtarget",
 ]
 
 
@@ -28,6 +29,51 @@ def is_rapid_none(val):
     return int(val) == 8999999488
 
 
+def _parse_external_axes(values):
+    return tuple(value for value in values if not is_rapid_none(value))
+
+
+class RawRobtarget(object):
+    """Lightweight robtarget returned by :class:`GetRobtarget` and :class:`GetFrame` in raw mode.
+
+    Holds the plain position, quaternion and external axes values, and only
+    creates a :class:`compas.geometry.Frame` when :attr:`frame` is accessed.
+    """
+
+    __slots__ = ("position", "quaternion", "external_axes", "_frame")
+
+    def __init__(self, position, quaternion, external_axes):
+        """Create a new robtarget.
+
+        Parameters
+        ----------
+        position : :obj:`tuple` of :obj:`float`
+            Position ``(x, y, z)`` in mm.
+        quaternion : :obj:`tuple` of :obj:`float`
+            Orientation as ``(w, x, y, z)`` quaternion.
+        external_axes : :obj:`tuple` of :obj:`float`
+            Positions of the external axes.
+        """
+        self.position = position
+        self.quaternion = quaternion
+        self.external_axes = external_axes
+        self._frame = None
+
+    def __repr__(self):
+        return "RawRobtarget({!r}, {!r}, {!r})".format(
+            self.position, self.quaternion, self.external_axes
+        )
+
+    @property
+    def frame(self):
+        """Robtarget as a :class:`compas.geometry.Frame`, created on first access."""
+        if self._frame is None:
+            self._frame = Frame.from_quaternion(
+                list(self.quaternion), point=list(self.position)
+            )
+        return self._frame
+
+
 class Noop(ROSmsg):
     """No-op is a call without any effect. But like all other instructions it makes a roundtrip from the user code to the robot and back.
 
@@ -146,19 +192,37 @@ class GetJoints(ROSmsg):
         # Get joints
         robot_joints, external_axes = abb.send_and_wait(rrc.GetJoints())
 
+        # Get joints as plain tuples of floats, e.g. when polling at high rate
+        robot_joints, external_axes = abb.send_and_wait(rrc.GetJoints(raw=True))
+
     RAPID Instruction: ``CJointT``
 
     .. include:: ../abb-reference.rst
 
     """
 
-    def __init__(self):
-        """Create a new instance of the instruction."""
+    def __init__(self, raw=False):
+        """Create a new instance of the instruction.
+
+        Parameters
+        ----------
+        raw : :obj:`bool`
+            If ``True``, the feedback is parsed as tuples of floats instead of
+            :class:`RobotJoints` and :class:`ExternalAxes`. Defaults to ``False``.
+        """
         self.instruction = INSTRUCTION_PREFIX + "GetJoints"
         self.feedback_level = FeedbackLevel.DONE
         self.exec_level = ExecutionLevel.ROBOT
         self.string_values = []
         self.float_values = []
+        self.raw = raw
+
+    @property
+    def msg(self):
+        """Raw message."""
+        msg = super(GetJoints, self).msg
+        del msg["raw"]
+        return msg
 
     def parse_feedback(self, result):
         """Parses the result as :class:`RobotJoints` and :class:`ExternalAxes`.
@@ -166,8 +230,13 @@ class GetJoints(ROSmsg):
         Return
         ------
         :class:`RobotJoints`, :class:`ExternalAxes`
-            Current joints and external axes of the robot.
+            Current joints and external axes of the robot,
+            or tuples of floats in raw mode.
         """
+        if self.raw:
+            values = result["float_values"]
+            return tuple(values[0:6]), _parse_external_axes(values[6:12])
+
         # read robot joints
         robot_joints = [result["float_values"][i] for i in range(0, 6)]
 
@@ -193,19 +262,38 @@ class GetRobtarget(ROSmsg):
         # Get frame and external axes
         frame, external_axes = abb.send_and_wait(rrc.GetRobtarget())
 
+        # Get plain values, and only create the frame when needed
+        robtarget = abb.send_and_wait(rrc.GetRobtarget(raw=True))
+        print(robtarget.position, robtarget.quaternion, robtarget.external_axes)
+
     RAPID Instruction: ``CRobT``
 
     .. include:: ../abb-reference.rst
 
     """
 
-    def __init__(self):
-        """Create a new instance of the instruction."""
+    def __init__(self, raw=False):
+        """Create a new instance of the instruction.
+
+        Parameters
+        ----------
+        raw : :obj:`bool`
+            If ``True``, the feedback is parsed as a :class:`RawRobtarget` that only
+            creates a :class:`compas.geometry.Frame` when needed. Defaults to ``False``.
+        """
         self.instruction = INSTRUCTION_PREFIX + "GetRobtarget"
         self.feedback_level = FeedbackLevel.DONE
         self.exec_level = ExecutionLevel.ROBOT
         self.string_values = []
         self.float_values = []
+        self.raw = raw
+
+    @property
+    def msg(self):
+        """Raw message."""
+        msg = super(GetRobtarget, self).msg
+        del msg["raw"]
+        return msg
 
     def parse_feedback(self, result):
         """Parses the result as a :class:`compas.geometry.Frame` and :class:`ExternalAxes`.
@@ -213,8 +301,16 @@ class GetRobtarget(ROSmsg):
         Return
         ------
         :class:`compas.geometry.Frame`, :class:`ExternalAxes`
-            Current frame and external axes of the robot.
+            Current frame and external axes of the robot,
+            or a :class:`RawRobtarget` in raw mode.
         """
+        if self.raw:
+            values = result["float_values"]
+            return RawRobtarget(
+                tuple(values[0:3]),
+                tuple(values[3:7]),
+                _parse_external_axes(values[7:13]),
+            )
 
         # read pos
         x = result["float_values"][0]
@@ -255,6 +351,10 @@ class GetFrame(GetRobtarget):
         # Get frame
         frame = abb.send_and_wait(rrc.GetFrame())
 
+        # Get plain values, and only create the frame when needed
+        robtarget = abb.send_and_wait(rrc.GetFrame(raw=True))
+        print(robtarget.position, robtarget.quaternion)
+
     RAPID Instruction: ``CRobT``
 
     .. include:: ../abb-reference.rst
@@ -267,8 +367,11 @@ class GetFrame(GetRobtarget):
         Return
         ------
         :class:`compas.geometry.Frame`
-            Current frame of the robot.
+            Current frame of the robot, or a :class:`RawRobtarget` in raw mode.
         """
+        if self.raw:
+            return super(GetFrame, self).parse_feedback(result)
+
         frame, _ext_axes = super(GetFrame, self).parse_feedback(result)
         return frame
 
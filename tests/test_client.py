@@ -1,7 +1,36 @@
 import threading
 import time
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+import pytest
+
+from compas_rrc.client import AbbClient
+from compas_rrc.client import AsyncAbbClient
+from compas_rrc.client import AsyncFutureResult
+from compas_rrc.client import FeedbackDispatcher
+from compas_rrc.client import FlowControl
+from compas_rrc.client import PendingRequests
 from compas_rrc.client import SequenceCounter
+from compas_rrc.client import SequencePartition
+from compas_rrc.client import StateCache
+from compas_rrc.client import Subscription
+from compas_rrc.client import _Outgoing
+from compas_rrc.common import CLIENT_PROTOCOL_VERSION
+from compas_rrc.common import DeliveryPolicy
+from compas_rrc.common import FeedbackLevel
+from compas_rrc.common import FutureResult
+from compas_rrc.common import InstructionException
+from compas_rrc.common import TimeoutException
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+from compas_rrc.io import SetDigital
+from compas_rrc.msg import PrintText
+from compas_rrc.utility import GetJoints
+from compas_rrc.utility import Noop
 
 
 def test_sequence_id_rollover():
@@ -47,3 +76,643 @@ def test_multithreaded_consistency():
         t.join()
 
     assert counter.value == nr_of_threads * nr_of_increments
+
+
+def test_sequence_id_allocate():
+    counter = SequenceCounter()
+    assert counter.allocate(3) == [1, 2, 3]
+    assert counter.value == 3
+
+    counter = SequenceCounter(start=SequenceCounter.ROLLOVER_THRESHOLD - 2)
+    assert counter.allocate(2) == [999999, 1000000]
+    assert counter.allocate(3) == [1, 2, 3]
+
+    counter = SequenceCounter(start=SequenceCounter.ROLLOVER_THRESHOLD - 1)
+    assert counter.allocate(2) == [1, 2]
+
+
+def test_sequence_partition():
+    first = SequencePartition(0, 4)
+    last = SequencePartition(3, 4)
+    assert (first.first, first.last) == (1, 250000)
+    assert (last.first, last.last) == (750001, 1000000)
+    assert 250000 in first and 250001 not in first
+
+    counter = last.create_counter()
+    assert counter.allocate(2) == [750001, 750002]
+    counter = SequenceCounter(start=999999, first=last.first, last=last.last)
+    assert counter.increment() == 1000000
+    assert counter.increment() == 750001
+    assert counter.allocate(3) == [750002, 750003, 750004]
+
+    with pytest.raises(ValueError):
+        SequencePartition(4, 4)
+
+    # Never more ids than the range of the partition
+    with pytest.raises(ValueError):
+        SequencePartition(0, 1000).create_counter().allocate(1001)
+
+
+def test_send_many_larger_than_partition():
+    ros = StubRos()
+    partition = SequencePartition(0, 1000)
+    abb = AbbClient(ros, "/rob1", partition=partition)
+
+    abb.send_many([Noop() for _ in range(2500)])
+    sequence_ids = [m["sequence_id"] for m in ros.published()]
+    assert len(sequence_ids) == 2500
+    assert all(sequence_id in partition for sequence_id in sequence_ids)
+
+
+class StubRos(object):
+    """Minimal stand-in for a connected :class:`roslibpy.Ros` instance."""
+
+    def __init__(self):
+        self.sent = []
+        self._id_counter = 0
+
+    @property
+    def id_counter(self):
+        self._id_counter += 1
+        return self._id_counter
+
+    def on_ready(self, callback, run_in_thread=True):
+        callback()
+
+    def on(self, event_name, callback):
+        pass
+
+    def off(self, event_name, callback=None):
+        pass
+
+    def send_on_ready(self, message):
+        self.sent.append(message)
+
+    def call_sync_service(self, message, timeout):
+        return {"result": {"value": str(CLIENT_PROTOCOL_VERSION)}}
+
+    def call_async_service(self, message, callback, errback):
+        callback(self.call_sync_service(message, None)["result"])
+
+    def published(self):
+        return [m["msg"] for m in self.sent if m["op"] == "publish"]
+
+
+def test_send_many():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+
+    results = abb.send_many(
+        [Noop(), Noop(feedback_level=FeedbackLevel.DONE), PrintText("Hello")]
+    )
+    assert results[0] is None
+    assert results[2] is None
+    assert [m["sequence_id"] for m in ros.published()] == [1, 2, 3]
+    assert abb.futures.keys() == [2]
+
+    abb.feedback_callback(dict(feedback_id=2, feedback="Done"))
+    assert results[1].result(timeout=0) == "Done"
+    assert not abb.futures
+
+
+def test_send_multiple_producers():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+    start = threading.Event()
+
+    def produce(producer):
+        start.wait()
+        for i in range(200):
+            abb.send(PrintText("{} {}".format(producer, i)))
+
+    threads = [threading.Thread(target=produce, args=(p,)) for p in range(4)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+
+    published = ros.published()
+    # Sequence ids follow the order of publication
+    assert [m["sequence_id"] for m in published] == list(range(1, 801))
+
+    # And every producer's instructions keep their order
+    for producer in range(4):
+        indices = [
+            int(m["string_values"][0].split()[1])
+            for m in published
+            if m["string_values"][0].startswith("{} ".format(producer))
+        ]
+        assert indices == list(range(200))
+
+
+def test_send_multiple_producers_publish_error():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+    abb.ensure_protocol_version()
+
+    def publish(message):
+        raise OSError("Publish failed")
+
+    abb.topic.publish = publish
+    errors = []
+
+    def produce():
+        try:
+            abb.send(Noop(feedback_level=FeedbackLevel.DONE))
+            abb.send(Noop())
+        except OSError as error:
+            errors.append(error)
+
+    # Both producers queue their entries before either publishes
+    with abb._publish_lock:
+        threads = [threading.Thread(target=produce) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while len(abb._outbox) < 2:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 2
+    assert not abb.futures
+
+
+def test_batch():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+
+    with abb.batch():
+        first = abb.send(Noop())
+        second = abb.send(Noop(feedback_level=FeedbackLevel.DONE))
+        assert first is None
+        assert not ros.published()
+
+    assert [m["sequence_id"] for m in ros.published()] == [1, 2]
+    abb.feedback_callback(dict(feedback_id=2, feedback="Done"))
+    assert second.result(timeout=0) == "Done"
+
+
+def test_batch_discarded_on_error():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+
+    with pytest.raises(ValueError):
+        with abb.batch():
+            first = abb.send(Noop(feedback_level=FeedbackLevel.DONE))
+            abb.send(Noop())
+            raise ValueError("Invalid point")
+
+    assert not ros.published()
+    with pytest.raises(ValueError):
+        first.result(timeout=0)
+
+    # The client is usable again after the failed batch
+    abb.send(Noop())
+    assert [m["sequence_id"] for m in ros.published()] == [1]
+
+
+def test_batch_flushes_before_wait():
+    ros = StubRos()
+    abb = AbbClient(ros, "/rob1")
+
+    with abb.batch():
+        abb.send(Noop())
+        try:
+            abb.send_and_wait(Noop(), timeout=0)
+        except TimeoutException:
+            pass
+        assert [m["sequence_id"] for m in ros.published()] == [1, 2]
+        abb.send(Noop())
+
+    assert [m["sequence_id"] for m in ros.published()] == [1, 2, 3]
+
+
+def test_async_client():
+    if asyncio is None:
+        return
+
+    loop = asyncio.new_event_loop()
+    try:
+        abb = AsyncAbbClient(StubRos(), "/rob1", loop=loop)
+
+        no_feedback = abb.send(Noop())
+        waiting = abb.send_and_wait(Noop())
+        timing_out = abb.send_and_wait(Noop(), timeout=0.01)
+        failing = abb.send_and_wait(Noop())
+
+        loop.call_soon(abb.feedback_callback, dict(feedback_id=2, feedback="Done"))
+        loop.call_soon(
+            abb.feedback_callback, dict(feedback_id=4, feedback="Done FError 42")
+        )
+
+        results = loop.run_until_complete(
+            asyncio.gather(
+                no_feedback, waiting, timing_out, failing, return_exceptions=True
+            )
+        )
+    finally:
+        loop.close()
+
+    assert results[0] is None
+    assert results[1] == "Done"
+    assert isinstance(results[2], TimeoutException)
+    assert isinstance(results[3], InstructionException)
+
+
+def test_async_publish_error():
+    if asyncio is None:
+        return
+
+    loop = asyncio.new_event_loop()
+    try:
+        abb = AsyncAbbClient(StubRos(), "/rob1", loop=loop)
+
+        def publish(message):
+            raise ValueError("Publish failed")
+
+        abb.topic.publish = publish
+
+        # Queued by another producer, and published in the same batch
+        other = AsyncFutureResult(loop)
+        abb._outbox.append(
+            _Outgoing([(Noop(feedback_level=FeedbackLevel.DONE), other)])
+        )
+
+        with pytest.raises(ValueError):
+            abb.send(Noop(feedback_level=FeedbackLevel.DONE))
+
+        with pytest.raises(ValueError):
+            loop.run_until_complete(abb._wait_for(other, timeout=1))
+    finally:
+        loop.close()
+
+
+def test_async_read():
+    if asyncio is None:
+        return
+
+    ros = FakeRos(FakeDriver(processing_time=0.05))
+    ros.run()
+    loop = asyncio.new_event_loop()
+    try:
+        abb = AsyncAbbClient(ros, "/rob1", loop=loop, state_cache=StateCache(ttl=60))
+        robot = ros.driver.robots["/rob1"]
+
+        results = loop.run_until_complete(
+            asyncio.gather(*[abb.read(GetJoints(), timeout=5) for _ in range(3)])
+        )
+        assert robot.executed == 1
+        assert len(results) == 3
+
+        # Options of AbbClient are forwarded, e.g. the ttl of the state cache
+        loop.run_until_complete(abb.read(GetJoints(), timeout=5))
+        assert robot.executed == 1
+    finally:
+        loop.close()
+        ros.terminate()
+
+
+def test_async_subscription():
+    if asyncio is None:
+        return
+
+    loop = asyncio.new_event_loop()
+    try:
+        abb = AsyncAbbClient(StubRos(), "/rob1", loop=loop)
+        subscription = abb.send_and_subscribe(Noop())
+        for value in ("a", "b"):
+            abb.feedback_callback(dict(feedback_id=1, feedback=value))
+
+        iterator = subscription.__aiter__()
+        first = loop.run_until_complete(iterator.__anext__())
+        second = loop.run_until_complete(iterator.__anext__())
+
+        subscription.unsubscribe()
+        try:
+            loop.run_until_complete(iterator.__anext__())
+            assert False, "Expected StopAsyncIteration"
+        except StopAsyncIteration:
+            pass
+    finally:
+        loop.close()
+
+    assert (first, second) == ("a", "b")
+
+
+def test_flow_control_checkpoints():
+    ros = StubRos()
+    abb = AbbClient(
+        ros, "/rob1", flow_control=FlowControl(max_in_flight=4, ack_interval=2)
+    )
+
+    results = abb.send_many([Noop() for _ in range(4)])
+    assert results == [None] * 4
+    assert [m["feedback_level"] for m in ros.published()] == [0, 1, 0, 1]
+    assert abb.flow_control.in_flight == 4
+
+    abb.feedback_callback(dict(feedback_id=2, feedback="Done"))
+    assert abb.flow_control.in_flight == 2
+    assert abb.futures.keys() == [4]
+
+
+def test_flow_control_back_pressure():
+    ros = StubRos()
+    abb = AbbClient(
+        ros, "/rob1", flow_control=FlowControl(max_in_flight=2, ack_interval=2)
+    )
+
+    abb.send_many([Noop(), Noop()])
+
+    sender = threading.Thread(target=abb.send, args=(Noop(),))
+    sender.start()
+    time.sleep(0.05)
+    assert len(ros.published()) == 2
+
+    abb.feedback_callback(dict(feedback_id=2, feedback="Done"))
+    sender.join(1)
+    assert len(ros.published()) == 3
+
+
+def test_flow_control_timeout():
+    ros = StubRos()
+    abb = AbbClient(
+        ros, "/rob1", flow_control=FlowControl(max_in_flight=1, timeout=0.01)
+    )
+    abb.send(Noop())
+
+    try:
+        abb.send(Noop())
+        assert False, "Expected TimeoutException"
+    except TimeoutException:
+        pass
+
+
+def test_pending_requests_expire():
+    pending = PendingRequests(timeout=0.01)
+    future = FutureResult()
+    pending.add(1, dict(result=future, parser=None))
+    pending.add(2, dict(callback=lambda value: None, parser=None))
+
+    try:
+        future.result(timeout=1)
+        assert False, "Expected TimeoutException"
+    except TimeoutException:
+        pass
+    assert pending.keys() == [2]
+
+
+def test_pending_requests_reused_sequence_id():
+    pending = PendingRequests()
+    stale = FutureResult()
+    pending.add(1, dict(result=stale, parser=None))
+    stale_generation = pending.get(1)["generation"]
+
+    fresh = FutureResult()
+    pending.add(1, dict(result=fresh, parser=None))
+
+    assert stale.done
+    assert not fresh.done
+    assert pending.pop(1, stale_generation) is None
+    assert pending.pop(1)["result"] is fresh
+
+
+def test_pending_requests_max_size():
+    pending = PendingRequests(max_size=2)
+    futures = [FutureResult() for _ in range(3)]
+    for sequence_id, future in enumerate(futures):
+        pending.add(sequence_id, dict(result=future, parser=None))
+
+    assert pending.keys() == [1, 2]
+    assert futures[0].done
+    assert len(pending) == 2
+
+    # Subscriptions are never evicted, even if they are the oldest entries
+    pending = PendingRequests(max_size=2)
+    subscription = Subscription(None, None, None)
+    pending.add(0, dict(subscription=subscription))
+    for sequence_id, future in enumerate(futures, 1):
+        pending.add(sequence_id, dict(result=future, parser=None))
+
+    assert pending.keys() == [0, 3]
+    assert subscription.active
+
+
+def test_pending_requests_memory():
+    pending = PendingRequests(timeout=600)
+    for sequence_id in range(100000):
+        pending.add(sequence_id, dict(result=FutureResult(), parser=None))
+        pending.pop(sequence_id)
+
+    assert len(pending) == 0
+    assert len(pending._deadlines) <= 64
+
+
+def test_dispatcher_delivers_off_thread():
+    dispatcher = FeedbackDispatcher(max_workers=2)
+    abb = AbbClient(StubRos(), "/rob1", dispatcher=dispatcher)
+
+    received = []
+    threads = set()
+
+    def callback(value):
+        time.sleep(0.01)
+        received.append(value)
+        threads.add(threading.current_thread())
+
+    abb.send_and_subscribe(Noop(), callback)
+    future = abb.send(Noop(feedback_level=FeedbackLevel.DONE))
+    for i in range(5):
+        abb.feedback_callback(dict(feedback_id=1, feedback=str(i)))
+    abb.feedback_callback(dict(feedback_id=2, feedback="Done"))
+
+    # Results are resolved before the subscription has been fully delivered
+    assert future.result(timeout=0) == "Done"
+    assert len(received) < 5
+
+    dispatcher.shutdown()
+    assert received == ["0", "1", "2", "3", "4"]
+    assert threading.current_thread() not in threads
+
+
+def test_subscription_unsubscribe():
+    abb = AbbClient(StubRos(), "/rob1")
+    received = []
+
+    subscription = abb.send_and_subscribe(Noop(), received.append)
+    abb.feedback_callback(dict(feedback_id=1, feedback="a"))
+    subscription.unsubscribe()
+    abb.feedback_callback(dict(feedback_id=1, feedback="b"))
+
+    assert received == ["a"]
+    assert not abb.futures
+
+
+def test_subscription_latest():
+    dispatcher = FeedbackDispatcher()
+    abb = AbbClient(StubRos(), "/rob1", dispatcher=dispatcher)
+    received = []
+    blocker = threading.Event()
+
+    def callback(value):
+        blocker.wait(1)
+        received.append(value)
+
+    abb.send_and_subscribe(Noop(), callback, policy=DeliveryPolicy.LATEST)
+    abb.feedback_callback(dict(feedback_id=1, feedback="0"))
+    time.sleep(0.05)
+    for i in range(1, 10):
+        abb.feedback_callback(dict(feedback_id=1, feedback=str(i)))
+    blocker.set()
+
+    dispatcher.shutdown()
+    assert received == ["0", "9"]
+
+
+def test_subscription_rate():
+    abb = AbbClient(StubRos(), "/rob1")
+    received = []
+
+    abb.send_and_subscribe(
+        Noop(), received.append, policy=DeliveryPolicy.RATE, interval=60
+    )
+    for i in range(10):
+        abb.feedback_callback(dict(feedback_id=1, feedback=str(i)))
+
+    assert received == ["0"]
+
+
+def test_state_cache_single_flight():
+    ros = FakeRos(FakeDriver(processing_time=0.05))
+    ros.run()
+    try:
+        abb = AbbClient(ros, "/rob1")
+        robot = ros.driver.robots["/rob1"]
+        results = []
+
+        def reader():
+            results.append(abb.read(GetJoints(), timeout=5))
+
+        threads = [threading.Thread(target=reader) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert robot.executed == 1
+        assert len(results) == 5
+        assert len(set(id(robot_joints) for robot_joints, _ in results)) == 5
+
+        # Without a ttl, later reads are sent again
+        abb.read(GetJoints(), timeout=5)
+        assert robot.executed == 2
+    finally:
+        ros.terminate()
+
+
+def test_state_cache_ttl_invalidation():
+    ros = FakeRos(FakeDriver())
+    ros.run()
+    try:
+        abb = AbbClient(ros, "/rob1", state_cache=StateCache(ttl=60))
+        robot = ros.driver.robots["/rob1"]
+
+        abb.read(GetJoints(), timeout=5)
+        abb.read(GetJoints(raw=True), timeout=5)
+        assert robot.executed == 1
+
+        # Reads do not invalidate the cache
+        abb.send_and_wait(Noop(), timeout=5)
+        abb.read(GetJoints(), timeout=5)
+        assert robot.executed == 2
+
+        abb.send(SetDigital("do_1", 1))
+        abb.read(GetJoints(), timeout=5)
+        assert robot.executed == 4
+    finally:
+        ros.terminate()
+
+
+def test_connect():
+    ros = FakeRos(FakeDriver(namespaces=["/rob1", "/rob2"]))
+    ros.run()
+    try:
+        clients = [AbbClient(ros, namespace) for namespace in ["/rob1", "/rob2"]]
+        for abb in clients:
+            abb.connect(timeout=5)
+        assert clients[0].send_and_wait(Noop(), timeout=5) == "Done"
+    finally:
+        ros.terminate()
+
+
+def test_connect_wrong_namespace_fails_fast():
+    ros = FakeRos(FakeDriver(namespaces=["/rob1", "/rob2"]))
+    ros.run()
+    try:
+        calls = []
+        get_params = ros.get_params
+
+        def counting_get_params(callback=None, errback=None):
+            calls.append(1)
+            return get_params(callback, errback)
+
+        ros.get_params = counting_get_params
+
+        clients = [AbbClient(ros, "/rob3"), AbbClient(ros, "/rob4")]
+        start = time.time()
+        for abb in clients:
+            with pytest.raises(Exception) as error:
+                abb.connect(timeout=5)
+            assert "Detected namespaces=['/rob1', '/rob2']" in str(error.value)
+        assert time.time() - start < 1
+        # The parameter listing is fetched once per connection
+        assert len(calls) == 1
+    finally:
+        ros.terminate()
+
+
+def test_connect_protocol_mismatch():
+    ros = FakeRos(FakeDriver(protocol_version=CLIENT_PROTOCOL_VERSION - 1))
+    ros.run()
+    try:
+        with pytest.raises(Exception, match="Protocol version mismatch"):
+            AbbClient(ros, "/rob1").connect(timeout=5)
+    finally:
+        ros.terminate()
+
+
+def test_partitioned_clients():
+    ros = FakeRos()
+    ros.run()
+    try:
+        clients = [
+            AbbClient(ros, "/rob1", partition=SequencePartition(i, 2)) for i in range(2)
+        ]
+        results = [abb.send(GetJoints()) for abb in clients for _ in range(5)]
+        for future in results:
+            robot_joints, _ = future.result(timeout=5)
+            assert len(robot_joints) == 6
+
+        # Feedback of the other partition is ignored
+        future = FutureResult()
+        clients[1].futures.add(1, dict(result=future, parser=None))
+        clients[1].feedback_callback(dict(feedback_id=1, feedback="Done"))
+        assert not future.done
+    finally:
+        ros.terminate()
+
+
+def test_sequence_partition_claim():
+    ros = FakeRos()
+    ros.run()
+    try:
+        first = SequencePartition.claim(ros, "/rob1", 2, settle_time=0)
+        second = SequencePartition.claim(ros, "/rob1", 2, settle_time=0)
+        assert (first.index, second.index) == (0, 1)
+        with pytest.raises(Exception):
+            SequencePartition.claim(ros, "/rob1", 2, settle_time=0)
+
+        first.release()
+        assert SequencePartition.claim(ros, "/rob1", 2, settle_time=0).index == 0
+    finally:
+        ros.terminate()
@@ -1,4 +1,8 @@
+import copy
 import math
+import threading
+
+import pytest
 
 from compas.geometry import allclose
 from compas_robots import Configuration
@@ -121,3 +125,137 @@ def test_external_axes():
     config = j.to_configuration_primitive([0, 0, 0])
     new_j = rrc.ExternalAxes.from_configuration_primitive(config)
     assert allclose(j.values, new_j.values)
+
+
+def test_compact_robot_joints():
+    j = rrc.CompactRobotJoints()
+    assert list(j) == [0.0] * 6
+
+    j = rrc.CompactRobotJoints([30, 10, 0])
+    assert list(j) == [30, 10, 0, 0, 0, 0]
+    assert j[6] is None
+    assert not hasattr(j, "__dict__")
+
+    j.rax_1 += 15
+    assert j.rax_1 == 45
+    assert memoryview(j).tolist() == [45, 10, 0, 0, 0, 0]
+
+    c = j.to_configuration_primitive([0, 0, 0, 0, 0, 0])
+    new_j = rrc.CompactRobotJoints.from_configuration_primitive(c)
+    assert isinstance(new_j, rrc.CompactRobotJoints)
+    assert allclose(j.values, new_j.values)
+    assert repr(new_j) == "CompactRobotJoints([45.0, 10.0, 0.0, 0.0, 0.0, 0.0])"
+
+    with pytest.raises(ValueError):
+        rrc.CompactRobotJoints(range(7))
+
+    # Always 6 joints
+    j.values = [1, 2]
+    assert list(j) == [1, 2, 0, 0, 0, 0]
+    j[:2] = [3, 4]
+    assert list(j) == [3, 4, 0, 0, 0, 0]
+    for resize in (
+        lambda: j.append(7),
+        lambda: j.extend([7]),
+        lambda: j.insert(0, 7),
+        lambda: j.pop(),
+        lambda: j.__delitem__(0),
+        lambda: j.__setitem__(slice(0, 2), [1]),
+    ):
+        with pytest.raises(TypeError):
+            resize()
+    assert len(j) == 6
+    with pytest.raises(ValueError):
+        j.values = range(7)
+
+
+def test_compact_external_axes():
+    ea = rrc.CompactExternalAxes()
+    assert list(ea) == []
+
+    ea = rrc.CompactExternalAxes(1000, 90)
+    ea.eax_b = 45
+    assert list(ea) == [1000, 45]
+    assert ea.eax_c is None
+
+    c = ea.to_configuration_primitive([2, 0])
+    assert c.joint_values == [1.0, math.pi / 4]
+    assert list(copy.deepcopy(ea)) == [1000, 45]
+    assert isinstance(copy.copy(ea), rrc.CompactExternalAxes)
+
+    with pytest.raises(ValueError):
+        rrc.CompactExternalAxes(range(7))
+
+    ea = rrc.CompactExternalAxes(range(6))
+    with pytest.raises(TypeError):
+        ea.extend([7])
+    with pytest.raises(ValueError):
+        ea.values = range(7)
+    ea.values = [1, 2]
+    assert list(ea) == [1, 2]
+
+
+def _complete_later(future, value, delay=0.01):
+    timer = threading.Timer(delay, future._set_result, args=(value,))
+    timer.start()
+    return timer
+
+
+def test_future_done_callbacks():
+    future = rrc.FutureResult()
+    called = []
+    future.add_done_callback(called.append)
+    assert called == []
+
+    future._set_result("Done")
+    assert called == [future]
+
+    future.add_done_callback(called.append)
+    assert called == [future, future]
+
+
+def test_wait():
+    first, second = rrc.FutureResult(), rrc.FutureResult()
+    _complete_later(first, "Done")
+
+    done, not_done = rrc.wait(
+        [first, second, None], return_when=rrc.ReturnWhen.FIRST_COMPLETED
+    )
+    assert done == {first}
+    assert not_done == {second}
+    assert not second._callbacks
+
+    done, not_done = rrc.wait([first, second], timeout=0.01)
+    assert not_done == {second}
+
+    _complete_later(second, rrc.TimeoutException("Failed"))
+    done, not_done = rrc.wait([first, second])
+    assert done == {first, second}
+
+
+def test_gather():
+    futures = [rrc.FutureResult() for _ in range(3)]
+    for i, future in enumerate(futures):
+        _complete_later(future, i, delay=0.01 * (3 - i))
+
+    assert rrc.gather(futures + [None], timeout=1) == [0, 1, 2, None]
+
+    failing = rrc.FutureResult()
+    _complete_later(failing, rrc.InstructionException("Failed", {}))
+    with pytest.raises(rrc.InstructionException):
+        rrc.gather([rrc.FutureResult(), failing], timeout=1)
+
+    with pytest.raises(rrc.TimeoutException):
+        rrc.gather([rrc.FutureResult()], timeout=0.01)
+
+
+def test_as_completed():
+    futures = [rrc.FutureResult() for _ in range(3)]
+    for i, future in enumerate(futures):
+        _complete_later(future, i, delay=0.02 * (3 - i))
+
+    completed = [future.result() for future in rrc.as_completed(futures, timeout=1)]
+    assert completed == [2, 1, 0]
+
+    with pytest.raises(rrc.TimeoutException):
+        list(rrc.as_completed([rrc.FutureResult()], timeout=0.01))
@@ -0,0 +1,190 @@
+import threading
+import time
+
+import pytest
+
+import compas_rrc as rrc
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+
+
+@pytest.fixture
+def ros():
+    ros = FakeRos(FakeDriver(namespaces=["/rob1", "/rob2"]))
+    ros.run()
+    yield ros
+    ros.terminate()
+
+
+def test_roundtrip(ros):
+    abb = rrc.AbbClient(ros, "/rob1")
+
+    assert abb.send_and_wait(rrc.Noop(), timeout=1) == "Done"
+
+
+def test_unknown_instruction(ros):
+    abb = rrc.AbbClient(ros, "/rob1")
+
+    with pytest.raises(rrc.InstructionException):
+        abb.send_and_wait(rrc.CustomInstruction("r_RRC_Unknown"), timeout=1)
+
+
+def test_robot_state(ros):
+    abb = rrc.AbbClient(ros, "/rob2")
+
+    abb.send(rrc.MoveToJoints([30, 10, 0, 0, 0, 0], [100], 100, rrc.Zone.FINE))
+    abb.send(rrc.SetDigital("do_1", 1))
+    robot_joints, external_axes = abb.send_and_wait(rrc.GetJoints(), timeout=1)
+
+    assert list(robot_joints) == [30, 10, 0, 0, 0, 0]
+    assert list(external_axes) == [100, 0, 0, 0, 0, 0]
+    assert abb.send_and_wait(rrc.ReadDigital("do_1"), timeout=1) == 1
+    assert ros.driver.robots["/rob1"].executed == 0
+
+
+def test_custom_handler(ros):
+    ros.driver.add_handler(
+        "r_Stream", lambda robot, message: [dict(float_values=[i]) for i in range(3)]
+    )
+    abb = rrc.AbbClient(ros, "/rob1")
+
+    received = []
+    abb.send_and_subscribe(
+        rrc.Debug(
+            rrc.CustomInstruction("r_Stream", feedback_level=rrc.FeedbackLevel.DONE)
+        ),
+        lambda result: received.append(result["float_values"][0]),
+    )
+    abb.send_and_wait(rrc.Noop(), timeout=1)
+
+    assert received == [0, 1, 2]
+
+
+def test_wrong_namespace():
+    ros = FakeRos()
+    abb = rrc.AbbClient(ros, "/rob3")
+    with pytest.raises(Exception):
+        abb.version_check()
+    ros.terminate()
+
+
+def test_joint_state_mirror(ros):
+    mirror = rrc.JointStateMirror()
+    abb = rrc.AbbClient(ros, "/rob1", joint_states=mirror)
+    assert mirror.latest is None
+    assert mirror.age is None
+
+    abb.send(rrc.MoveToJoints([90, 45, 0, 0, 0, 0], [], 100, rrc.Zone.FINE))
+    state = mirror.wait(timeout=1)
+
+    assert state is mirror.latest
+    assert list(state.robot_joints) == pytest.approx([90, 45, 0, 0, 0, 0])
+    assert state.names[0] == "joint_1"
+    assert mirror.age >= 0
+
+    with pytest.raises(rrc.TimeoutException):
+        mirror.wait(timeout=0.05)
+
+    ros.close()
+    assert mirror.topic is None
+
+
+def test_robot_group(ros):
+    group = rrc.RobotGroup([rrc.AbbClient(ros, "/rob1"), rrc.AbbClient(ros, "/rob2")])
+    group.connect(timeout=1)
+
+    assert group.send_and_wait(rrc.Noop(), timeout=1) == ["Done", "Done"]
+
+    group.send(
+        [
+            rrc.MoveToJoints([10, 0, 0, 0, 0, 0], [], 100, rrc.Zone.FINE),
+            rrc.MoveToJoints([20, 0, 0, 0, 0, 0], [], 100, rrc.Zone.FINE),
+        ]
+    )
+    group.barrier(timeout=1)
+    assert ros.driver.robots["/rob1"].joints[0] == 10
+    assert ros.driver.robots["/rob2"].joints[0] == 20
+
+    results = group.send_and_wait(rrc.GetJoints(), timeout=1)
+    assert [robot_joints.rax_1 for robot_joints, _ in results] == [10, 20]
+
+    client, value = group.send_and_wait_any(rrc.Noop(), timeout=1)
+    assert client in group
+    assert value == "Done"
+
+    with pytest.raises(ValueError):
+        group.send([rrc.Noop()])
+
+
+def test_robot_group_with_flow_control(ros):
+    clients = [
+        rrc.AbbClient(ros, namespace, flow_control=rrc.FlowControl(max_in_flight=2))
+        for namespace in ("/rob1", "/rob2")
+    ]
+    group = rrc.RobotGroup(clients)
+
+    group.send_many([[rrc.Noop()] * 10, [rrc.Noop()] * 10])
+    group.barrier(timeout=1)
+    assert ros.driver.robots["/rob2"].executed == 11
+
+
+def test_reconnection_replay():
+    ros = FakeRos(FakeDriver(processing_time=0.02))
+    ros.run()
+    try:
+        reconnection = rrc.Reconnection(rrc.ReconnectPolicy.REPLAY, delay=0)
+        with pytest.raises(ValueError):
+            rrc.AbbClient(ros, "/rob1", reconnection=reconnection)
+
+        abb = rrc.AbbClient(
+            ros, "/rob1", flow_control=rrc.FlowControl(), reconnection=reconnection
+        )
+        robot = ros.driver.robots["/rob1"]
+        abb.send_and_wait(rrc.Noop(), timeout=1)
+
+        futures = abb.send_many(
+            [rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE) for _ in range(5)]
+        )
+        ros.disconnect()
+        time.sleep(0.3)
+        assert robot.executed == 6
+        assert not any(future.done for future in futures)
+
+        # Sending waits until the connection is restored
+        late = []
+        thread = threading.Thread(
+            target=lambda: late.append(abb.send_and_wait(rrc.Noop(), timeout=5))
+        )
+        thread.start()
+        time.sleep(0.1)
+        assert not late
+
+        ros.reconnect()
+        thread.join()
+        assert late == ["Done"]
+        assert [future.result(timeout=1) for future in futures] == ["Done"] * 5
+        # The unacknowledged instructions were executed again
+        assert robot.executed == 12
+        assert reconnection.reconnections == 1
+    finally:
+        ros.terminate()
+
+
+def test_reconnection_fail():
+    ros = FakeRos(FakeDriver(processing_time=0.02))
+    ros.run()
+    try:
+        reconnection = rrc.Reconnection(timeout=0.1, delay=0)
+        abb = rrc.AbbClient(ros, "/rob1", reconnection=reconnection)
+
+        future = abb.send(rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE))
+        ros.disconnect()
+        with pytest.raises(rrc.ConnectionLostException):
+            future.result(timeout=1)
+        with pytest.raises(rrc.ConnectionLostException):
+            abb.send(rrc.Noop())
+
+        ros.reconnect()
+        assert abb.send_and_wait(rrc.Noop(), timeout=1) == "Done"
+    finally:
+        ros.terminate()
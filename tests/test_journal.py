@@ -0,0 +1,136 @@
+import compas_rrc as rrc
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+from compas_rrc.journal import SendJournal
+
+
+class Sent(object):
+    def __init__(self, sequence_id, feedback_level=0):
+        self.sequence_id = sequence_id
+        self.feedback_level = feedback_level
+
+
+class JournalClient(object):
+    def __init__(self, journal):
+        self.journal = journal
+
+    def send_many(self, instructions):
+        self.journal.record_sent(instructions)
+        return instructions
+
+
+def test_journal_records(tmp_path):
+    path = str(tmp_path / "job.journal")
+    job = [Sent(1), Sent(2, 1), Sent(3), Sent(4, 1)]
+    journal = SendJournal(path, capacity=2)
+    assert journal.resume_index == 0
+
+    # Instructions sent outside of the job are ignored
+    journal.record_sent([Sent(9, 1)])
+    journal.resume(JournalClient(journal), job)
+    journal.acknowledge(9)
+    journal.acknowledge(2)
+    journal.acknowledge(3)
+    assert journal.resume_index == 2
+    journal.close()
+
+    journal = SendJournal(path)
+    assert journal.resume_index == 2
+    assert journal.records() == [
+        ("sent", 1, 0),
+        ("sent", 2, 1),
+        ("sent", 3, 2),
+        ("sent", 4, 3),
+        ("acknowledged", 2, 1),
+    ]
+
+    # Indices continue from the resume point
+    journal.resume(JournalClient(journal), job)
+    journal.acknowledge(4)
+    assert journal.resume_index == 4
+    assert journal.records()[-3:] == [
+        ("sent", 3, 2),
+        ("sent", 4, 3),
+        ("acknowledged", 4, 3),
+    ]
+    journal.close()
+
+    journal = SendJournal(path, truncate=True)
+    assert journal.resume_index == 0
+    assert journal.records() == []
+    journal.close()
+
+
+def test_journal_resume(tmp_path):
+    path = str(tmp_path / "job.journal")
+    job = [rrc.Noop(feedback_level=i % 3 == 2) for i in range(9)]
+
+    ros = FakeRos(FakeDriver())
+    ros.run()
+    try:
+        journal = SendJournal(path)
+        abb = rrc.AbbClient(ros, "/rob1", journal=journal)
+        futures = journal.resume(abb, job[:6])
+        futures[5].result(timeout=1)
+        journal.close()
+
+        journal = SendJournal(path)
+        assert journal.resume_index == 6
+        abb = rrc.AbbClient(ros, "/rob1", journal=journal)
+        futures = journal.resume(abb, job)
+        assert len(futures) == 3
+        futures[2].result(timeout=1)
+        assert journal.resume_index == 9
+        journal.close()
+    finally:
+        ros.terminate()
+
+
+def test_journal_resume_interleaved(tmp_path):
+    path = str(tmp_path / "job.journal")
+    job = [
+        rrc.PrintText("step {}".format(i), feedback_level=rrc.FeedbackLevel.DONE)
+        for i in range(10)
+    ]
+
+    ros = FakeRos(FakeDriver())
+    ros.run()
+    try:
+        robot = ros.driver.robots["/rob1"]
+
+        journal = SendJournal(path)
+        abb = rrc.AbbClient(ros, "/rob1", journal=journal)
+        abb.send_and_wait(rrc.SetTool("tool0"), timeout=1)
+        futures = journal.resume(abb, job[:5])
+        abb.read(rrc.GetJoints(), timeout=1)
+        futures[4].result(timeout=1)
+        abb.read(rrc.GetJoints(), timeout=1)
+        journal.close()
+
+        journal = SendJournal(path)
+        assert journal.resume_index == 5
+        abb = rrc.AbbClient(ros, "/rob1", journal=journal)
+        abb.send_and_wait(rrc.SetTool("tool0"), timeout=1)
+        futures = journal.resume(abb, job)
+        futures[-1].result(timeout=1)
+        journal.close()
+
+        assert robot.printed == ["step {}".format(i) for i in range(10)]
+    finally:
+        ros.terminate()
+
+
+def test_journal_closed(tmp_path):
+    ros = FakeRos(FakeDriver())
+    ros.run()
+    try:
+        journal = SendJournal(str(tmp_path / "job.journal"))
+        abb = rrc.AbbClient(ros, "/rob1", journal=journal)
+        journal.resume(abb, [rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE)])
+        journal.close()
+
+        # The client keeps working without recording
+        assert abb.send_and_wait(rrc.Noop(), timeout=1) == "Done"
+        assert not abb.futures
+    finally:
+        ros.terminate()
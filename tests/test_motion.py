@@ -92,3 +92,69 @@ def test_move_to_robtarget_validation():
             rrc.Zone.FINE,
             rrc.Motion.JOINT,
         )
+
+
+def test_build_move_to_joints():
+    numpy = pytest.importorskip("numpy")
+
+    joints = numpy.array([[30, 90, 0, 0, 0], [10, 20, 30, 40, 50]])
+    instructions = rrc.build_move_to_joints(joints, [[100], [200]], [100, 50], -1)
+
+    assert len(instructions) == 2
+    assert (
+        instructions[0].float_values
+        == rrc.MoveToJoints(joints[0].tolist(), [100], 100, rrc.Zone.FINE).float_values
+    )
+    assert instructions[1].float_values[12:] == [50, -1]
+    assert instructions[1].instruction == "r_RRC_MoveToJoints"
+
+    with pytest.raises(ValueError):
+        rrc.build_move_to_joints(numpy.zeros((2, 7)), None, 100, rrc.Zone.FINE)
+
+    with pytest.raises(ValueError):
+        rrc.build_move_to_joints(joints, None, [100, 0], rrc.Zone.FINE)
+
+    # A single row of joints is not mistaken for six instructions of one joint
+    with pytest.raises(ValueError):
+        rrc.build_move_to_joints(joints[1], None, 100, rrc.Zone.Z5)
+
+    with pytest.raises(ValueError):
+        rrc.build_move_to_joints([[0, numpy.nan, 0]], [[numpy.inf]], 100, rrc.Zone.Z5)
+    with pytest.raises(ValueError):
+        rrc.build_move_to_joints([[0, 0, 0]], [[numpy.inf]], 100, rrc.Zone.Z5)
+
+
+def test_build_move_to_robtarget():
+    numpy = pytest.importorskip("numpy")
+
+    frame = Frame([100, 200, 300], [0, 1, 0], [1, 0, 0])
+    quaternion = [2 * value for value in frame.quaternion]
+    instructions = rrc.build_move_to_robtarget(
+        [frame.point],
+        [quaternion],
+        [[10]],
+        50,
+        rrc.Zone.Z5,
+        rrc.Motion.LINEAR,
+        rrc.FeedbackLevel.DONE,
+    )
+    expected = rrc.MoveToRobtarget(
+        frame, [10], 50, rrc.Zone.Z5, rrc.Motion.LINEAR, rrc.FeedbackLevel.DONE
+    )
+
+    assert numpy.allclose(instructions[0].float_values, expected.float_values)
+    assert instructions[0].string_values == ["L"]
+    assert instructions[0].feedback_level == rrc.FeedbackLevel.DONE
+
+    instructions = rrc.build_move_to_frame(
+        [[0, 0, 0]], [[1, 0, 0, 0]], 100, rrc.Zone.FINE
+    )
+    assert instructions[0].string_values == ["FrameJ"]
+
+    with pytest.raises(ValueError):
+        rrc.build_move_to_frame([[0, 0, 0]], [[0, 0, 0, 0]], 100, rrc.Zone.FINE)
+
+    with pytest.raises(ValueError):
+        rrc.build_move_to_frame([[0, numpy.nan, 0]], [[1, 0, 0, 0]], 100, rrc.Zone.FINE)
+    with pytest.raises(ValueError):
+        rrc.build_move_to_frame([[0, 0, 0]], [[numpy.nan, 0, 0, 0]], 100, rrc.Zone.FINE)
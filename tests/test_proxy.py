@@ -0,0 +1,147 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import compas_rrc as rrc
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+from compas_rrc.proxy import ProxyAbbClient
+from compas_rrc.proxy import ProxyClient
+from compas_rrc.proxy import ProxyServer
+from compas_rrc.proxy import _ProxyConnection
+
+
+@pytest.fixture
+def server(tmp_path):
+    ros = FakeRos(FakeDriver(namespaces=["/rob1", "/rob2"]))
+    ros.run()
+    if hasattr(socket, "AF_UNIX"):
+        address = str(tmp_path / "compas_rrc.sock")
+    else:
+        address = ("127.0.0.1", 0)
+    server = ProxyServer(ros, address)
+    server.start()
+    yield server
+    server.close()
+    ros.terminate()
+
+
+def test_proxy_roundtrip(server):
+    abb = ProxyAbbClient(ProxyClient(server.address), "/rob1")
+    abb.connect(timeout=5)
+
+    assert abb.send_and_wait(rrc.Noop(), timeout=5) == "Done"
+
+    abb.send(rrc.MoveToJoints([30, 10, 0, 0, 0, 0], [], 100, rrc.Zone.FINE))
+    robot_joints, _ = abb.send_and_wait(rrc.GetJoints(), timeout=5)
+    assert list(robot_joints) == [30, 10, 0, 0, 0, 0]
+
+    robot_joints, _ = abb.send_and_wait(rrc.GetJoints(raw=True), timeout=5)
+    assert robot_joints == (30, 10, 0, 0, 0, 0)
+
+    with pytest.raises(rrc.InstructionException):
+        abb.send_and_wait(rrc.CustomInstruction("r_Unknown"), timeout=5)
+
+
+def test_proxy_wrong_namespace(server):
+    abb = ProxyAbbClient(ProxyClient(server.address), "/rob3")
+    with pytest.raises(Exception, match="Cannot find the specified namespace"):
+        abb.connect(timeout=5)
+
+
+def test_proxy_send_error(tmp_path):
+    ros = FakeRos(FakeDriver(protocol_version=rrc.CLIENT_PROTOCOL_VERSION - 1))
+    ros.run()
+    if hasattr(socket, "AF_UNIX"):
+        address = str(tmp_path / "compas_rrc.sock")
+    else:
+        address = ("127.0.0.1", 0)
+    server = ProxyServer(ros, address)
+    server.start()
+    try:
+        abb = ProxyAbbClient(ProxyClient(server.address), "/rob1")
+        with pytest.raises(Exception, match="Protocol version mismatch"):
+            abb.send_and_wait(rrc.Noop(), timeout=5)
+    finally:
+        server.close()
+        ros.terminate()
+
+
+def test_proxy_already_running(server):
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    with pytest.raises(ValueError):
+        ProxyServer(server.ros, server.address).start()
+
+    # The running proxy keeps its socket
+    abb = ProxyAbbClient(ProxyClient(server.address), "/rob1")
+    assert abb.send_and_wait(rrc.Noop(), timeout=5) == "Done"
+
+
+def test_proxy_stalled_process(server):
+    local, remote = socket.socketpair()
+    connection = _ProxyConnection(server, local)
+    server._connections.add(connection)
+    connection.start()
+
+    # Far more than the socket buffers, never read by the process
+    frame = dict(op="feedback", id=1, message="x" * 10000)
+    start = time.time()
+    for _ in range(1000):
+        connection.reply(frame)
+    assert time.time() - start < 1
+
+    connection.close()
+    remote.close()
+
+
+def test_proxy_routes_feedback_to_owner(server):
+    proxies = [ProxyClient(server.address) for _ in range(3)]
+    clients = [ProxyAbbClient(proxy, "/rob1") for proxy in proxies]
+    results = {}
+
+    def run(index, abb):
+        futures = abb.send_many(
+            [rrc.Noop(feedback_level=rrc.FeedbackLevel.DONE) for _ in range(20)]
+        )
+        results[index] = [future.result(timeout=5) for future in futures]
+
+    threads = [threading.Thread(target=run, args=item) for item in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: ["Done"] * 20 for i in range(3)}
+    # One client on the proxy side, and every process only received its own feedback
+    assert len(server.clients) == 1
+    assert [proxy.received for proxy in proxies] == [20, 20, 20]
+
+
+def test_proxy_subscription(server):
+    server.ros.driver.add_handler(
+        "r_Stream", lambda robot, message: [dict(float_values=[i]) for i in range(3)]
+    )
+    abb = ProxyAbbClient(ProxyClient(server.address), "/rob1")
+    received = []
+    done = threading.Event()
+
+    def callback(value):
+        received.append(value)
+        if len(received) == 3:
+            done.set()
+
+    subscription = abb.send_and_subscribe(
+        rrc.CustomInstruction("r_Stream", feedback_level=rrc.FeedbackLevel.DONE),
+        callback,
+    )
+    assert done.wait(5)
+    assert len(received) == 3
+
+    subscription.unsubscribe()
+    abb.send_and_wait(rrc.Noop(), timeout=5)
+    futures = server.clients["/rob1"].futures
+    assert not any("subscription" in futures.get(key) for key in futures.keys())
@@ -0,0 +1,68 @@
+import pytest
+
+import compas_rrc as rrc
+from compas_rrc.fake import FakeDriver
+from compas_rrc.fake import FakeRos
+from compas_rrc.recording import RecordingReader
+from compas_rrc.recording import RecordingWriter
+
+
+def test_recording_roundtrip(tmp_path):
+    path = str(tmp_path / "program.rrc")
+    instructions = [
+        rrc.MoveToJoints([10, 20, 30, 40, 50, 60], [], 100, rrc.Zone.FINE),
+        rrc.PrintText("Hello"),
+        rrc.PrintText("Hello", feedback_level=rrc.FeedbackLevel.DONE),
+        rrc.Noop(),
+    ]
+
+    with RecordingWriter(path) as recording:
+        recording.write(instructions[:2])
+        recording.write(instructions[2:])
+
+    with RecordingReader(path) as recording:
+        assert len(recording) == 4
+        # Names and string values are stored once
+        assert sorted(recording.strings) == sorted(
+            ["r_RRC_MoveToJoints", "r_RRC_PrintText", "Hello", "r_RRC_Noop"]
+        )
+        for original, recorded in zip(instructions, recording):
+            for key in ("instruction", "exec_level", "feedback_level"):
+                assert recorded.msg[key] == original.msg[key]
+            assert recorded.string_values == list(original.string_values)
+            assert recorded.float_values == list(original.float_values)
+
+
+def test_recording_unclosed(tmp_path):
+    path = str(tmp_path / "program.rrc")
+    recording = RecordingWriter(path)
+    recording.write([rrc.Noop()])
+    recording._file.flush()
+
+    with pytest.raises(ValueError):
+        RecordingReader(path)
+    recording.close()
+
+
+def test_recording_replay(tmp_path):
+    path = str(tmp_path / "program.rrc")
+    program = [rrc.Noop(feedback_level=i % 5 == 4) for i in range(20)]
+
+    ros = FakeRos(FakeDriver())
+    ros.run()
+    try:
+        with RecordingWriter(path) as recorder:
+            abb = rrc.AbbClient(ros, "/rob1", recorder=recorder)
+            abb.send_many(program)[-1].result(timeout=1)
+
+        # The client keeps working without recording
+        assert abb.send_and_wait(rrc.Noop(), timeout=1) == "Done"
+        assert not abb.futures
+
+        abb = rrc.AbbClient(ros, "/rob1")
+        with RecordingReader(path) as recording:
+            futures = recording.replay(abb, speed=10.0, batch_size=3)
+            assert len(futures) == 4
+            assert rrc.gather(futures, timeout=1) == ["Done"] * 4
+    finally:
+        ros.terminate()
@@ -0,0 +1,39 @@
+from compas_rrc.stats import ClientStats
+from compas_rrc.stats import LatencyHistogram
+from compas_rrc.utility import Noop
+from compas_rrc.utility import WaitTime
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+
+    for i in range(1, 101):
+        histogram.record(i / 1000.0)
+
+    assert histogram.count == 100
+    assert abs(histogram.mean - 0.0505) < 1e-9
+    assert abs(histogram.percentile(50) - 0.050) < 0.050 * 0.02
+    assert abs(histogram.percentile(99) - 0.099) < 0.099 * 0.02
+    assert histogram.percentile(100) == 0.1
+    assert histogram.min == 0.001
+
+
+def test_client_stats():
+    stats = ClientStats()
+    instructions = [Noop(feedback_level=1), WaitTime(1, feedback_level=1), Noop()]
+    for sequence_id, instruction in enumerate(instructions, 1):
+        instruction.sequence_id = sequence_id
+
+    stats.record_sent(instructions)
+    assert stats.in_flight == 2
+
+    stats.record_feedback(1)
+    stats.record_feedback(2)
+    summary = stats.summary()
+
+    assert summary["sent"] == 3
+    assert summary["received"] == 2
+    assert summary["in_flight"] == 0
+    assert sorted(summary["latency"].keys()) == ["r_RRC_Noop", "r_RRC_WaitTime"]
+    assert summary["latency"]["r_RRC_Noop"]["count"] == 1
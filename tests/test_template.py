@@ -0,0 +1,42 @@
+import pytest
+from compas.geometry import Frame
+
+import compas_rrc as rrc
+
+
+def test_template_matches_instruction():
+    template = rrc.InstructionTemplate(
+        rrc.MoveToJoints([], [], 100, rrc.Zone.Z5), variable=12
+    )
+    values = [30, 90, 0, 0, 0, 0, 0, 0, 100, 0, 0, 0]
+    inst = template.create(values)
+    expected = rrc.MoveToJoints(values[:6], values[6:], 100, rrc.Zone.Z5)
+
+    inst.sequence_id = expected.sequence_id = 42
+    assert inst.msg == expected.msg
+    assert not hasattr(inst, "parse_feedback")
+
+
+def test_template_keeps_parser_and_feedback_level():
+    template = rrc.InstructionTemplate(
+        rrc.MoveToRobtarget(Frame.worldXY(), [], 100, rrc.Zone.FINE), variable=7
+    )
+    inst = template.create([0, 0, 0, 1, 0, 0, 0], feedback_level=1)
+    assert inst.feedback_level == 1
+    assert inst.string_values == ["J"]
+    assert inst.float_values[7:] == [0, 0, 0, 0, 0, 0, 100, -1]
+
+    template = rrc.InstructionTemplate(rrc.ReadAnalog("ai_1"), variable=0)
+    inst = template.create([])
+    assert inst.parse_feedback(dict(float_values=[4.2])) == 4.2
+
+
+def test_template_validation():
+    with pytest.raises(ValueError):
+        rrc.InstructionTemplate(rrc.Noop(), variable=1)
+
+    template = rrc.InstructionTemplate(
+        rrc.MoveToJoints([], [], 100, rrc.Zone.Z5), variable=12
+    )
+    with pytest.raises(ValueError):
+        template.create([0, 0, 0])
@@ -0,0 +1,85 @@
+import math
+
+import pytest
+from compas.geometry import allclose
+
+import compas_rrc as rrc
+
+numpy = pytest.importorskip("numpy")
+
+
+class StubRobot(object):
+    def __init__(self):
+        self.calls = 0
+
+    def get_configurable_joint_names(self, group=None):
+        self.calls += 1
+        return ["track", "j1", "j2", "j3", "j4", "j5", "j6"]
+
+    def get_configurable_joint_types(self, group=None):
+        return [2, 0, 0, 0, 0, 0, 0]
+
+
+def test_buffer_shapes():
+    buffer = rrc.JointTrajectoryBuffer([[0, 10, 20, 30, 40, 50]] * 3)
+    assert len(buffer) == 3
+    assert buffer.external_axes.shape == (3, 0)
+
+    joints, axes = buffer[1]
+    assert list(joints) == [0, 10, 20, 30, 40, 50]
+    assert list(axes) == []
+
+    with pytest.raises(ValueError):
+        rrc.JointTrajectoryBuffer([[0, 10, 20]])
+
+
+def test_buffer_from_samples():
+    samples = [
+        (rrc.RobotJoints(0, 10, 20, 30, 40, 50), rrc.ExternalAxes(1000)),
+        (rrc.RobotJoints(5, 15, 25, 35, 45, 55), rrc.ExternalAxes(2000)),
+    ]
+    buffer = rrc.JointTrajectoryBuffer.from_samples(samples)
+    assert buffer.joint_values.shape == (2, 7)
+    assert [list(axes) for _, axes in buffer] == [[1000], [2000]]
+
+
+def test_buffer_unit_conversion():
+    buffer = rrc.JointTrajectoryBuffer([[180, 90, 0, 0, 0, 0]], [[1500]])
+    values = buffer.to_meters_radians([0, 0, 0, 0, 0, 0, 2])
+    assert allclose(values[0], [math.pi, math.pi / 2, 0, 0, 0, 0, 1.5])
+
+    new_buffer = rrc.JointTrajectoryBuffer.from_meters_radians(
+        values, [0, 0, 0, 0, 0, 0, 2]
+    )
+    assert allclose(new_buffer.joint_values[0], buffer.joint_values[0])
+
+
+def test_buffer_joint_trajectory_round_trip():
+    robot = StubRobot()
+    buffer = rrc.JointTrajectoryBuffer.from_meters_radians(
+        [[0.5, 0, math.pi, 0, 0, 0, 0], [1.0, 0, 0, math.pi / 2, 0, 0, 0]],
+        [2, 0, 0, 0, 0, 0, 0],
+        time_from_start=[0.0, 1.5],
+    )
+    assert buffer.external_axes.shape == (2, 1)
+    assert list(buffer.robot_joints[0]) == [500, 0, 180, 0, 0, 0]
+
+    trajectory = buffer.to_joint_trajectory_primitive(
+        [2, 0, 0, 0, 0, 0, 0], StubRobot().get_configurable_joint_names()
+    )
+    assert len(trajectory.points) == 2
+    assert trajectory.points[1].time_from_start.seconds == 1.5
+
+    # Track first in the trajectory, robot joints first in the buffer
+    names = ["j1", "j2", "j3", "j4", "j5", "j6", "track"]
+    new_buffer = rrc.JointTrajectoryBuffer.from_joint_trajectory_primitive(
+        trajectory, names
+    )
+    assert allclose(new_buffer.robot_joints[1], [0, 0, 90, 0, 0, 0])
+    assert allclose(new_buffer.external_axes[:, 0], [500, 1000])
+    assert allclose(new_buffer.time_from_start, [0.0, 1.5])
+
+    new_buffer = rrc.JointTrajectoryBuffer.from_joint_trajectory(trajectory, robot)
+    new_buffer = rrc.JointTrajectoryBuffer.from_joint_trajectory(trajectory, robot)
+    assert allclose(new_buffer.joint_values, buffer.joint_values)
+    assert robot.calls == 1
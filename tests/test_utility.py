@@ -0,0 +1,36 @@
+import compas_rrc as rrc
+
+RAPID_NONE = 8999999488.0
+
+
+def test_get_joints_raw():
+    result = dict(float_values=[10, 20, 30, 40, 50, 60, 1000] + [RAPID_NONE] * 5)
+
+    robot_joints, external_axes = rrc.GetJoints().parse_feedback(result)
+    assert robot_joints.rax_6 == 60
+    assert list(external_axes) == [1000]
+
+    instruction = rrc.GetJoints(raw=True)
+    assert "raw" not in instruction.msg
+    assert instruction.parse_feedback(result) == ((10, 20, 30, 40, 50, 60), (1000,))
+
+
+def test_get_robtarget_raw():
+    result = dict(float_values=[100, 200, 300, 1, 0, 0, 0, 500] + [RAPID_NONE] * 5)
+
+    instruction = rrc.GetRobtarget(raw=True)
+    assert "raw" not in instruction.msg
+
+    robtarget = instruction.parse_feedback(result)
+    assert robtarget.position == (100, 200, 300)
+    assert robtarget.quaternion == (1, 0, 0, 0)
+    assert robtarget.external_axes == (500,)
+    assert robtarget._frame is None
+
+    frame, _ = rrc.GetRobtarget().parse_feedback(result)
+    assert robtarget.frame == frame
+    assert robtarget.frame is robtarget.frame
+
+    robtarget = rrc.GetFrame(raw=True).parse_feedback(result)
+    assert isinstance(robtarget, rrc.RawRobtarget)
+    assert rrc.GetFrame().parse_feedback(result) == robtarget.frame